@@ -0,0 +1,187 @@
+"""
+Headless batch runner for compute nodes without a display.
+
+Runs stored configurations, given by ID or name, or the configurations of a CSV/JSON file, and writes each
+run's columnar sample store and summary statistics. Runs of stored configurations are recorded in the
+database like runs started from the GUI, so they show up in its Results tab. Without arguments the enabled
+configuration is run.
+
+Only numpy and scipy are imported, never PyQt6 or matplotlib, and only after the arguments have been parsed,
+so ``--help`` and argument errors return immediately.
+
+Usage:
+    python -m app.cli 3 "Well B" --iterations 1000000 --seed 42
+    python -m app.cli --file prospects.csv --summary summary.json
+"""
+import argparse
+import json
+import os
+import sys
+import tempfile
+import time
+from datetime import datetime
+
+# Calculate the correct absolute path to the project root, so the script also runs as app/cli.py
+project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+if project_root not in sys.path:
+    sys.path.insert(0, project_root)
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m app.cli", description=__doc__,
+                                     formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("configurations", nargs="*", metavar="CONFIGURATION",
+                        help="ID or name of a stored configuration; a name selects the newest configuration with it")
+    parser.add_argument("--file", help="CSV or JSON file of configurations to run without storing them")
+    parser.add_argument("--database", default=os.getenv("DATABASE_PATH", "simulation_results.db"),
+                        help="SQLite database (default: $DATABASE_PATH or simulation_results.db)")
+    parser.add_argument("--iterations", type=int, help="iterations per run (default: the configuration's own)")
+    parser.add_argument("--sampling-mode", choices=("random", "lhs", "sobol", "halton"),
+                        help="sampling mode (default: the configuration's own)")
+    parser.add_argument("--seed", type=int,
+                        help="run-level seed, shared by all runs of the batch (default: fresh entropy)")
+    parser.add_argument("--tolerance", type=float,
+                        help="relative tolerance of an adaptive run; --iterations is then the cap")
+    parser.add_argument("--workers", type=int, help="worker processes per run (default: one per CPU)")
+    parser.add_argument("--memory-budget", type=float, metavar="MIB",
+                        help="stream runs whose samples would take more than this many MiB, keeping only their "
+                             "statistics and histograms in memory (default: keep every sample in memory)")
+    parser.add_argument("--output", default="results", help="directory of the run stores (default: results)")
+    parser.add_argument("--results", action="store_true",
+                        help="also bulk-load the per-iteration OOIP/ROIP of stored configurations into RESULTS")
+    parser.add_argument("--summary", help="write the statistics of all runs to this JSON file")
+    parser.add_argument("--quiet", action="store_true", help="do not report progress on stderr")
+    args = parser.parse_args(argv)
+    if args.iterations is not None and args.iterations < 1:
+        parser.error("--iterations must be positive")
+    if args.tolerance is not None and args.tolerance <= 0:
+        parser.error("--tolerance must be positive")
+    if args.seed is not None and args.seed < 0:
+        parser.error("--seed must be non-negative")
+    if args.memory_budget is not None and args.memory_budget <= 0:
+        parser.error("--memory-budget must be positive")
+    return args
+
+
+def resolve_configurations(args):
+    """
+    Return the configurations to run as dicts with parameter_id (None for configurations read from a file),
+    name, iterations, sampling_mode and distributions.
+    """
+    from core.db import database
+    from core.db.bulk import read_configurations
+
+    configurations = []
+    for identifier in args.configurations:
+        parameter = database.get_parameter(int(identifier)) if identifier.isdigit() else \
+            database.find_parameter(identifier)
+        if parameter is None:
+            raise ValueError(f"Configuration '{identifier}' does not exist.")
+        parameter_id, name, iterations, sampling_mode = parameter
+        configurations.append({"parameter_id": parameter_id, "name": name, "iterations": iterations,
+                               "sampling_mode": sampling_mode,
+                               "distributions": database.get_parameter_distributions(parameter_id)})
+    if args.file:
+        configurations.extend({"parameter_id": None, **configuration}
+                              for configuration in read_configurations(args.file))
+    if not configurations and not args.file:
+        parameter = database.get_enabled_parameter()
+        if not parameter:
+            raise ValueError("No configuration given and none is enabled.")
+        configurations.append({"parameter_id": parameter[0], "name": parameter[1], "iterations": parameter[2],
+                               "sampling_mode": parameter[3],
+                               "distributions": database.get_parameter_distributions(parameter[0])})
+    return configurations
+
+
+def report_progress(name):
+    def progress(done, total):
+        print(f"\r{name}: {done / total:6.1%}", end="" if done < total else "\n", file=sys.stderr, flush=True)
+    return progress
+
+
+def run_configuration(configuration, args, seed):
+    """Run one configuration, record it if it is stored, and return its summary."""
+    from core.db import database
+    from core.processing.sampling import DEFAULT_SAMPLING_MODE, map_distributions_to_params
+    from core.sim.monte_carlo.engine import simulate
+    from core.sim.monte_carlo.result import VOLUMETRIC_PARAMETERS
+
+    parameters = map_distributions_to_params(configuration["distributions"])
+    if not parameters:
+        raise ValueError(f"Configuration '{configuration['name']}' has no distributions.")
+    # Checked before the run store is created, so a broken configuration leaves nothing behind
+    missing = [name for name in VOLUMETRIC_PARAMETERS if name not in parameters]
+    if missing:
+        raise ValueError(f"Configuration '{configuration['name']}' is missing {', '.join(missing)}.")
+    iterations = args.iterations or configuration["iterations"]
+    sampling_mode = args.sampling_mode or configuration["sampling_mode"] or DEFAULT_SAMPLING_MODE
+    # Runs of a batch share the seed and may start within the same second, so the name gets a unique suffix
+    os.makedirs(args.output, exist_ok=True)
+    store_directory = tempfile.mkdtemp(prefix=f"run_{datetime.now():%Y%m%d_%H%M%S}_{seed}_", dir=args.output)
+
+    start = time.perf_counter()
+    result = simulate(parameters, iterations, seed=seed, workers=args.workers,
+                      progress=None if args.quiet else report_progress(configuration["name"]),
+                      sampling_mode=sampling_mode, tolerance=args.tolerance, store_directory=store_directory,
+                      memory_budget=args.memory_budget * 2 ** 20 if args.memory_budget else None)
+    seconds = time.perf_counter() - start
+    statistics = result.statistics()
+
+    simulation_id = None
+    if configuration["parameter_id"] is not None:
+        simulation_id = database.create_simulation(
+            configuration["parameter_id"], result.seed, result.iterations, result.bit_generator, result.sampling_mode,
+            chunk_size=result.chunk_size, tolerance=result.tolerance, achieved_tolerance=result.achieved_tolerance,
+            store_path=result.store_path)
+        if args.results:
+            database.insert_results(simulation_id, *result.output_columns())
+        database.insert_simulation_statistics(simulation_id, statistics)
+
+    return {"parameter_id": configuration["parameter_id"], "name": configuration["name"],
+            "simulation_id": simulation_id, "seed": str(result.seed), "iterations": result.iterations,
+            "sampling_mode": result.sampling_mode, "tolerance": result.tolerance,
+            "achieved_tolerance": result.achieved_tolerance, "store_path": result.store_path,
+            "seconds": round(seconds, 3), "statistics": statistics}
+
+
+def main(argv=None):
+    args = parse_args(argv)
+
+    from core.db import database
+    from core.processing.rng import new_seed
+
+    database.DATABASE_PATH = args.database
+    database.create_tables()
+    seed = args.seed if args.seed is not None else new_seed()
+    try:
+        configurations = resolve_configurations(args)
+    except (OSError, ValueError) as e:
+        print(f"error: {e}", file=sys.stderr)
+        return 1
+
+    summaries, failed = [], False
+    print(f"{'configuration':<30} {'iterations':>12} {'P90':>10} {'P50':>10} {'P10':>10} {'seconds':>9}  "
+          f"(OOIP, MMbbl; seed {seed})")
+    for configuration in configurations:
+        try:
+            summary = run_configuration(configuration, args, seed)
+        except ValueError as e:
+            # A broken configuration does not stop the rest of the batch
+            print(f"error: {e}", file=sys.stderr)
+            failed = True
+            continue
+        summaries.append(summary)
+        ooip = summary["statistics"]["OOIP"]
+        print(f"{summary['name'][:30]:<30} {summary['iterations']:>12,} {ooip['P90'] / 1e6:>10.2f} "
+              f"{ooip['P50'] / 1e6:>10.2f} {ooip['P10'] / 1e6:>10.2f} {summary['seconds']:>9.2f}")
+
+    if args.summary:
+        with open(args.summary, "w") as file:
+            json.dump(summaries, file, indent=2)
+    database.close_db_connection()
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
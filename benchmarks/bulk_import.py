@@ -0,0 +1,120 @@
+"""
+Import and export rate of configurations.
+
+A CSV and a JSON Lines file of --configurations configurations, each with the six 'Well B' distributions, are
+written to a temporary directory and loaded into fresh databases. Every name is shared by two consecutive
+configurations, which must still be imported as two:
+- import_configurations: streamed, validated per chunk and written with executemany in one transaction
+- insert_parameters loop: one call per configuration, as the Parameters tab form does. Each call also disables
+  every other configuration, so its cost grows with the number already stored.
+The export of all configurations back to CSV is timed as well. Both exports are then imported again and checked to
+give back the configurations of the JSON file, distribution for distribution.
+
+Usage:
+    python -m benchmarks.bulk_import [--configurations 10000]
+"""
+import argparse
+import csv
+import json
+import os
+import tempfile
+import time
+
+from benchmarks.common import WELL_B_DISTRIBUTIONS
+from core.db import database
+from core.db.bulk import BULK_COLUMNS, EXPORT_COLUMNS, export_configurations, import_configurations, \
+    read_configurations
+
+
+def write_inputs(directory, configurations):
+    csv_path, json_path = os.path.join(directory, "prospects.csv"), os.path.join(directory, "prospects.jsonl")
+    with open(csv_path, "w", newline="") as csv_file, open(json_path, "w") as json_file:
+        writer = csv.writer(csv_file)
+        writer.writerow(EXPORT_COLUMNS)
+        for index in range(configurations):
+            name = f"Prospect {index // 2}"
+            distributions = []
+            for distribution in WELL_B_DISTRIBUTIONS:
+                writer.writerow([index, name, 100_000, "random"] +
+                                ["" if value is None else value for value in distribution])
+                distributions.append(dict(zip(BULK_COLUMNS[3:], distribution)))
+            json_file.write(json.dumps({"name": name, "iterations": 100_000, "sampling_mode": "random",
+                                        "distributions": distributions}) + "\n")
+    return csv_path, json_path
+
+
+def fresh_database(directory, name):
+    database.close_db_connection()
+    database.DATABASE_PATH = os.path.join(directory, f"{name}.db")
+    database.create_tables()
+
+
+def check_round_trip(directory, json_path, configurations):
+    """
+    Export the configurations imported last to CSV and JSON Lines, import each export into a fresh database and
+    check it reads back as the configurations of ``json_path``.
+    """
+    expected = list(read_configurations(json_path))
+    if len(expected) != configurations:
+        raise RuntimeError(f"{json_path} reads as {len(expected)} configurations, not {configurations}.")
+    for file_format in ("csv", "json"):
+        path = os.path.join(directory, f"round_trip.{file_format}")
+        export_configurations(path)
+        fresh_database(directory, f"round_trip_{file_format}")
+        counts = import_configurations(path)
+        if counts != (configurations, configurations * len(WELL_B_DISTRIBUTIONS)):
+            raise RuntimeError(f"The {file_format} export imported as {counts[0]} configurations with {counts[1]} "
+                               f"distributions.")
+        if list(read_configurations(path)) != expected:
+            raise RuntimeError(f"The {file_format} export does not read back as the imported configurations.")
+        print(f"{f'round trip {file_format.upper()}':>30} {'ok':>16}")
+
+
+def insert_loop(configurations):
+    for index in range(configurations):
+        database.insert_parameters({
+            "Name": f"Prospect {index}",
+            "Iterations": 100_000,
+            "Distributions": [
+                {"Parameter_name": name, "Distribution_type": kind, "Mean": mean, "Std_dev": std_dev,
+                 "Min_value": low, "Max_value": high, "Mode_value": mode}
+                for name, kind, mean, std_dev, low, high, mode in WELL_B_DISTRIBUTIONS
+            ],
+        })
+
+
+def report(label, configurations, seconds):
+    rate = configurations / seconds
+    print(f"{label:>30} {rate:>16,.0f} {configurations / rate:>10.2f}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--configurations", type=int, default=10_000)
+    args = parser.parse_args()
+
+    print(f"{'strategy':>30} {'configurations/s':>16} {'seconds':>10}  ({args.configurations:,} configurations)")
+    with tempfile.TemporaryDirectory() as directory:
+        csv_path, json_path = write_inputs(directory, args.configurations)
+        for label, path in (("import_configurations CSV", csv_path), ("import_configurations JSON", json_path)):
+            fresh_database(directory, os.path.basename(path))
+            start = time.perf_counter()
+            counts = import_configurations(path)
+            report(label, args.configurations, time.perf_counter() - start)
+            if counts[0] != args.configurations:
+                raise RuntimeError(f"{label} imported {counts[0]} configurations, not {args.configurations}.")
+
+        start = time.perf_counter()
+        export_configurations(os.path.join(directory, "export.csv"))
+        report("export_configurations CSV", args.configurations, time.perf_counter() - start)
+        check_round_trip(directory, json_path, args.configurations)
+
+        fresh_database(directory, "insert_loop")
+        start = time.perf_counter()
+        insert_loop(args.configurations)
+        report("insert_parameters loop", args.configurations, time.perf_counter() - start)
+        database.close_db_connection()
+
+
+if __name__ == "__main__":
+    main()
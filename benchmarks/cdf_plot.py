@@ -0,0 +1,86 @@
+"""
+Pixel-reduced CDF plots against plotting every sorted sample.
+
+For every sample size the Porosity column of 'Well B' is drawn both ways in the parameter CDF figure and rendered
+with Agg at the 300 dpi export resolution. The table reports the points drawn, the time to build and render each
+figure, how many pixels of the two images differ by more than --tolerance in any channel (out of 255), and how
+many differ by more than half the range from every pixel of the full image within one pixel of them, i.e. are
+more than antialiasing along the edge of the curve. Plotting every sample costs O(n) marker draws and is skipped
+above --full-limit samples.
+
+Usage:
+    python -m benchmarks.cdf_plot [--full-limit 1000000] [--tolerance 8]
+"""
+import argparse
+import time
+
+import numpy as np
+from matplotlib.backends.backend_agg import FigureCanvasAgg
+
+from benchmarks.common import well_b_parameters
+from core.processing.sampling import sample_parameters
+from core.processing.statistics import reduced_ecdf
+from core.utils.export import DEFAULT_EXPORT_DPI
+from core.utils.plotting import parameter_cdf_figure, parameter_cdf_pixels
+
+SAMPLE_SIZES = (10_000, 100_000, 1_000_000, 10_000_000)
+PARAMETER = "Porosity"
+
+
+def reduced_cdf_figure(data, parameter_name, iterations):
+    """The CDF figure as drawn now, through the pixel-reduced curve."""
+    return parameter_cdf_figure(reduced_ecdf(data, *parameter_cdf_pixels()), parameter_name, iterations)
+
+
+def full_cdf_figure(data, parameter_name, iterations):
+    """The CDF figure as drawn before, with one marker per sample."""
+    return parameter_cdf_figure((np.sort(data), np.arange(len(data)) / (len(data) - 1)), parameter_name, iterations)
+
+
+def render(builder, data):
+    """Build and draw a figure at the export resolution; return the image, the points drawn and the seconds."""
+    start = time.perf_counter()
+    figure = builder(data, PARAMETER, data.size)
+    figure.set_dpi(DEFAULT_EXPORT_DPI)
+    canvas = FigureCanvasAgg(figure)
+    canvas.draw()
+    image = np.asarray(canvas.buffer_rgba()).copy()
+    return image, len(figure.axes[0].lines[0].get_xdata()), time.perf_counter() - start
+
+
+def displaced_pixels(image, reference):
+    """Pixels of ``image`` that differ by more than half the range from all pixels within one pixel in ``reference``."""
+    image, reference = image.astype(np.int16), reference.astype(np.int16)
+    closest = np.full(image.shape[:2], 255)
+    for dy in (-1, 0, 1):
+        for dx in (-1, 0, 1):
+            shifted = np.roll(reference, (dy, dx), axis=(0, 1))
+            closest = np.minimum(closest, np.abs(image - shifted).max(axis=-1))
+    return int((closest > 127).sum())
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--full-limit", type=int, default=1_000_000)
+    parser.add_argument("--tolerance", type=int, default=8)
+    args = parser.parse_args()
+
+    parameters = {PARAMETER: well_b_parameters()[PARAMETER]}
+    # The first figure also loads fonts and builds caches
+    render(reduced_cdf_figure, sample_parameters(parameters, 100, random_state=0)[PARAMETER])
+    print(f"{'samples':>10} {'points':>8} {'reduced s':>10} {'full s':>10} {'speed-up':>10} {'pixels differing':>17} "
+          f"{'off by > 1 px':>14}")
+    for size in SAMPLE_SIZES:
+        data = sample_parameters(parameters, size, random_state=size)[PARAMETER]
+        reduced, points, reduced_time = render(reduced_cdf_figure, data)
+        if size > args.full_limit:
+            print(f"{size:>10} {points:>8} {reduced_time:>10.3f} {'-':>10} {'-':>10} {'-':>17} {'-':>14}")
+            continue
+        full, _, full_time = render(full_cdf_figure, data)
+        differing = np.any(np.abs(reduced.astype(np.int16) - full) > args.tolerance, axis=-1)
+        print(f"{size:>10} {points:>8} {reduced_time:>10.3f} {full_time:>10.3f} {full_time / reduced_time:>10.1f} "
+              f"{int(differing.sum()):>8} ({differing.mean():.3%}) {displaced_pixels(reduced, full):>14}")
+
+
+if __name__ == "__main__":
+    main()
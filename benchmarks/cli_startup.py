@@ -0,0 +1,76 @@
+"""
+Process startup time of the headless command-line runner.
+
+Each command is started --repeats times as a fresh process and the median wall time is reported:
+- python -c pass: the interpreter alone
+- app.cli --help: argument parsing, before numpy and scipy are imported
+- app.cli run: a 1,000-iteration run of the 'Well B' configuration in a temporary database
+The run is also started once with ``-X importtime`` to list the packages that are slowest to import and to check that neither
+PyQt6 nor matplotlib is imported.
+
+Usage:
+    python -m benchmarks.cli_startup [--repeats 5]
+"""
+import argparse
+import os
+import subprocess
+import sys
+import tempfile
+import time
+
+import numpy as np
+
+from benchmarks.common import import_times, insert_well_b_configuration
+from core.db import database
+
+FORBIDDEN_MODULES = ("PyQt6", "matplotlib")
+SLOWEST_IMPORTS = 5
+
+
+def create_database(path):
+    database.DATABASE_PATH = path
+    database.create_tables()
+    insert_well_b_configuration(iterations=1_000)
+    database.close_db_connection()
+
+
+def median_seconds(command, repeats):
+    timings = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        subprocess.run(command, check=True, stdout=subprocess.DEVNULL)
+        timings.append(time.perf_counter() - start)
+    return float(np.median(timings))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--repeats", type=int, default=5)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as directory:
+        database_path = os.path.join(directory, "startup.db")
+        create_database(database_path)
+        cli = [sys.executable, "-m", "app.cli"]
+        run = ["--database", database_path, "--output", os.path.join(directory, "results"), "--quiet", "Well B"]
+        commands = {
+            "python -c pass": [sys.executable, "-c", "pass"],
+            "app.cli --help": cli + ["--help"],
+            "app.cli run (1,000 iterations)": cli + run,
+        }
+        print(f"{'command':>32} {'median seconds':>15}")
+        for label, command in commands.items():
+            print(f"{label:>32} {median_seconds(command, args.repeats):>15.3f}")
+
+        times = import_times([sys.executable, "-X", "importtime", "-m", "app.cli"] + run)
+
+    print("\nSlowest imports of a run, by package:")
+    for name, seconds in sorted(times.items(), key=lambda item: -item[1])[:SLOWEST_IMPORTS]:
+        print(f"{name:>32} {seconds:>15.3f}")
+    imported = [name for name in FORBIDDEN_MODULES if name in times]
+    print(f"\nGUI modules imported: {', '.join(imported) if imported else 'none'}")
+    return 1 if imported else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,52 @@
+# Shared fixtures for the benchmark scripts. Run them from the project root, e.g.
+#   python -m benchmarks.lhs_convergence
+import subprocess
+
+from core.processing.sampling import map_distributions_to_params
+
+# The distributions of the sample 'Well B' configuration, in the layout of map_distributions_to_params
+WELL_B_DISTRIBUTIONS = [
+    ('Volume', 'Uniform', None, None, 31775.78, 33448.19, None),
+    ('Net to Gross Ratio', 'Uniform', None, None, 0.93, 0.97, 0.95),
+    ('Porosity', 'Normal', 0.1832, 0.0337, None, None, None),
+    ('Water Saturation', 'Log-normal', 0.4179, 0.1301, None, None, None),
+    ('FVF', 'Uniform', None, None, 1.0504, 1.0838, None),
+    ('Recovery Factor', 'Uniform', None, None, 0.2, 0.25, None),
+]
+
+
+def well_b_parameters():
+    return map_distributions_to_params(WELL_B_DISTRIBUTIONS)
+
+
+def insert_well_b_configuration(iterations=100_000):
+    """Store the 'Well B' configuration as the enabled configuration of the current database."""
+    from core.db.database import insert_parameters
+
+    insert_parameters({
+        "Name": "Well B",
+        "Iterations": iterations,
+        "Distributions": [
+            {"Parameter_name": name, "Distribution_type": kind, "Mean": mean, "Std_dev": std_dev,
+             "Min_value": low, "Max_value": high, "Mode_value": mode}
+            for name, kind, mean, std_dev, low, high, mode in WELL_B_DISTRIBUTIONS
+        ],
+    })
+
+
+def import_times(command, **kwargs):
+    """
+    Run ``command`` with ``-X importtime`` output on stderr and return the import time in seconds of every root
+    package it imported, nested imports included.
+    """
+    stderr = subprocess.run(command, check=True, stdout=subprocess.DEVNULL, stderr=subprocess.PIPE, text=True,
+                            **kwargs).stderr
+    times = {}
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        # Self times add up without counting nested imports twice
+        self_time, _, name = line[len("import time:"):].split("|")
+        package = name.strip().split(".")[0]
+        times[package] = times.get(package, 0) + int(self_time) / 1e6
+    return times
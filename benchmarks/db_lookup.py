@@ -0,0 +1,90 @@
+"""
+Latency of the configuration lookups run before every simulation, with and without the lookup indexes.
+
+A database in a temporary directory is filled with --configurations configurations of six distributions each
+(the 'Well B' distributions) and migrated to the schema version before the lookup indexes. Each query is timed,
+then the database is upgraded in place to the latest version and timed again:
+- get_enabled_parameter: the enabled configuration
+- get_enabled_parameter_and_distributions: the enabled configuration and its distributions
+- get_distributions_by_parameter_id: the distributions of a configuration, joined with its iteration count
+
+Usage:
+    python -m benchmarks.db_lookup [--configurations 20000] [--repeats 200]
+"""
+import argparse
+import os
+import tempfile
+import time
+
+import numpy as np
+
+from benchmarks.common import WELL_B_DISTRIBUTIONS
+from core.db import database
+from core.db.migrations import SCHEMA_VERSION, migrate
+
+
+def fill_database(configurations):
+    with database.get_db_connection() as conn:
+        cursor = conn.cursor()
+        cursor.executemany("INSERT INTO parameters (id, name, iterations, enabled) VALUES (?, ?, ?, 0)",
+                           ((parameter_id, f"Configuration {parameter_id}", 100_000)
+                            for parameter_id in range(1, configurations + 1)))
+        cursor.executemany('''
+            INSERT INTO distributions (parameter_id, parameter_name, distribution_type, mean, std_dev, min_value,
+                                       max_value, mode_value)
+            VALUES (?, ?, ?, ?, ?, ?, ?, ?)''',
+                           ((parameter_id, *distribution) for parameter_id in range(1, configurations + 1)
+                            for distribution in WELL_B_DISTRIBUTIONS))
+        # The enabled configuration sits in the middle of the table, as one picked from a long history would
+        cursor.execute("UPDATE parameters SET enabled = 1 WHERE id = ?", (configurations // 2,))
+        conn.commit()
+
+
+def time_lookups(parameter_ids, repeats):
+    """Return the median latency of each lookup in microseconds."""
+    lookups = {
+        "get_enabled_parameter": lambda _: database.get_enabled_parameter(),
+        "get_enabled_parameter_and_distributions": lambda _: database.get_enabled_parameter_and_distributions(),
+        "get_distributions_by_parameter_id": database.get_distributions_by_parameter_id,
+    }
+    latencies = {}
+    for name, lookup in lookups.items():
+        timings = np.empty(repeats)
+        for index in range(repeats):
+            start = time.perf_counter()
+            lookup(int(parameter_ids[index]))
+            timings[index] = time.perf_counter() - start
+        latencies[name] = np.median(timings) * 1e6
+    return latencies
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--configurations", type=int, default=20_000)
+    parser.add_argument("--repeats", type=int, default=200)
+    args = parser.parse_args()
+
+    parameter_ids = np.random.default_rng(0).integers(1, args.configurations + 1, args.repeats)
+    with tempfile.TemporaryDirectory() as directory:
+        database.close_db_connection()
+        database.DATABASE_PATH = os.path.join(directory, "lookup.db")
+        conn = database.get_db_connection()
+        migrate(conn, SCHEMA_VERSION - 1)
+        fill_database(args.configurations)
+        before = time_lookups(parameter_ids, args.repeats)
+
+        start = time.perf_counter()
+        migrate(conn)
+        migration_seconds = time.perf_counter() - start
+        after = time_lookups(parameter_ids, args.repeats)
+        database.close_db_connection()
+
+    print(f"{args.configurations:,} configurations, {len(WELL_B_DISTRIBUTIONS) * args.configurations:,} distributions;"
+          f" upgrade to version {SCHEMA_VERSION} took {migration_seconds * 1e3:.1f} ms")
+    print(f"{'lookup':>40} {'before (us)':>12} {'after (us)':>12} {'speedup':>8}")
+    for name in before:
+        print(f"{name:>40} {before[name]:>12.1f} {after[name]:>12.1f} {before[name] / after[name]:>7.1f}x")
+
+
+if __name__ == "__main__":
+    main()
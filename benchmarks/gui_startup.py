@@ -0,0 +1,110 @@
+"""
+Cold-start budget of the GUI.
+
+The application is started --repeats times as a fresh process on Qt's offscreen platform, against a temporary
+database holding the 'Well B' configuration, and the median of each stage is reported:
+- imports: importing core.gui.base and creating the tables
+- first paint: process start until the main window receives its first paint event
+- simulations tab: building the Simulations tab when it is first selected, which is deferred until then
+The import of core.gui.base is also run once with ``-X importtime`` to list the packages that are slowest to
+import before the window can be shown.
+
+Usage:
+    python -m benchmarks.gui_startup [--repeats 5]
+"""
+import argparse
+import json
+import os
+import subprocess
+import sys
+import tempfile
+
+import numpy as np
+
+from benchmarks.common import import_times, insert_well_b_configuration
+from core.db import database
+
+PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+SLOWEST_IMPORTS = 8
+# Packages whose import is deferred until a simulation is shown
+DEFERRED_PACKAGES = ("scipy", "matplotlib")
+
+# Run in the child process; prints the stage timings as JSON
+STARTUP_SCRIPT = """
+import json, os, sys, time
+start = time.perf_counter()
+from PyQt6.QtCore import QEvent, QObject, QTimer
+from PyQt6.QtWidgets import QApplication
+from core.db.database import create_tables
+from core.gui.base import MainApplication
+create_tables()
+imported = time.perf_counter()
+
+app = QApplication(sys.argv)
+
+
+class FirstPaint(QObject):
+    painted = None
+
+    def eventFilter(self, watched, event):
+        if event.type() == QEvent.Type.Paint and self.painted is None:
+            self.painted = time.perf_counter()
+            QTimer.singleShot(0, app.quit)
+        return False
+
+
+first_paint = FirstPaint()
+app.installEventFilter(first_paint)
+window = MainApplication("Monte Carlo Reservoir Simulation", "benchmark")
+app.exec()
+
+switch = time.perf_counter()
+window.tab_widget.setCurrentWidget(window.simulation_tab)
+switched = time.perf_counter()
+print(json.dumps({"imports": imported - start, "first paint": first_paint.painted - start,
+                  "simulations tab": switched - switch}), flush=True)
+# Skip interpreter teardown, where destroying Qt objects in arbitrary order can crash
+os._exit(0)
+"""
+
+
+def environment(directory):
+    return {**os.environ, "QT_QPA_PLATFORM": "offscreen", "PYTHONPATH": PROJECT_ROOT, "CONFIG_DIR": PROJECT_ROOT,
+            "LANG_DIR": os.path.join(PROJECT_ROOT, "core", "lang"),
+            "STATIC_DIR": os.path.join(PROJECT_ROOT, "static"),
+            "DATABASE_PATH": os.path.join(directory, "startup.db")}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--repeats", type=int, default=5)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as directory:
+        database.DATABASE_PATH = os.path.join(directory, "startup.db")
+        database.create_tables()
+        insert_well_b_configuration()
+        database.close_db_connection()
+
+        # The application prints diagnostics on stdout; the timings are its last line
+        stages = []
+        for _ in range(args.repeats):
+            output = subprocess.run([sys.executable, "-c", STARTUP_SCRIPT], check=True, capture_output=True,
+                                    text=True, cwd=directory, env=environment(directory)).stdout
+            stages.append(json.loads(output.strip().splitlines()[-1]))
+
+        times = import_times([sys.executable, "-X", "importtime", "-c", "import core.gui.base"], cwd=directory,
+                             env=environment(directory))
+
+    print(f"{'stage':>20} {'median seconds':>15}")
+    for stage in stages[0]:
+        print(f"{stage:>20} {np.median([timings[stage] for timings in stages]):>15.3f}")
+    print("\nSlowest imports before the window is shown, by package:")
+    for name, seconds in sorted(times.items(), key=lambda item: -item[1])[:SLOWEST_IMPORTS]:
+        print(f"{name:>20} {seconds:>15.3f}")
+    loaded = [name for name in DEFERRED_PACKAGES if name in times]
+    print(f"\nDeferred packages loaded at start: {', '.join(loaded) if loaded else 'none'}")
+
+
+if __name__ == "__main__":
+    main()
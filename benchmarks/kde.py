@@ -0,0 +1,51 @@
+"""
+Binned FFT kernel density estimate against scipy.stats.gaussian_kde on the OOIP output.
+
+For every sample size both estimators are evaluated on the 500-point grid used for the OOIP/ROIP
+plots; the table reports the run time of each and the largest absolute error of the binned estimate
+relative to the peak density. gaussian_kde costs O(n * m) and is skipped above --exact-limit samples.
+
+Usage:
+    python -m benchmarks.kde [--exact-limit 1000000]
+"""
+import argparse
+import time
+
+import numpy as np
+from scipy.stats import gaussian_kde
+
+from benchmarks.common import well_b_parameters
+from core.processing.kde import evaluate_kde
+from core.sim.monte_carlo.engine import run_sharded
+
+SAMPLE_SIZES = (1_000, 10_000, 100_000, 1_000_000, 10_000_000)
+GRID_POINTS = 500
+
+
+def timed(function, *args):
+    start = time.perf_counter()
+    value = function(*args)
+    return value, time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--exact-limit", type=int, default=1_000_000)
+    args = parser.parse_args()
+
+    parameters = well_b_parameters()
+    print(f"{'samples':>10} {'binned s':>10} {'scipy s':>10} {'speed-up':>10} {'max rel err':>12}")
+    for size in SAMPLE_SIZES:
+        ooip = run_sharded(parameters, size, seed=size).ooip_mm
+        points = np.linspace(ooip.min(), ooip.max(), GRID_POINTS)
+        binned, binned_time = timed(evaluate_kde, ooip, points)
+        if size > args.exact_limit:
+            print(f"{size:>10} {binned_time:>10.4f} {'-':>10} {'-':>10} {'-':>12}")
+            continue
+        exact, exact_time = timed(lambda: gaussian_kde(ooip)(points))
+        error = np.abs(binned - exact).max() / exact.max()
+        print(f"{size:>10} {binned_time:>10.4f} {exact_time:>10.4f} {exact_time / binned_time:>10.1f} {error:>12.2e}")
+
+
+if __name__ == "__main__":
+    main()
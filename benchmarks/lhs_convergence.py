@@ -0,0 +1,49 @@
+"""
+Percentile error of OOIP against iteration count, Latin Hypercube versus plain random sampling.
+
+For every iteration count the simulation is repeated with independent seeds, and the root mean square
+relative error of P10/P50/P90 is measured against a large reference run.
+
+Usage:
+    python -m benchmarks.lhs_convergence [--replicates 20] [--reference 4000000]
+"""
+import argparse
+
+import numpy as np
+
+from benchmarks.common import well_b_parameters
+from core.sim.monte_carlo.engine import run_sharded
+
+ITERATIONS = (1_000, 10_000, 100_000)
+# Oil industry convention: P10 is the 90th percentile, P90 the 10th
+PERCENTILES = {"P10": 90, "P50": 50, "P90": 10}
+
+
+def percentile_errors(parameters, iterations, replicates, reference, sampling_mode):
+    errors = []
+    for replicate in range(replicates):
+        result = run_sharded(parameters, iterations, seed=replicate, workers=1, sampling_mode=sampling_mode)
+        estimate = np.percentile(result.ooip, list(PERCENTILES.values()))
+        errors.append((estimate - reference) / reference)
+    return np.sqrt(np.mean(np.square(errors), axis=0))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--replicates", type=int, default=20)
+    parser.add_argument("--reference", type=int, default=4_000_000)
+    args = parser.parse_args()
+
+    parameters = well_b_parameters()
+    reference_run = run_sharded(parameters, args.reference, seed=2 ** 32, sampling_mode="lhs")
+    reference = np.percentile(reference_run.ooip, list(PERCENTILES.values()))
+
+    print(f"{'iterations':>10} {'mode':>6} " + " ".join(f"{name + ' rmse %':>12}" for name in PERCENTILES))
+    for iterations in ITERATIONS:
+        for sampling_mode in ("random", "lhs"):
+            rmse = percentile_errors(parameters, iterations, args.replicates, reference, sampling_mode)
+            print(f"{iterations:>10} {sampling_mode:>6} " + " ".join(f"{100 * value:>12.4f}" for value in rmse))
+
+
+if __name__ == "__main__":
+    main()
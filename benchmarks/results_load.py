@@ -0,0 +1,80 @@
+"""
+Load rate of per-iteration results into the RESULTS table.
+
+Each strategy writes the same OOIP/ROIP columns into a fresh database in a temporary directory:
+- insert_results: executemany in batches, one commit per batch (what the application uses)
+- execute loop: one execute call per row inside a single transaction
+- commit per row: one execute and one commit per row, measured on --per-row-rows rows and extrapolated
+
+Usage:
+    python -m benchmarks.results_load [--rows 1000000] [--per-row-rows 2000]
+"""
+import argparse
+import os
+import tempfile
+import time
+
+import numpy as np
+
+from core.db import database
+
+BATCH_SIZES = (10_000, 100_000, 1_000_000)
+
+
+def fresh_database(directory, name):
+    database.close_db_connection()
+    database.DATABASE_PATH = os.path.join(directory, f"{name}.db")
+    database.create_tables()
+    return database.create_simulation(1, 0, 0, "pcg64", "random")
+
+
+def execute_loop(simulation_id, ooip, roip, commit_every_row):
+    with database.get_db_connection() as conn:
+        cursor = conn.cursor()
+        for ooip_value, roip_value in zip(ooip.tolist(), roip.tolist()):
+            cursor.execute("INSERT INTO results (simulation_id, ooip, roip, rgip) VALUES (?, ?, ?, NULL)",
+                           (simulation_id, ooip_value, roip_value))
+            if commit_every_row:
+                conn.commit()
+        conn.commit()
+
+
+def report(label, rows, seconds, measured_rows=None):
+    measured_rows = measured_rows or rows
+    rate = measured_rows / seconds
+    print(f"{label:>30} {rate:>14,.0f} {rows / rate:>12.2f}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, default=1_000_000)
+    parser.add_argument("--per-row-rows", type=int, default=2_000)
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(0)
+    ooip = rng.normal(27e6, 4e6, args.rows)
+    roip = ooip * rng.uniform(0.2, 0.25, args.rows)
+
+    print(f"{'strategy':>30} {'rows/s':>14} {'seconds':>12}  ({args.rows:,} rows)")
+    with tempfile.TemporaryDirectory() as directory:
+        for batch_size in BATCH_SIZES:
+            simulation_id = fresh_database(directory, f"batch_{batch_size}")
+            start = time.perf_counter()
+            database.insert_results(simulation_id, ooip, roip, batch_size=batch_size)
+            report(f"insert_results batch={batch_size:,}", args.rows, time.perf_counter() - start)
+
+        simulation_id = fresh_database(directory, "execute_loop")
+        start = time.perf_counter()
+        execute_loop(simulation_id, ooip, roip, commit_every_row=False)
+        report("execute loop", args.rows, time.perf_counter() - start)
+
+        simulation_id = fresh_database(directory, "commit_per_row")
+        sample = slice(0, min(args.per_row_rows, args.rows))
+        start = time.perf_counter()
+        execute_loop(simulation_id, ooip[sample], roip[sample], commit_every_row=True)
+        report("commit per row (extrap.)", args.rows, time.perf_counter() - start, len(ooip[sample]))
+        database.close_db_connection()
+
+
+if __name__ == "__main__":
+    main()
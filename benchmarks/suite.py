@@ -0,0 +1,248 @@
+"""
+Wall time and peak memory of every stage of a simulation, across iteration and parameter counts.
+
+Stages, each run on the data the previous ones produced:
+- sampling: DistributionPlotter.run_monte_carlo_simulation, one vectorized draw per parameter
+- volumetric: compute_ooip_roip on the sampled columns
+- simulation: MonteCarloSimulator.simulate, the sharded engine the application runs (with histograms)
+- kde: the density curves of the Simulations tab, OOIP/ROIP and one per parameter
+- summaries: the exact P1-P99 summaries and empirical CDFs of OOIP/ROIP
+- plotting: every figure of the Simulations tab, built and drawn with Agg
+- database: create_simulation, insert_results and insert_simulation_statistics into a temporary database
+
+Configurations with more than the six parameters of 'Well B' add copies of its distributions, which are sampled,
+binned and plotted but do not enter the volumetric equation. Time is the best of --repeat runs; peak memory is
+the largest tracemalloc allocation above the stage's starting point in one further run, which covers numpy arrays
+and Python objects but not memory allocated inside SQLite or Agg. Nothing imports PyQt, so the suite runs
+headless.
+
+The default iteration counts stop at 1e6. 1e7 iterations are opt-in with --iterations: the simulation stage
+alone then peaks at ~1.2 GB with six parameters, on top of the samples the earlier stages keep, and loading
+1e7 rows into RESULTS takes ~45 s per run of the database stage, so a default run would need several GB and
+several minutes per parameter count.
+
+Results are compared against a baseline JSON file when it exists; a stage regresses when its time exceeds the
+baseline by more than --time-threshold and a few milliseconds, or its peak memory by more than --memory-threshold
+and 1 MiB, and the exit status is 1 if any stage did. Peak memory is reproducible to the byte, while wall time
+varies by 10-30% between runs on a busy machine, hence the wider default for time. Baselines are machine-specific:
+record one with --save-baseline before changing the code.
+
+Usage:
+    python -m benchmarks.suite [--iterations 1e3 1e4 1e5 1e6 1e7] [--parameters 6 12] [--stages kde plotting]
+                               [--repeat 3] [--baseline benchmarks/baseline.json] [--save-baseline]
+"""
+import argparse
+import gc
+import json
+import os
+import platform
+import tempfile
+import time
+import tracemalloc
+
+import numpy as np
+from matplotlib.backends.backend_agg import FigureCanvasAgg
+
+from benchmarks.common import WELL_B_DISTRIBUTIONS
+from core.db import database
+from core.processing.processing import DistributionPlotter
+from core.processing.sampling import map_distributions_to_params
+from core.processing.statistics import reduced_ecdf
+from core.sim.monte_carlo.monte_carlo import MonteCarloSimulator
+from core.sim.monte_carlo.result import OOIP_COLUMN, ROIP_COLUMN, compute_ooip_roip
+from core.utils.plotting import parameter_cdf_figure, parameter_cdf_pixels, parameter_pdf_figure
+
+STAGES = ("sampling", "volumetric", "simulation", "kde", "summaries", "plotting", "database")
+# 1e7 is left out for the memory and time it takes, see above
+DEFAULT_ITERATIONS = (1_000, 10_000, 100_000, 1_000_000)
+DEFAULT_PARAMETERS = (6, 12)
+DEFAULT_BASELINE = os.path.join(os.path.dirname(__file__), "baseline.json")
+# Histogram bins and parameter density points of the Simulations tab
+BINS = 50
+# Size of the unmeasured configuration run before the others
+WARM_UP_ITERATIONS = 1_000
+# Time differences below this are timer and scheduling noise, whatever the ratio
+NOISE_SECONDS = 0.005
+
+
+def scaled_parameters(count):
+    """The 'Well B' parameters followed by renamed copies of its distributions, ``count`` in total."""
+    if count < len(WELL_B_DISTRIBUTIONS):
+        raise ValueError(f"The volumetric equation needs the {len(WELL_B_DISTRIBUTIONS)} 'Well B' parameters.")
+    rows = list(WELL_B_DISTRIBUTIONS)
+    for index in range(count - len(rows)):
+        name, *distribution = WELL_B_DISTRIBUTIONS[index % len(WELL_B_DISTRIBUTIONS)]
+        rows.append((f"{name} {index // len(WELL_B_DISTRIBUTIONS) + 2}", *distribution))
+    return map_distributions_to_params(rows)
+
+
+def draw(figure):
+    FigureCanvasAgg(figure).draw()
+
+
+def stage_functions(parameters, iterations, workers):
+    """
+    The stages of one configuration as callables, in order. Every callable recomputes its stage from scratch,
+    and each stage's output is kept in ``state`` for the stages after it.
+    """
+    state = {}
+    plotter = DistributionPlotter(parameters)
+    simulator = MonteCarloSimulator(plotter)
+
+    def sampling():
+        state["samples"] = plotter.run_monte_carlo_simulation(iterations, random_state=0)
+
+    def volumetric():
+        state["outputs"] = compute_ooip_roip(state["samples"])
+
+    def simulation():
+        state["result"] = simulator.simulate(iterations, seed=0, workers=workers)
+
+    def kde():
+        result = state["result"]
+        result.densities = {}
+        result.density(OOIP_COLUMN)
+        result.density(ROIP_COLUMN)
+        for name in result.samples:
+            result.density(name, BINS)
+
+    def summaries():
+        state["result"].summary_cache = {}
+        state["result"].summaries()
+
+    def plotting():
+        result = state["result"]
+        for name, data in result.samples.items():
+            draw(parameter_pdf_figure(result.histogram(name, BINS), name, iterations, result.density(name, BINS)))
+            draw(parameter_cdf_figure(reduced_ecdf(data, *parameter_cdf_pixels()), name, iterations))
+        for figure in simulator.run_simulation(iterations, result=result):
+            draw(figure)
+
+    def database_stage():
+        result = state["result"]
+        simulation_id = database.create_simulation(1, result.seed, result.iterations, result.bit_generator,
+                                                   result.sampling_mode, chunk_size=result.chunk_size)
+        database.insert_results(simulation_id, result.ooip, result.roip)
+        database.insert_simulation_statistics(simulation_id, result.statistics())
+
+    functions = {"sampling": sampling, "volumetric": volumetric, "simulation": simulation, "kde": kde,
+                 "summaries": summaries, "plotting": plotting, "database": database_stage}
+    return [(stage, functions[stage]) for stage in STAGES]
+
+
+def measure(function, repeat):
+    """Best wall time of ``repeat`` runs, then the peak traced allocation of one more run, in bytes."""
+    seconds = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        function()
+        seconds = min(seconds, time.perf_counter() - start)
+    # Figures are freed by the cycle collector; garbage left by the timed runs would otherwise be counted
+    gc.collect()
+    tracemalloc.start()
+    try:
+        baseline = tracemalloc.get_traced_memory()[0]
+        function()
+        peak = tracemalloc.get_traced_memory()[1] - baseline
+    finally:
+        tracemalloc.stop()
+    return seconds, max(peak, 0)
+
+
+def fresh_database(directory, name):
+    """Point the database module at a new, empty database, so inserts never depend on earlier configurations."""
+    database.close_db_connection()
+    database.DATABASE_PATH = os.path.join(directory, f"{name}.db")
+    database.create_tables()
+
+
+def run_suite(iterations_list, parameter_counts, stages, repeat, workers):
+    records = []
+    with tempfile.TemporaryDirectory() as directory:
+        try:
+            # The first run of every stage also imports modules, loads fonts and fills caches
+            fresh_database(directory, "warm_up")
+            for _, function in stage_functions(scaled_parameters(min(parameter_counts)), WARM_UP_ITERATIONS,
+                                               workers):
+                function()
+            for parameter_count in parameter_counts:
+                parameters = scaled_parameters(parameter_count)
+                for iterations in iterations_list:
+                    fresh_database(directory, f"{parameter_count}_{iterations}")
+                    for stage, function in stage_functions(parameters, iterations, workers):
+                        if stage not in stages:
+                            # Later stages still need its output, so it runs once without being measured
+                            function()
+                            continue
+                        seconds, peak = measure(function, repeat)
+                        records.append({"stage": stage, "iterations": iterations, "parameters": parameter_count,
+                                        "seconds": seconds, "peak_bytes": peak})
+                        print(f"{stage:>11} {iterations:>10} {parameter_count:>10} {seconds:>10.4f} "
+                              f"{peak / 2 ** 20:>10.1f}", flush=True)
+        finally:
+            database.close_db_connection()
+    return records
+
+
+def compare(records, baseline, time_threshold, memory_threshold):
+    """Print every record next to its baseline and return the number of regressions."""
+    previous = {(record["stage"], record["iterations"], record["parameters"]): record for record in baseline}
+    regressions = 0
+    print(f"\n{'stage':>11} {'iterations':>10} {'parameters':>10} {'seconds':>10} {'baseline':>10} {'ratio':>7} "
+          f"{'peak MiB':>10} {'baseline':>10} {'ratio':>7}")
+    for record in records:
+        reference = previous.get((record["stage"], record["iterations"], record["parameters"]))
+        if reference is None:
+            continue
+        time_ratio = record["seconds"] / max(reference["seconds"], 1e-9)
+        memory_ratio = record["peak_bytes"] / max(reference["peak_bytes"], 1)
+        slower = time_ratio > 1 + time_threshold and record["seconds"] - reference["seconds"] > NOISE_SECONDS
+        larger = memory_ratio > 1 + memory_threshold and record["peak_bytes"] - reference["peak_bytes"] > 2 ** 20
+        regressions += slower or larger
+        print(f"{record['stage']:>11} {record['iterations']:>10} {record['parameters']:>10} "
+              f"{record['seconds']:>10.4f} {reference['seconds']:>10.4f} {time_ratio:>7.2f} "
+              f"{record['peak_bytes'] / 2 ** 20:>10.1f} {reference['peak_bytes'] / 2 ** 20:>10.1f} "
+              f"{memory_ratio:>7.2f}{'  REGRESSION' if slower or larger else ''}")
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--iterations", nargs="+", type=lambda value: int(float(value)),
+                        default=list(DEFAULT_ITERATIONS))
+    parser.add_argument("--parameters", nargs="+", type=int, default=list(DEFAULT_PARAMETERS))
+    parser.add_argument("--stages", nargs="+", choices=STAGES, default=list(STAGES))
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--workers", type=int, default=1,
+                        help="worker processes of the simulation stage; memory of other processes is not traced")
+    parser.add_argument("--baseline", default=DEFAULT_BASELINE)
+    parser.add_argument("--save-baseline", action="store_true", help="write the results to --baseline")
+    parser.add_argument("--time-threshold", type=float, default=0.5)
+    parser.add_argument("--memory-threshold", type=float, default=0.1)
+    parser.add_argument("--output", help="also write the results to this JSON file")
+    args = parser.parse_args()
+
+    print(f"{'stage':>11} {'iterations':>10} {'parameters':>10} {'seconds':>10} {'peak MiB':>10}")
+    records = run_suite(args.iterations, args.parameters, args.stages, args.repeat, args.workers)
+    report = {
+        "environment": {"python": platform.python_version(), "numpy": np.__version__,
+                        "machine": platform.machine(), "system": platform.system(), "cpus": os.cpu_count(),
+                        "repeat": args.repeat, "workers": args.workers},
+        "results": records,
+    }
+    for path in filter(None, (args.output, args.baseline if args.save_baseline else None)):
+        with open(path, "w") as file:
+            json.dump(report, file, indent=2)
+        print(f"Results written to {path}")
+
+    if args.save_baseline or not os.path.exists(args.baseline):
+        return 0
+    with open(args.baseline) as file:
+        baseline = json.load(file)
+    regressions = compare(records, baseline["results"], args.time_threshold, args.memory_threshold)
+    print(f"\n{regressions} regression(s) against {args.baseline}")
+    return 1 if regressions else 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,336 @@
+import csv
+import json
+import os
+from itertools import chain, islice
+
+import numpy as np
+
+from core.db.database import get_db_connection
+from core.processing.sampling import DEFAULT_SAMPLING_MODE, SAMPLING_MODES
+
+# One row per distribution; the configuration columns repeat on every row of a configuration, and consecutive
+# rows with the same name, iterations and sampling mode belong to the same configuration. The optional
+# configuration column tells apart consecutive configurations that share all three, e.g. two with the same
+# name; exports write the source ID there. A configuration without distributions is a single row with an
+# empty parameter_name.
+CONFIGURATION_KEY_COLUMN = "configuration"
+CONFIGURATION_COLUMNS = ("name", "iterations", "sampling_mode")
+DISTRIBUTION_COLUMNS = ("parameter_name", "distribution_type", "mean", "std_dev", "min_value", "max_value",
+                        "mode_value")
+BULK_COLUMNS = CONFIGURATION_COLUMNS + DISTRIBUTION_COLUMNS
+EXPORT_COLUMNS = (CONFIGURATION_KEY_COLUMN,) + BULK_COLUMNS
+NUMERIC_COLUMNS = ("mean", "std_dev", "min_value", "max_value", "mode_value")
+# Distribution types accepted by map_distributions_to_params, keyed by their lower-case name
+DISTRIBUTION_TYPES = {"normal": "Normal", "log-normal": "Log-normal", "uniform": "Uniform",
+                      "triangular": "Triangular", "beta": "Beta"}
+# Rows parsed, validated and written per executemany call
+BULK_CHUNK_SIZE = 50_000
+# Invalid rows listed in the error message of a rejected import
+MAX_REPORTED_ERRORS = 10
+
+
+def _file_format(path, file_format):
+    file_format = file_format or os.path.splitext(path)[1].lstrip(".").lower()
+    if file_format == "jsonl":
+        file_format = "json"
+    if file_format not in ("csv", "json"):
+        raise ValueError(f"Unsupported file format '{file_format}'; use 'csv' or 'json'.")
+    return file_format
+
+
+def _csv_rows(file):
+    """Yield (line number, row dict) from a CSV file with a header row naming BULK_COLUMNS."""
+    reader = csv.DictReader(file)
+    missing = [column for column in ("name", "iterations") if column not in (reader.fieldnames or ())]
+    if missing:
+        raise ValueError(f"The CSV header lacks the columns: {', '.join(missing)}.")
+    for row in reader:
+        yield reader.line_num, row
+
+
+def _json_rows(file):
+    """
+    Yield (line number, row dict) from JSON configurations of the form
+    ``{"name": ..., "iterations": ..., "sampling_mode": ..., "distributions": [{"parameter_name": ...}, ...]}``.
+
+    JSON Lines files, one configuration per line, are streamed; a file holding a single JSON array is read
+    whole, and its configurations are numbered from 1 instead of by line. The number doubles as the
+    configuration key, so every record is a configuration of its own whatever its name.
+    """
+    first, line = file.read(1), 1
+    while first.isspace():
+        line += first == "\n"
+        first = file.read(1)
+    if first == "[":
+        configurations = enumerate(json.loads(first + file.read()), start=1)
+    else:
+        lines = chain([first + file.readline()], file)
+        configurations = ((number, json.loads(text)) for number, text in enumerate(lines, start=line) if text.strip())
+
+    for number, configuration in configurations:
+        header = {CONFIGURATION_KEY_COLUMN: number,
+                  **{column: configuration.get(column) for column in CONFIGURATION_COLUMNS}}
+        distributions = configuration.get("distributions") or [{}]
+        for distribution in distributions:
+            yield number, {**header, **{column: distribution.get(column) for column in DISTRIBUTION_COLUMNS}}
+
+
+def _missing(column):
+    return np.equal(column, None) | np.equal(column, "")
+
+
+def _text_column(values, default=""):
+    return np.array([default if value is None or value == "" else str(value).strip() for value in values],
+                    dtype=object)
+
+
+def _float_column(values):
+    """Convert a column of numbers, numeric strings, None or '' to float64, with NaN for missing values."""
+    column = np.array(values, dtype=object)
+    column[_missing(column)] = np.nan
+    return column.astype(np.float64)
+
+
+def _parse_chunk(lines, rows):
+    """
+    Convert a chunk of row dicts to column arrays and check them all at once.
+
+    Returns the columns as a dict of arrays. Raises ValueError listing the first MAX_REPORTED_ERRORS invalid
+    rows by line number.
+    """
+    lines = np.asarray(lines)
+    columns = {column: [row.get(column) for row in rows] for column in EXPORT_COLUMNS}
+    errors = []
+
+    def reject(mask, message):
+        for line in lines[mask][:MAX_REPORTED_ERRORS]:
+            errors.append((int(line), message))
+
+    names = _text_column(columns["name"])
+    reject(names == "", "name is required")
+
+    numeric = {}
+    for column in ("iterations",) + NUMERIC_COLUMNS:
+        try:
+            numeric[column] = _float_column(columns[column])
+        except (TypeError, ValueError):
+            # Locate the offending values only once the fast conversion has failed
+            bad = np.array([not _is_number(value) for value in columns[column]])
+            reject(bad, f"{column} is not a number")
+            numeric[column] = np.full(len(rows), np.nan)
+    iterations = numeric["iterations"]
+    reject(~((iterations >= 1) & (iterations == np.floor(iterations))), "iterations must be a positive integer")
+
+    sampling_modes = np.char.lower(_text_column(columns["sampling_mode"], DEFAULT_SAMPLING_MODE).astype(str))
+    reject(~np.isin(sampling_modes, SAMPLING_MODES), f"sampling_mode must be one of {', '.join(SAMPLING_MODES)}")
+
+    parameter_names = _text_column(columns["parameter_name"])
+    types = np.char.lower(_text_column(columns["distribution_type"]).astype(str))
+    has_distribution = parameter_names != ""
+    reject(has_distribution & ~np.isin(types, list(DISTRIBUTION_TYPES)),
+           f"distribution_type must be one of {', '.join(DISTRIBUTION_TYPES.values())}")
+
+    mean, std_dev = numeric["mean"], numeric["std_dev"]
+    low, high, mode = numeric["min_value"], numeric["max_value"], numeric["mode_value"]
+    # Comparisons with NaN are False, so a missing required value fails the same checks as an invalid one
+    valid = {
+        "normal": (np.isfinite(mean) & (std_dev > 0), "normal needs a mean and a positive std_dev"),
+        "log-normal": ((mean > 0) & (std_dev > 0), "log-normal needs a positive mean and std_dev"),
+        "uniform": (np.isfinite(low) & (low < high) & np.isfinite(high), "uniform needs min_value < max_value"),
+        "triangular": ((low <= mode) & (mode <= high) & (low < high) & np.isfinite(low) & np.isfinite(high),
+                       "triangular needs min_value <= mode_value <= max_value"),
+        "beta": ((mean > 0) & (mean < 1) & (std_dev > 0) & (std_dev ** 2 < mean * (1 - mean)),
+                 "beta needs 0 < mean < 1 and std_dev**2 < mean * (1 - mean)"),
+    }
+    for kind, (checks, message) in valid.items():
+        reject(has_distribution & (types == kind) & ~checks, message)
+
+    if errors:
+        errors.sort()
+        details = "; ".join(f"line {line}: {message}" for line, message in errors[:MAX_REPORTED_ERRORS])
+        raise ValueError(f"Invalid configuration rows. {details}")
+
+    return {CONFIGURATION_KEY_COLUMN: _text_column(columns[CONFIGURATION_KEY_COLUMN]),
+            "name": names, "iterations": iterations.astype(np.int64), "sampling_mode": sampling_modes,
+            "parameter_name": parameter_names, "distribution_type": types, "has_distribution": has_distribution,
+            **{column: numeric[column] for column in NUMERIC_COLUMNS}}
+
+
+def _is_number(value):
+    if value is None or value == "":
+        return True
+    try:
+        float(value)
+    except (TypeError, ValueError):
+        return False
+    return True
+
+
+def _configuration_keys(columns):
+    """The values that start a new configuration wherever they change from one row to the next."""
+    return list(zip(columns[CONFIGURATION_KEY_COLUMN].tolist(), columns["name"].tolist(),
+                    columns["iterations"].tolist(), columns["sampling_mode"].tolist()))
+
+
+def _nullable(column):
+    """Return a column as a list with NaN replaced by None, so SQLite stores NULL."""
+    return np.where(np.isnan(column), None, column).tolist()
+
+
+def import_configurations(path, file_format=None, chunk_size=BULK_CHUNK_SIZE):
+    """
+    Import configurations and their distributions from a CSV or JSON file.
+
+    The file is read and validated in chunks of ``chunk_size`` rows and written with executemany, all in one
+    transaction: if any row is invalid, nothing is imported. Imported configurations are disabled, so the
+    enabled configuration does not change.
+
+    Parameters:
+    - path: str. CSV file with a header row of BULK_COLUMNS and optionally CONFIGURATION_KEY_COLUMN, or a
+      JSON / JSON Lines file of configurations.
+    - file_format: str or None. 'csv' or 'json'; derived from the file extension if None.
+    - chunk_size: int. Rows parsed, validated and written at a time.
+
+    Returns:
+    - counts: tuple. Number of configurations and of distributions imported.
+    """
+    file_format = _file_format(path, file_format)
+    conn = get_db_connection()
+    cursor = conn.cursor()
+    # Configuration IDs are assigned here so distributions can reference them without a lookup per row;
+    # IMMEDIATE holds the write lock, so no other writer can take the same IDs in the meantime.
+    cursor.execute("BEGIN IMMEDIATE")
+    try:
+        next_id = cursor.execute("SELECT COALESCE(MAX(id), 0) + 1 FROM parameters").fetchone()[0]
+        configurations = distributions = 0
+        previous = None
+        with open(path, newline="", encoding="utf-8-sig") as file:
+            rows = _csv_rows(file) if file_format == "csv" else _json_rows(file)
+            while True:
+                chunk = list(islice(rows, chunk_size))
+                if not chunk:
+                    break
+                lines, row_dicts = zip(*chunk)
+                columns = _parse_chunk(lines, row_dicts)
+
+                # A configuration starts wherever the configuration columns change; one may span two chunks
+                keys = _configuration_keys(columns)
+                starts = np.array([key != before for key, before in zip(keys, [previous] + keys[:-1])])
+                parameter_ids = next_id - 1 + np.cumsum(starts)
+                new = np.flatnonzero(starts)
+                cursor.executemany(
+                    "INSERT INTO parameters (id, name, iterations, enabled, sampling_mode) VALUES (?, ?, ?, 0, ?)",
+                    zip(parameter_ids[new].tolist(), columns["name"][new], columns["iterations"][new].tolist(),
+                        columns["sampling_mode"][new]))
+
+                rows_with_distribution = np.flatnonzero(columns["has_distribution"])
+                distribution_types = [DISTRIBUTION_TYPES[kind] for kind in columns["distribution_type"][
+                    rows_with_distribution]]
+                cursor.executemany('''
+                    INSERT INTO distributions (parameter_id, parameter_name, distribution_type, mean, std_dev,
+                                               min_value, max_value, mode_value)
+                    VALUES (?, ?, ?, ?, ?, ?, ?, ?)''',
+                                   zip(parameter_ids[rows_with_distribution].tolist(),
+                                       columns["parameter_name"][rows_with_distribution], distribution_types,
+                                       *(_nullable(columns[column][rows_with_distribution])
+                                         for column in NUMERIC_COLUMNS)))
+
+                configurations += len(new)
+                distributions += len(rows_with_distribution)
+                next_id = int(parameter_ids[-1]) + 1
+                previous = keys[-1]
+        conn.commit()
+    except BaseException:
+        conn.rollback()
+        raise
+    return configurations, distributions
+
+
+def read_configurations(path, file_format=None, chunk_size=BULK_CHUNK_SIZE):
+    """
+    Read the configurations of a CSV or JSON file without storing them, validated like import_configurations.
+
+    Parameters:
+    - path: str. File in the layout read by import_configurations.
+    - file_format: str or None. 'csv' or 'json'; derived from the file extension if None.
+    - chunk_size: int. Rows parsed and validated at a time.
+
+    Yields:
+    - configuration: dict. The name, iterations and sampling_mode of a configuration, and its distributions
+      as rows in the layout of get_parameter_distributions.
+    """
+    file_format = _file_format(path, file_format)
+    configuration, previous = None, None
+    with open(path, newline="", encoding="utf-8-sig") as file:
+        rows = _csv_rows(file) if file_format == "csv" else _json_rows(file)
+        while chunk := list(islice(rows, chunk_size)):
+            lines, row_dicts = zip(*chunk)
+            columns = _parse_chunk(lines, row_dicts)
+            numeric = [_nullable(columns[column]) for column in NUMERIC_COLUMNS]
+            for index, key in enumerate(_configuration_keys(columns)):
+                if key != previous:
+                    if configuration is not None:
+                        yield configuration
+                    configuration = {"name": key[1], "iterations": key[2], "sampling_mode": key[3],
+                                     "distributions": []}
+                    previous = key
+                if columns["has_distribution"][index]:
+                    configuration["distributions"].append(
+                        (columns["parameter_name"][index], DISTRIBUTION_TYPES[columns["distribution_type"][index]],
+                         *(values[index] for values in numeric)))
+    if configuration is not None:
+        yield configuration
+
+
+def export_configurations(path, parameter_ids=None, file_format=None, chunk_size=BULK_CHUNK_SIZE):
+    """
+    Export configurations and their distributions to a CSV or JSON Lines file that import_configurations reads.
+
+    Rows are fetched and written ``chunk_size`` at a time, so the export never holds the tables in memory. CSV
+    rows carry the configuration's ID in CONFIGURATION_KEY_COLUMN, so configurations sharing a name are kept
+    apart when the file is imported again.
+
+    Parameters:
+    - path: str. Output file.
+    - parameter_ids: list or None. Configurations to export; all of them if None.
+    - file_format: str or None. 'csv' or 'json'; derived from the file extension if None.
+    - chunk_size: int. Rows fetched per round trip.
+
+    Returns:
+    - configurations: int. Number of configurations exported.
+    """
+    file_format = _file_format(path, file_format)
+    query = '''
+        SELECT p.id, p.name, p.iterations, p.sampling_mode, d.parameter_name, d.distribution_type, d.mean,
+               d.std_dev, d.min_value, d.max_value, d.mode_value
+        FROM parameters AS p LEFT JOIN distributions AS d ON d.parameter_id = p.id'''
+    arguments = ()
+    if parameter_ids is not None:
+        parameter_ids = list(parameter_ids)
+        query += f" WHERE p.id IN ({', '.join('?' * len(parameter_ids))})"
+        arguments = parameter_ids
+    query += " ORDER BY p.id, d.id"
+
+    configurations = 0
+    with get_db_connection() as conn, open(path, "w", newline="", encoding="utf-8") as file:
+        cursor = conn.execute(query, arguments)
+        writer = csv.writer(file) if file_format == "csv" else None
+        if writer:
+            writer.writerow(EXPORT_COLUMNS)
+        current_id, current = None, None
+        while rows := cursor.fetchmany(chunk_size):
+            for parameter_id, *values in rows:
+                if parameter_id != current_id:
+                    configurations += 1
+                    if current is not None:
+                        file.write(json.dumps(current) + "\n")
+                    current_id = parameter_id
+                    current = None if writer else {**dict(zip(CONFIGURATION_COLUMNS, values[:3])),
+                                                   "distributions": []}
+                if writer:
+                    writer.writerow([parameter_id] + ["" if value is None else value for value in values])
+                elif values[3] is not None:
+                    current["distributions"].append(dict(zip(DISTRIBUTION_COLUMNS, values[3:])))
+        if current is not None:
+            file.write(json.dumps(current) + "\n")
+    return configurations
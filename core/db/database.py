@@ -1,9 +1,34 @@
 import os
 import sqlite3
+import threading
 from datetime import datetime
+from itertools import repeat
+
+from core.db.migrations import migrate
 
 # Assuming environment variables are set externally
 DATABASE_PATH = os.getenv('DATABASE_PATH', 'simulation_results.db')
+# Rows written per executemany call and commit when bulk-loading per-iteration results
+RESULTS_BATCH_SIZE = 100_000
+# Outputs and statistics stored in SIMULATION_STATISTICS; column names are <COLUMN>_<OUTPUT>, e.g. P10_OOIP.
+# Keys follow the summaries produced by the result classes; the median is the same value as P50.
+STATISTICS_OUTPUTS = ("OOIP", "ROIP", "RGIP")
+STATISTICS_FIELDS = {"MEAN": "mean", "MEDIAN": "P50", "STD_DEV": "std", "P10": "P10", "P50": "P50", "P90": "P90"}
+STATISTICS_COLUMNS = tuple(f"{column}_{output}" for output in STATISTICS_OUTPUTS for column in STATISTICS_FIELDS)
+
+# Applied once to every new connection. WAL lets the GUI read while a simulation worker writes; with WAL,
+# synchronous=NORMAL only syncs at checkpoints and stays crash-safe. cache_size is in KiB when negative.
+CONNECTION_PRAGMAS = (
+    "PRAGMA journal_mode = WAL",
+    "PRAGMA synchronous = NORMAL",
+    "PRAGMA cache_size = -65536",
+    "PRAGMA mmap_size = 268435456",
+    "PRAGMA temp_store = MEMORY",
+)
+# Seconds a connection waits for another thread's write transaction before raising "database is locked"
+BUSY_TIMEOUT = 30
+
+_connections = threading.local()
 
 form_to_db_column_mapping = {
     "Water Saturation": "water_saturation",
@@ -19,8 +44,30 @@ form_to_db_column_mapping = {
 
 
 def get_db_connection():
-    """Establishes a connection to the SQLite database."""
-    return sqlite3.connect(DATABASE_PATH)
+    """
+    Return this thread's connection to the SQLite database, opening it on first use.
+
+    Connections are kept open and reused for the lifetime of the thread, one per thread and database path,
+    since sqlite3 connections must not be shared between threads. Use them as ``with get_db_connection()
+    as conn:``, which commits or rolls back the transaction but leaves the connection open.
+    """
+    connections = getattr(_connections, "by_path", None)
+    if connections is None:
+        connections = _connections.by_path = {}
+    conn = connections.get(DATABASE_PATH)
+    if conn is None:
+        conn = sqlite3.connect(DATABASE_PATH, timeout=BUSY_TIMEOUT)
+        for pragma in CONNECTION_PRAGMAS:
+            conn.execute(pragma)
+        connections[DATABASE_PATH] = conn
+    return conn
+
+
+def close_db_connection():
+    """Close the connections of the calling thread; call it before a worker thread exits."""
+    for conn in getattr(_connections, "by_path", {}).values():
+        conn.close()
+    _connections.by_path = {}
 
 
 def activate_parameter(config_id):
@@ -32,83 +79,232 @@ def activate_parameter(config_id):
 
 
 def create_tables():
+    """Create the schema of a new database, or upgrade an existing one to the current schema version."""
+    migrate(get_db_connection())
+
+
+def create_simulation(parameter_id, seed, iterations, bit_generator, sampling_mode, chunk_size=None, tolerance=None,
+                      achieved_tolerance=None, store_path=None):
+    """
+    Record a simulation run and return its ID. The seed, chunk size and iterations actually used are
+    enough to re-materialize the run; adaptive runs also record the requested and achieved tolerance, and
+    runs written to a columnar sample store record its directory.
+    """
+    with get_db_connection() as conn:
+        cursor = conn.cursor()
+        cursor.execute('''
+            INSERT INTO simulations (parameter_id, seed, bit_generator, iterations, sampling_mode, chunk_size,
+                                     tolerance, achieved_tolerance, store_path)
+            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)''', (parameter_id, str(seed), bit_generator, iterations, sampling_mode,
+                                                  chunk_size, tolerance, achieved_tolerance, store_path))
+        conn.commit()
+        return cursor.lastrowid
+
+
+def insert_results(simulation_id, ooip, roip, rgip=None, batch_size=RESULTS_BATCH_SIZE):
+    """
+    Bulk-load the per-iteration outputs of a run into RESULTS.
+
+    Rows are written with executemany in batches of ``batch_size``, each batch committed as one
+    transaction, so memory stays bounded and a 1e6-row run loads in seconds. If any batch fails, the rows
+    already written for the run are removed again and the error is re-raised.
+
+    Parameters:
+    - simulation_id: int. ID of the SIMULATIONS row the results belong to.
+    - ooip, roip: array_like. Per-iteration OOIP and ROIP (bbl).
+    - rgip: array_like or None. Per-iteration RGIP; stored as NULL when not simulated.
+    - batch_size: int. Number of rows per executemany call and commit.
+
+    Returns:
+    - rows: int. Number of rows written.
+    """
+    count = len(ooip)
+    with get_db_connection() as conn:
+        cursor = conn.cursor()
+        try:
+            for start in range(0, count, batch_size):
+                stop = min(start + batch_size, count)
+                # tolist() converts a whole batch of numpy floats to Python floats in one call
+                rgip_batch = rgip[start:stop].tolist() if rgip is not None else repeat(None, stop - start)
+                rows = zip(repeat(simulation_id), ooip[start:stop].tolist(), roip[start:stop].tolist(), rgip_batch)
+                cursor.executemany("INSERT INTO results (simulation_id, ooip, roip, rgip) VALUES (?, ?, ?, ?)", rows)
+                conn.commit()
+        except Exception:
+            conn.rollback()
+            cursor.execute("DELETE FROM results WHERE simulation_id = ?", (simulation_id,))
+            conn.commit()
+            raise
+    return count
+
+
+def get_results(simulation_id):
+    """Return the (ooip, roip, rgip) rows of a run in insertion order."""
     with get_db_connection() as conn:
-        c = conn.cursor()
-        c.execute('''CREATE TABLE IF NOT EXISTS PARAMETERS (
-          ID INTEGER PRIMARY KEY,
-          NAME TEXT NOT NULL,
-          ITERATIONS INTEGER,
-          ENABLED INTEGER DEFAULT 0,
-          CREATED_AT DATETIME DEFAULT CURRENT_TIMESTAMP,
-          UPDATED_AT DATETIME DEFAULT CURRENT_TIMESTAMP
-        )''')
-
-        c.execute('''CREATE TABLE IF NOT EXISTS DISTRIBUTIONS (
-          ID INTEGER PRIMARY KEY,
-          PARAMETER_ID INTEGER,
-          PARAMETER_NAME TEXT NOT NULL,
-          DISTRIBUTION_TYPE TEXT NOT NULL,
-          MEAN REAL,
-          STD_DEV REAL,
-          MIN_VALUE REAL,
-          MAX_VALUE REAL,
-          MODE_VALUE REAL,
-          FOREIGN KEY(PARAMETER_ID) REFERENCES PARAMETERS(ID)
-        )''')
-
-        c.execute('''CREATE TABLE IF NOT EXISTS SIMULATIONS (
-          ID INTEGER PRIMARY KEY,
-          PARAMETER_ID INTEGER,
-          CREATED_AT DATETIME DEFAULT CURRENT_TIMESTAMP,
-          FOREIGN KEY(PARAMETER_ID) REFERENCES PARAMETERS(ID)
-        )''')
-
-        c.execute('''CREATE TABLE IF NOT EXISTS RESULTS (
-          ID INTEGER PRIMARY KEY,
-          SIMULATION_ID INTEGER,
-          OOIP REAL,
-          ROIP REAL,
-          RGIP REAL,
-          CREATED_AT DATETIME DEFAULT CURRENT_TIMESTAMP,
-          FOREIGN KEY(SIMULATION_ID) REFERENCES SIMULATIONS(ID)
-        )''')
-
-        c.execute('''CREATE TABLE IF NOT EXISTS SIMULATION_STATISTICS (
-          ID INTEGER PRIMARY KEY,
-          SIMULATION_ID INTEGER,
-          MEAN_OOIP REAL,
-          MEDIAN_OOIP REAL,
-          STD_DEV_OOIP REAL,
-          P10_OOIP REAL,
-          P50_OOIP REAL, -- Median is the same as P50
-          P90_OOIP REAL,
-          MEAN_ROIP REAL,
-          MEDIAN_ROIP REAL,
-          STD_DEV_ROIP REAL,
-          P10_ROIP REAL,
-          P50_ROIP REAL,
-          P90_ROIP REAL,
-          MEAN_RGIP REAL,
-          MEDIAN_RGIP REAL,
-          STD_DEV_RGIP REAL,
-          P10_RGIP REAL,
-          P50_RGIP REAL,
-          P90_RGIP REAL,
-          CREATED_AT DATETIME DEFAULT CURRENT_TIMESTAMP,
-          FOREIGN KEY(SIMULATION_ID) REFERENCES SIMULATIONS(ID)
-        )''')
+        cursor = conn.cursor()
+        cursor.execute("SELECT ooip, roip, rgip FROM results WHERE simulation_id = ? ORDER BY id", (simulation_id,))
+        return cursor.fetchall()
+
+
+def insert_simulation_statistics(simulation_id, summaries):
+    """
+    Store the summary statistics of a run, replacing any statistics stored for it before.
 
+    :param simulation_id: ID of the SIMULATIONS row.
+    :param summaries: Dict mapping 'OOIP', 'ROIP' and optionally 'RGIP' to summaries with 'mean', 'std',
+                      'P10', 'P50' and 'P90' entries. Outputs that are missing are stored as NULL.
+    """
+    values = [summaries[output][key] if output in summaries else None
+              for output in STATISTICS_OUTPUTS for key in STATISTICS_FIELDS.values()]
+    with get_db_connection() as conn:
+        cursor = conn.cursor()
+        cursor.execute(f'''
+            INSERT OR REPLACE INTO simulation_statistics (simulation_id, {", ".join(STATISTICS_COLUMNS)})
+            VALUES (?, {", ".join("?" * len(STATISTICS_COLUMNS))})''', (simulation_id, *values))
         conn.commit()
 
 
+def _statistics_from_row(values):
+    """Nest a row of STATISTICS_COLUMNS values as {output: {'mean', 'median', 'std', 'P10', 'P50', 'P90'}}."""
+    values = iter(values)
+    statistics = {}
+    for output in STATISTICS_OUTPUTS:
+        fields = {column: next(values) for column in STATISTICS_FIELDS}
+        statistics[output] = {"mean": fields["MEAN"], "median": fields["MEDIAN"], "std": fields["STD_DEV"],
+                              "P10": fields["P10"], "P50": fields["P50"], "P90": fields["P90"]}
+    return statistics
+
+
+def get_simulation_statistics(simulation_id):
+    """Return the stored statistics of a run as {output: {'mean', 'median', 'std', 'P10', 'P50', 'P90'}}, or None."""
+    with get_db_connection() as conn:
+        cursor = conn.cursor()
+        cursor.execute(f"SELECT {', '.join(STATISTICS_COLUMNS)} FROM simulation_statistics WHERE simulation_id = ?",
+                       (simulation_id,))
+        row = cursor.fetchone()
+        return _statistics_from_row(row) if row else None
+
+
+def list_simulation_statistics(parameter_id=None, limit=1000, offset=0):
+    """
+    List stored runs with their statistics, newest first, without touching RESULTS.
+
+    Parameters:
+    - parameter_id: int or None. Only list runs of this configuration.
+    - limit: int. Maximum number of runs to return.
+    - offset: int. Number of runs to skip, for paging.
+
+    Returns:
+    - runs: list. One dict per run with 'simulation_id', 'parameter_id', 'parameter_name', 'iterations',
+      'sampling_mode', 'created_at' and 'statistics' (see get_simulation_statistics).
+    """
+    where = "WHERE s.parameter_id = ?" if parameter_id is not None else ""
+    arguments = (parameter_id,) if parameter_id is not None else ()
+    with get_db_connection() as conn:
+        cursor = conn.cursor()
+        cursor.execute(f'''
+            SELECT s.id, s.parameter_id, p.name, s.iterations, s.sampling_mode, s.created_at,
+                   {", ".join(f"st.{column}" for column in STATISTICS_COLUMNS)}
+            FROM simulations AS s
+            INNER JOIN simulation_statistics AS st ON st.simulation_id = s.id
+            LEFT JOIN parameters AS p ON p.id = s.parameter_id
+            {where}
+            ORDER BY s.created_at DESC, s.id DESC
+            LIMIT ? OFFSET ?''', (*arguments, limit, offset))
+        return [{"simulation_id": row[0], "parameter_id": row[1], "parameter_name": row[2], "iterations": row[3],
+                 "sampling_mode": row[4], "created_at": row[5], "statistics": _statistics_from_row(row[6:])}
+                for row in cursor.fetchall()]
+
+
+def compare_simulation_statistics(simulation_ids, output="OOIP"):
+    """
+    Compare the statistics of several runs of one output against the first run given.
+
+    :param simulation_ids: IDs of the runs; the first one is the baseline.
+    :param output: 'OOIP', 'ROIP' or 'RGIP'.
+    :return: Dict mapping each run ID that has statistics to {statistic: (value, relative difference to the
+             baseline)}. Differences are None when the baseline value is missing or zero.
+    """
+    simulation_ids = list(simulation_ids)
+    if not simulation_ids:
+        return {}
+    with get_db_connection() as conn:
+        cursor = conn.cursor()
+        cursor.execute(f'''
+            SELECT simulation_id, {", ".join(STATISTICS_COLUMNS)}
+            FROM simulation_statistics
+            WHERE simulation_id IN ({", ".join("?" * len(simulation_ids))})''', simulation_ids)
+        rows = {row[0]: _statistics_from_row(row[1:])[output] for row in cursor.fetchall()}
+
+    baseline = rows.get(simulation_ids[0], {})
+    comparison = {}
+    for simulation_id in simulation_ids:
+        if simulation_id not in rows:
+            continue
+        comparison[simulation_id] = {
+            name: (value, (value - baseline[name]) / baseline[name]
+                   if value is not None and baseline.get(name) else None)
+            for name, value in rows[simulation_id].items()
+        }
+    return comparison
+
+
+def get_simulation(simulation_id):
+    """
+    Return (id, parameter_id, seed, bit_generator, iterations, sampling_mode, chunk_size, tolerance,
+    achieved_tolerance, created_at, store_path) of a run, or None.
+    """
+    with get_db_connection() as conn:
+        cursor = conn.cursor()
+        cursor.execute('''
+            SELECT id, parameter_id, seed, bit_generator, iterations, sampling_mode, chunk_size, tolerance,
+                   achieved_tolerance, created_at, store_path
+            FROM simulations
+            WHERE id = ?''', (simulation_id,))
+        simulation = cursor.fetchone()
+        if simulation is None:
+            return None
+        return (simulation[0], simulation[1], int(simulation[2]) if simulation[2] is not None else None,
+                *simulation[3:])
+
+
 def get_enabled_parameter():
     with get_db_connection() as conn:
         cursor = conn.cursor()
-        cursor.execute("SELECT id, name, iterations FROM parameters WHERE enabled = 1 LIMIT 1")
+        cursor.execute("SELECT id, name, iterations, sampling_mode FROM parameters WHERE enabled = 1 LIMIT 1")
         enabled_param = cursor.fetchone()
         return enabled_param if enabled_param else []
 
 
+def get_parameter(parameter_id):
+    """Return (id, name, iterations, sampling_mode) of a configuration, or None."""
+    with get_db_connection() as conn:
+        cursor = conn.cursor()
+        cursor.execute("SELECT id, name, iterations, sampling_mode FROM parameters WHERE id = ?", (parameter_id,))
+        return cursor.fetchone()
+
+
+def find_parameter(name):
+    """Return (id, name, iterations, sampling_mode) of the newest configuration called ``name``, or None."""
+    with get_db_connection() as conn:
+        cursor = conn.cursor()
+        cursor.execute('''
+            SELECT id, name, iterations, sampling_mode FROM parameters
+            WHERE name = ?
+            ORDER BY id DESC LIMIT 1''', (name,))
+        return cursor.fetchone()
+
+
+def set_sampling_mode(config_id, sampling_mode):
+    """Set the sampling mode ('random', 'lhs', ...) used when a configuration is simulated."""
+    with get_db_connection() as conn:
+        cursor = conn.cursor()
+        cursor.execute('''
+            UPDATE parameters
+            SET sampling_mode = ?, updated_at = CURRENT_TIMESTAMP
+            WHERE id = ?''', (sampling_mode, config_id))
+        conn.commit()
+
+
 def get_enabled_parameter_and_distributions():
     with get_db_connection() as conn:
         cursor = conn.cursor()
@@ -130,6 +326,18 @@ def get_enabled_parameter_and_distributions():
         return param_name, distributions
 
 
+def get_parameter_distributions(parameter_id):
+    """Return the distribution rows of a configuration in the layout of get_enabled_parameter_and_distributions."""
+    with get_db_connection() as conn:
+        cursor = conn.cursor()
+        cursor.execute("""
+            SELECT parameter_name, distribution_type, mean, std_dev, min_value, max_value, mode_value
+            FROM distributions
+            WHERE parameter_id = ?
+        """, (parameter_id,))
+        return cursor.fetchall()
+
+
 def get_distributions_by_parameter_id(parameter_id):
     with get_db_connection() as conn:
         cursor = conn.cursor()
@@ -208,45 +416,37 @@ def enable_parameter(config_id):
 
 def delete_parameter(config_id):
     """Delete a configuration by its ID."""
-    conn = get_db_connection()
-    cursor = conn.cursor()
-    cursor.execute("DELETE FROM parameters WHERE id = ?", (config_id,))
-    conn.commit()
-    conn.close()
+    with get_db_connection() as conn:
+        cursor = conn.cursor()
+        cursor.execute("DELETE FROM parameters WHERE id = ?", (config_id,))
+        conn.commit()
 
 
 def activate_parameter(config_id):
     """Activate a configuration, setting it as enabled."""
-    conn = get_db_connection()
-    cursor = conn.cursor()
-    # Set all to disabled first, if you want only one active at a time
-    cursor.execute("UPDATE parameters SET enabled = 0")
-    # Now, activate the selected one
-    cursor.execute("UPDATE parameters SET enabled = 1 WHERE id = ?", (config_id,))
-    conn.commit()
-    conn.close()
+    with get_db_connection() as conn:
+        cursor = conn.cursor()
+        # Set all to disabled first, if you want only one active at a time
+        cursor.execute("UPDATE parameters SET enabled = 0")
+        # Now, activate the selected one
+        cursor.execute("UPDATE parameters SET enabled = 1 WHERE id = ?", (config_id,))
+        conn.commit()
 
 
 def save_parameter(configuration):
-    """Save or update a configuration."""
-    conn = get_db_connection()
-    cursor = conn.cursor()
-    # If the configuration has an 'id', update; else, insert a new record
-    if 'id' in configuration and configuration['id']:
-        cursor.execute("""
-            UPDATE parameters
-            SET name = ?, iterations = ?, area = ?, thickness = ?, porosity = ?, water_saturation = ?, fvf = ?, updated_at = ?
-            WHERE id = ?""",
-                       (configuration['name'], configuration['iterations'], configuration['area'],
-                        configuration['thickness'],
-                        configuration['porosity'], configuration['water_saturation'], configuration['fvf'],
-                        datetime.now(), configuration['id']))
-    else:
-        cursor.execute("""
-            INSERT INTO parameters (name, iterations, area, thickness, porosity, water_saturation, fvf, enabled)
-            VALUES (?, ?, ?, ?, ?, ?, ?, ?)""",
-                       (configuration['name'], configuration['iterations'], configuration['area'],
-                        configuration['thickness'],
-                        configuration['porosity'], configuration['water_saturation'], configuration['fvf'], 0))
-    conn.commit()
-    conn.close()
+    """Save or update a configuration; new configurations are saved disabled."""
+    with get_db_connection() as conn:
+        cursor = conn.cursor()
+        # If the configuration has an 'id', update; else, insert a new record
+        if 'id' in configuration and configuration['id']:
+            cursor.execute("""
+                UPDATE parameters
+                SET name = ?, iterations = ?, updated_at = ?
+                WHERE id = ?""",
+                           (configuration['name'], configuration['iterations'], datetime.now(), configuration['id']))
+        else:
+            cursor.execute("""
+                INSERT INTO parameters (name, iterations, enabled)
+                VALUES (?, ?, ?)""",
+                           (configuration['name'], configuration['iterations'], 0))
+        conn.commit()
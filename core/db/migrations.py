@@ -0,0 +1,165 @@
+"""
+Versioned schema migrations for the simulation database.
+
+The schema version of a database file is kept in SQLite's ``PRAGMA user_version``. Each migration upgrades
+the schema by one version and runs in its own transaction together with the version bump, so an interrupted
+upgrade resumes from the last completed step. Databases created before migrations existed report version 0;
+their tables may already carry some of the later columns, so every step checks what exists before changing it.
+"""
+
+
+def _add_missing_columns(cursor, table, columns):
+    """Add the columns of ``columns`` (name -> type) that ``table`` does not have yet."""
+    cursor.execute(f"PRAGMA table_info({table})")
+    existing = {row[1].upper() for row in cursor.fetchall()}
+    for name, column_type in columns.items():
+        if name.upper() not in existing:
+            cursor.execute(f"ALTER TABLE {table} ADD COLUMN {name} {column_type}")
+
+
+def _create_base_tables(cursor):
+    cursor.execute('''CREATE TABLE IF NOT EXISTS PARAMETERS (
+      ID INTEGER PRIMARY KEY,
+      NAME TEXT NOT NULL,
+      ITERATIONS INTEGER,
+      ENABLED INTEGER DEFAULT 0,
+      CREATED_AT DATETIME DEFAULT CURRENT_TIMESTAMP,
+      UPDATED_AT DATETIME DEFAULT CURRENT_TIMESTAMP
+    )''')
+
+    cursor.execute('''CREATE TABLE IF NOT EXISTS DISTRIBUTIONS (
+      ID INTEGER PRIMARY KEY,
+      PARAMETER_ID INTEGER,
+      PARAMETER_NAME TEXT NOT NULL,
+      DISTRIBUTION_TYPE TEXT NOT NULL,
+      MEAN REAL,
+      STD_DEV REAL,
+      MIN_VALUE REAL,
+      MAX_VALUE REAL,
+      MODE_VALUE REAL,
+      FOREIGN KEY(PARAMETER_ID) REFERENCES PARAMETERS(ID)
+    )''')
+
+    cursor.execute('''CREATE TABLE IF NOT EXISTS SIMULATIONS (
+      ID INTEGER PRIMARY KEY,
+      PARAMETER_ID INTEGER,
+      CREATED_AT DATETIME DEFAULT CURRENT_TIMESTAMP,
+      FOREIGN KEY(PARAMETER_ID) REFERENCES PARAMETERS(ID)
+    )''')
+
+    cursor.execute('''CREATE TABLE IF NOT EXISTS RESULTS (
+      ID INTEGER PRIMARY KEY,
+      SIMULATION_ID INTEGER,
+      OOIP REAL,
+      ROIP REAL,
+      RGIP REAL,
+      CREATED_AT DATETIME DEFAULT CURRENT_TIMESTAMP,
+      FOREIGN KEY(SIMULATION_ID) REFERENCES SIMULATIONS(ID)
+    )''')
+
+    cursor.execute('''CREATE TABLE IF NOT EXISTS SIMULATION_STATISTICS (
+      ID INTEGER PRIMARY KEY,
+      SIMULATION_ID INTEGER,
+      MEAN_OOIP REAL,
+      MEDIAN_OOIP REAL,
+      STD_DEV_OOIP REAL,
+      P10_OOIP REAL,
+      P50_OOIP REAL, -- Median is the same as P50
+      P90_OOIP REAL,
+      MEAN_ROIP REAL,
+      MEDIAN_ROIP REAL,
+      STD_DEV_ROIP REAL,
+      P10_ROIP REAL,
+      P50_ROIP REAL,
+      P90_ROIP REAL,
+      MEAN_RGIP REAL,
+      MEDIAN_RGIP REAL,
+      STD_DEV_RGIP REAL,
+      P10_RGIP REAL,
+      P50_RGIP REAL,
+      P90_RGIP REAL,
+      CREATED_AT DATETIME DEFAULT CURRENT_TIMESTAMP,
+      FOREIGN KEY(SIMULATION_ID) REFERENCES SIMULATIONS(ID)
+    )''')
+
+
+def _add_parameter_sampling_mode(cursor):
+    _add_missing_columns(cursor, "PARAMETERS", {"SAMPLING_MODE": "TEXT DEFAULT 'random'"})
+
+
+def _add_simulation_reproducibility(cursor):
+    # SEED is stored as text, seeds may exceed the 64-bit INTEGER range. TOLERANCE is the requested relative
+    # tolerance of an adaptive run.
+    _add_missing_columns(cursor, "SIMULATIONS", {"SEED": "TEXT", "BIT_GENERATOR": "TEXT", "ITERATIONS": "INTEGER",
+                                                 "SAMPLING_MODE": "TEXT", "CHUNK_SIZE": "INTEGER",
+                                                 "TOLERANCE": "REAL", "ACHIEVED_TOLERANCE": "REAL"})
+
+
+def _add_simulation_store_path(cursor):
+    # Directory of the columnar sample store, if the run was written to one
+    _add_missing_columns(cursor, "SIMULATIONS", {"STORE_PATH": "TEXT"})
+
+
+def _create_run_indexes(cursor):
+    # Lookups of a run's rows and of the runs of a configuration stay index seeks as history grows
+    cursor.execute("CREATE INDEX IF NOT EXISTS IDX_SIMULATIONS_PARAMETER_ID ON SIMULATIONS (PARAMETER_ID, CREATED_AT)")
+    cursor.execute("CREATE INDEX IF NOT EXISTS IDX_RESULTS_SIMULATION_ID ON RESULTS (SIMULATION_ID)")
+    cursor.execute("CREATE UNIQUE INDEX IF NOT EXISTS IDX_SIMULATION_STATISTICS_SIMULATION_ID "
+                   "ON SIMULATION_STATISTICS (SIMULATION_ID)")
+
+
+def _create_lookup_indexes(cursor):
+    # The enabled configuration and its distributions are read before every run and on every tab switch.
+    # At most one configuration is enabled, so a partial index on it holds a single entry.
+    cursor.execute("CREATE INDEX IF NOT EXISTS IDX_DISTRIBUTIONS_PARAMETER_ID ON DISTRIBUTIONS (PARAMETER_ID)")
+    cursor.execute("CREATE INDEX IF NOT EXISTS IDX_PARAMETERS_ENABLED ON PARAMETERS (ENABLED) WHERE ENABLED = 1")
+
+
+# Migration i (counting from 1) upgrades a database from version i - 1 to version i. Append new steps at the
+# end and never edit a released one: databases in the field have already recorded it as applied.
+MIGRATIONS = (
+    _create_base_tables,
+    _add_parameter_sampling_mode,
+    _add_simulation_reproducibility,
+    _add_simulation_store_path,
+    _create_run_indexes,
+    _create_lookup_indexes,
+)
+SCHEMA_VERSION = len(MIGRATIONS)
+
+
+def get_schema_version(conn):
+    return conn.execute("PRAGMA user_version").fetchone()[0]
+
+
+def migrate(conn, target_version=None):
+    """
+    Upgrade the schema of a database to ``target_version``.
+
+    Parameters:
+    - conn: sqlite3.Connection. Open connection to the database; no transaction may be pending.
+    - target_version: int or None. Version to upgrade to, SCHEMA_VERSION if None.
+
+    Returns:
+    - version: int. The schema version of the database after the upgrade.
+    """
+    target_version = SCHEMA_VERSION if target_version is None else target_version
+    if not 0 <= target_version <= SCHEMA_VERSION:
+        raise ValueError(f"Unknown schema version {target_version}; the latest is {SCHEMA_VERSION}.")
+
+    version = get_schema_version(conn)
+    while version < target_version:
+        cursor = conn.cursor()
+        # IMMEDIATE takes the write lock up front, so two processes opening the same file apply each step once
+        cursor.execute("BEGIN IMMEDIATE")
+        try:
+            version = get_schema_version(conn)
+            if version < target_version:
+                MIGRATIONS[version](cursor)
+                version += 1
+                cursor.execute(f"PRAGMA user_version = {version}")
+            conn.commit()
+        except BaseException:
+            conn.rollback()
+            raise
+    return version
@@ -0,0 +1,146 @@
+import json
+import os
+import re
+import shutil
+import struct
+
+import numpy as np
+
+# Every column file starts with a fixed-size .npy (format 1.0) header, so the header can be rewritten in place
+# with the final length once all chunks have been appended.
+NPY_MAGIC = b"\x93NUMPY\x01\x00"
+NPY_HEADER_SIZE = 128
+MANIFEST_NAME = "manifest.json"
+
+
+def _npy_header(dtype, length):
+    """Return a .npy header for a one-dimensional array of ``length`` items, padded to NPY_HEADER_SIZE bytes."""
+    header = repr({"descr": np.lib.format.dtype_to_descr(np.dtype(dtype)), "fortran_order": False,
+                   "shape": (length,)})
+    padding = NPY_HEADER_SIZE - len(NPY_MAGIC) - 2 - len(header) - 1
+    return NPY_MAGIC + struct.pack("<H", NPY_HEADER_SIZE - len(NPY_MAGIC) - 2) + header.encode("latin1") + \
+        b" " * padding + b"\n"
+
+
+def column_file_name(name, taken=()):
+    """Derive a file name such as 'net_to_gross_ratio.npy' from a column name, avoiding names in ``taken``."""
+    stem = re.sub(r"[^0-9a-z]+", "_", name.lower()).strip("_") or "column"
+    file_name, suffix = f"{stem}.npy", 1
+    while file_name in taken:
+        suffix += 1
+        file_name = f"{stem}_{suffix}.npy"
+    return file_name
+
+
+class ColumnWriter:
+    """
+    Appends chunks of values to a single .npy file without holding the column in memory.
+
+    Attributes:
+    - path (str): Path of the .npy file.
+    - dtype (numpy.dtype): Data type of the column.
+    - length (int): Number of values written so far.
+    """
+
+    def __init__(self, path, dtype=np.float64):
+        self.path = path
+        self.dtype = np.dtype(dtype)
+        self.length = 0
+        self._file = open(path, "wb")
+        self._file.write(_npy_header(self.dtype, 0))
+
+    def append(self, values):
+        values = np.ascontiguousarray(values, dtype=self.dtype)
+        values.tofile(self._file)
+        self.length += values.size
+
+    def close(self):
+        if self._file.closed:
+            return
+        self._file.seek(0)
+        self._file.write(_npy_header(self.dtype, self.length))
+        self._file.close()
+
+
+class RunStoreWriter:
+    """
+    Writes the samples and outputs of a run as a columnar store: one .npy file per column in a directory.
+
+    Chunks are appended as the run produces them, so a run of tens of millions of iterations never needs to
+    be held in memory to be stored. Use it as a context manager: the store is finalized when the block
+    exits normally and deleted when it raises, e.g. when the run is cancelled.
+
+    Attributes:
+    - directory (str): Directory holding the column files and the manifest.
+    - iterations (int): Number of iterations written so far.
+    """
+
+    def __init__(self, directory):
+        self.directory = directory
+        self.iterations = 0
+        self._columns = {}
+        os.makedirs(directory, exist_ok=True)
+
+    def append(self, columns):
+        """
+        Append one chunk. ``columns`` maps column names to equally sized arrays; the first chunk fixes the
+        set of columns.
+        """
+        if not self._columns:
+            taken = set()
+            for name in columns:
+                file_name = column_file_name(name, taken)
+                taken.add(file_name)
+                self._columns[name] = ColumnWriter(os.path.join(self.directory, file_name))
+        elif columns.keys() != self._columns.keys():
+            raise ValueError("Every chunk must contain the same columns.")
+
+        sizes = {len(values) for values in columns.values()}
+        if len(sizes) > 1:
+            raise ValueError("All columns of a chunk must have the same length.")
+        for name, values in columns.items():
+            self._columns[name].append(values)
+        self.iterations += sizes.pop() if sizes else 0
+
+    def close(self):
+        """Write the final column lengths and the manifest."""
+        for writer in self._columns.values():
+            writer.close()
+        manifest = {
+            "iterations": self.iterations,
+            "columns": {name: os.path.basename(writer.path) for name, writer in self._columns.items()},
+        }
+        with open(os.path.join(self.directory, MANIFEST_NAME), "w") as file:
+            json.dump(manifest, file, indent=2)
+
+    def discard(self):
+        """Close and delete the partially written store."""
+        for writer in self._columns.values():
+            writer.close()
+        shutil.rmtree(self.directory, ignore_errors=True)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        if exc_type is None:
+            self.close()
+        else:
+            self.discard()
+        return False
+
+
+def open_run_store(directory):
+    """
+    Open a columnar run store read-only.
+
+    Columns are memory-mapped with ``np.load(mmap_mode='r')``, so only the pages actually touched by an
+    analysis or a re-plot are read from disk.
+
+    :param directory: Directory written by a RunStoreWriter.
+    :return: Dict mapping column names to read-only memory-mapped arrays, in the order they were written.
+    """
+    with open(os.path.join(directory, MANIFEST_NAME)) as file:
+        manifest = json.load(file)
+    return {name: np.load(os.path.join(directory, file_name), mmap_mode="r")
+            for name, file_name in manifest["columns"].items()}
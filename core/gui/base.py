@@ -8,8 +8,8 @@ from core.gui.dialogs.language import LanguageDialog
 from core.gui.tabs.about import populate_about_tab
 from core.gui.tabs.license import populate_license_tab
 from core.gui.tabs.parameters import ParametersTab
+from core.gui.tabs.results import ResultsTab
 from core.gui.tabs.settings import SettingsTab
-from core.gui.tabs.simulations import SimulationsTab
 from core.utils.lang import load_language
 from core.utils.helpers import load_config
 from PyQt6.QtCore import Qt
@@ -34,6 +34,8 @@ class MainApplication(QMainWindow):
         self.layout = QVBoxLayout(self.central_widget)
         self.tab_widget = None  # Attribute to store a reference to the tab widge
         self.simulation_tab = None
+        self.simulations_tab_instance = None
+        self.results_tab = None
         self.create_tabs()
         self.create_footer()
         self.show()
@@ -41,6 +43,11 @@ class MainApplication(QMainWindow):
 
         # Connect tab widget's currentChanged signal to the refresh method
 
+    def closeEvent(self, event):
+        if self.simulations_tab_instance is not None:
+            self.simulations_tab_instance.shutdown()
+        super().closeEvent(event)
+
     def resize_app(self):
         # Retrieve the size of the screen
         screen = QApplication.primaryScreen().geometry()
@@ -64,15 +71,14 @@ class MainApplication(QMainWindow):
         ParametersTab(parameters_tab, self.config, self.lang)
 
         # Simulation Tab
+        # Its contents, and the numpy/scipy/matplotlib modules behind them, are built when it is first selected
         self.simulation_tab = QWidget()
-        # Keep a reference to the SimulationsTab instance
-        # Assuming 'simulation_tab_widget' is the QWidget or QTabWidget you want to use as the container
-        self.simulations_tab_instance = SimulationsTab(context=self, tab=self.simulation_tab)
         self.tab_widget.addTab(self.simulation_tab, self.lang.get("simulations", "Simulations"))
 
-        # Plot Tab
-        # plot_tab = QWidget()
-        # self.tab_widget.addTab(plot_tab, self.lang.get("results", "Results"))
+        # Results Tab
+        self.results_tab = QWidget()
+        self.results_tab_instance = ResultsTab(self.results_tab, self.lang)
+        self.tab_widget.addTab(self.results_tab, self.lang.get("results", "Results"))
 
         # Settings Tab
         settings_tab = QWidget()
@@ -96,8 +102,20 @@ class MainApplication(QMainWindow):
         print("Tab changed to index:", index)
         # Check if the SimulationsTab is the currently selected tab
         if self.tab_widget.widget(index) == self.simulation_tab:
-            # If so, refresh the enabled parameter in the SimulationsTab
-            self.simulations_tab_instance.refresh_parameters()
+            if self.simulations_tab_instance is None:
+                # A new SimulationsTab reads the enabled parameter itself
+                self.simulations_tab_instance = self.create_simulations_tab()
+            else:
+                # If so, refresh the enabled parameter in the SimulationsTab
+                self.simulations_tab_instance.refresh_parameters()
+        elif self.tab_widget.widget(index) == self.results_tab:
+            # Pick up runs finished since the tab was last shown
+            self.results_tab_instance.load_results()
+
+    def create_simulations_tab(self):
+        from core.gui.tabs.simulations import SimulationsTab
+
+        return SimulationsTab(context=self, tab=self.simulation_tab)
 
     def create_footer(self):
         footer_frame = QFrame()
@@ -1,5 +1,5 @@
 import os
-from PyQt6.QtWidgets import QFrame, QPushButton, QHBoxLayout, QVBoxLayout, QToolBar
+from PyQt6.QtWidgets import QFrame, QPushButton, QHBoxLayout, QVBoxLayout, QToolBar, QStyle
 from PyQt6.QtGui import QIcon, QAction
 from PyQt6.QtCore import QSize
 from PyQt6.QtCore import Qt
@@ -29,6 +29,16 @@ def create_action_ribbon(self, parent):
     delete_action.triggered.connect(lambda: self.delete_parameters())
     action_ribbon.addAction(delete_action)
 
+    import_action = QAction(action_ribbon.style().standardIcon(QStyle.StandardPixmap.SP_DialogOpenButton), "Import",
+                            action_ribbon)
+    import_action.triggered.connect(lambda: self.import_parameters())
+    action_ribbon.addAction(import_action)
+
+    export_action = QAction(action_ribbon.style().standardIcon(QStyle.StandardPixmap.SP_DialogSaveButton), "Export",
+                            action_ribbon)
+    export_action.triggered.connect(lambda: self.export_parameters())
+    action_ribbon.addAction(export_action)
+
     # Ensure the parent has a layout before adding the action_ribbon
     if not parent.layout():
         # If the parent has no layout, create a QVBoxLayout and set it to the parent
@@ -1,7 +1,7 @@
 from PyQt6.QtGui import QFont
 from PyQt6.QtWidgets import (
     QVBoxLayout, QFrame, QLabel, QTreeWidget, QTreeWidgetItem, QLineEdit, QPushButton, QErrorMessage, QAbstractItemView,
-    QGridLayout, QGroupBox, QHBoxLayout
+    QGridLayout, QGroupBox, QHBoxLayout, QFileDialog, QMessageBox
 )
 from core.db.database import activate_parameter, delete_parameter, insert_parameters, list_parameters, \
     update_parameter_by_id
@@ -110,6 +110,35 @@ class ParametersTab:
         # Reload or update UI as necessary
         self.load_parameters()
 
+    def import_parameters(self):
+        """Import configurations from a CSV or JSON file chosen by the user."""
+        path, _ = QFileDialog.getOpenFileName(None, self.lang.get("import_parameters", "Import Configurations"), "",
+                                              "Configurations (*.csv *.json *.jsonl)")
+        if not path:
+            return
+        # Deferred, the bulk module loads scipy through the sampling module
+        from core.db.bulk import import_configurations
+        try:
+            configurations, distributions = import_configurations(path)
+        except (OSError, ValueError) as e:
+            QErrorMessage().showMessage(f"Error importing configurations: {e}")
+            return
+        QMessageBox.information(None, self.lang.get("import_parameters", "Import Configurations"),
+                                f"Imported {configurations} configurations with {distributions} distributions.")
+        self.load_parameters()
+
+    def export_parameters(self):
+        """Export all configurations to a CSV or JSON Lines file chosen by the user."""
+        path, _ = QFileDialog.getSaveFileName(None, self.lang.get("export_parameters", "Export Configurations"),
+                                              "configurations.csv", "CSV (*.csv);;JSON Lines (*.jsonl)")
+        if not path:
+            return
+        from core.db.bulk import export_configurations
+        try:
+            export_configurations(path)
+        except (OSError, ValueError) as e:
+            QErrorMessage().showMessage(f"Error exporting configurations: {e}")
+
     def populate_parameters_tab(self, tab):
         # Main layout for the entire tab
         main_layout = QVBoxLayout(tab)
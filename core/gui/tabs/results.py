@@ -0,0 +1,89 @@
+from PyQt6.QtWidgets import QVBoxLayout, QHBoxLayout, QPushButton, QTreeWidget, QAbstractItemView, QLabel
+
+from core.db.database import compare_simulation_statistics, list_simulation_statistics
+from core.gui.widgets.centered_tree_item import CenteredTreeWidgetItem
+
+# Statistics shown for each output, in MMbbl
+DISPLAYED_STATISTICS = ("mean", "P90", "P50", "P10")
+
+
+class ResultsTab:
+    """
+    Lists past runs with their stored summary statistics and compares selected runs side by side.
+
+    Everything shown comes from SIMULATION_STATISTICS, so the tab loads without reading per-iteration
+    results or re-running any simulation.
+    """
+
+    def __init__(self, tab, lang):
+        self.lang = lang
+        self.runs_table = None
+        self.comparison_table = None
+        self.comparison_label = None
+        self.populate_results_tab(tab)
+
+    def populate_results_tab(self, tab):
+        main_layout = QVBoxLayout(tab)
+
+        button_layout = QHBoxLayout()
+        refresh_button = QPushButton(self.lang.get("refresh", "Refresh"))
+        refresh_button.clicked.connect(self.load_results)
+        compare_button = QPushButton(self.lang.get("compare", "Compare Selected"))
+        compare_button.clicked.connect(self.compare_selected)
+        button_layout.addWidget(refresh_button)
+        button_layout.addWidget(compare_button)
+        button_layout.addStretch(1)
+        main_layout.addLayout(button_layout)
+
+        self.runs_table = QTreeWidget()
+        self.runs_table.setIndentation(0)
+        self.runs_table.setHeaderLabels(
+            ['ID', 'Configuration', 'Iterations', 'Sampling', 'Created At'] +
+            [f"OOIP {name}" for name in DISPLAYED_STATISTICS] + [f"ROIP {name}" for name in DISPLAYED_STATISTICS])
+        self.runs_table.setSelectionMode(QAbstractItemView.SelectionMode.ExtendedSelection)
+        self.runs_table.setSelectionBehavior(QAbstractItemView.SelectionBehavior.SelectRows)
+        self.runs_table.setAlternatingRowColors(True)
+        main_layout.addWidget(self.runs_table, stretch=3)
+
+        self.comparison_label = QLabel(self.lang.get("compare_hint", "Select two or more runs to compare OOIP."))
+        main_layout.addWidget(self.comparison_label)
+        self.comparison_table = QTreeWidget()
+        self.comparison_table.setIndentation(0)
+        main_layout.addWidget(self.comparison_table, stretch=2)
+
+        self.load_results()
+
+    def load_results(self):
+        self.runs_table.clear()
+        for run in list_simulation_statistics():
+            statistics = run["statistics"]
+            display_values = [
+                str(run["simulation_id"]),
+                run["parameter_name"] or "",
+                str(run["iterations"]),
+                run["sampling_mode"] or "",
+                run["created_at"],
+            ] + [format_mm(statistics[output][name]) for output in ("OOIP", "ROIP") for name in DISPLAYED_STATISTICS]
+            self.runs_table.addTopLevelItem(CenteredTreeWidgetItem(display_values))
+
+    def compare_selected(self):
+        # The first selected run is the baseline the others are compared against
+        simulation_ids = [int(item.text(0)) for item in self.runs_table.selectedItems()]
+        self.comparison_table.clear()
+        if len(simulation_ids) < 2:
+            self.comparison_label.setText(self.lang.get("compare_hint", "Select two or more runs to compare OOIP."))
+            return
+
+        comparison = compare_simulation_statistics(simulation_ids, "OOIP")
+        self.comparison_label.setText(f"OOIP (MMbbl) compared with run {simulation_ids[0]}")
+        self.comparison_table.setHeaderLabels(['Statistic'] + [f"Run {simulation_id}" for simulation_id in comparison])
+        for name in DISPLAYED_STATISTICS:
+            cells = [name]
+            for value, difference in (statistics[name] for statistics in comparison.values()):
+                cells.append(format_mm(value) + (f" ({difference:+.2%})" if difference else ""))
+            self.comparison_table.addTopLevelItem(CenteredTreeWidgetItem(cells))
+
+
+def format_mm(value):
+    """Format a value in barrels as MMbbl with two decimals."""
+    return f"{value / 1e6:.2f}" if value is not None else "-"
@@ -1,30 +1,81 @@
-import numpy as np
+import os
+import tempfile
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime
+
 from PyQt6.QtGui import QFont, QPixmap
 from PyQt6.QtWidgets import (
     QVBoxLayout, QLabel, QComboBox, QPushButton, QMessageBox, QGroupBox, QHBoxLayout, QSpinBox, QTabWidget, QWidget,
-    QGridLayout, QScrollArea
+    QGridLayout, QScrollArea, QProgressBar, QLineEdit
 )
 from PyQt6.QtCore import Qt
-from matplotlib.backends.backend_qtagg import FigureCanvasQTAgg as FigureCanvas
-from matplotlib.figure import Figure
-from scipy.stats import gaussian_kde
 
-from core.db.database import get_enabled_parameter, get_enabled_parameter_and_distributions
+from core.db.database import create_simulation, get_enabled_parameter, get_enabled_parameter_and_distributions, \
+    insert_results, insert_simulation_statistics, set_sampling_mode
+from core.gui.widgets.lazy_figure import LazyFigureCanvas
+from core.gui.workers.figure_export import FigureExportReporter
+from core.gui.workers.process_pool import gui_process_context
+from core.gui.workers.simulation_worker import SimulationWorker, start_simulation_worker
+from core.processing.accumulators import DEFAULT_HISTOGRAM_BINS
 from core.sim.monte_carlo.monte_carlo import MonteCarloSimulator
 from core.processing.processing import DistributionPlotter
+from core.processing.rng import new_seed
+from core.processing.sampling import DEFAULT_SAMPLING_MODE, SAMPLING_MODES, map_distributions_to_params
+from core.sim.cache import DEFAULT_CACHE_SIZE, ResultCache, cache_key
+from core.sim.monte_carlo.result import OOIP_COLUMN, ROIP_COLUMN
+from core.utils.export import EXPORT_FORMATS, FigureExporter
+from core.utils.plotting import output_cdf_figure, output_pdf_figure, parameter_cdf_figure, parameter_cdf_pixels, \
+    parameter_pdf_figure
 
 
 class SimulationsTab:
     def __init__(self, context, tab):
         self.parameter_var = QComboBox()
         self.enabled_parameter = ""
+        self.seed_var = None
+        self.sampling_mode_var = None
+        self.tolerance_var = None
+        self.run_simulation_button = None
+        self.cancel_simulation_button = None
+        self.progress_bar = None
+        self.simulation_thread = None
+        self.simulation_worker = None
+        self.monte_carlo_simulator = None
+        self.distributions = []
+        self.pending_cache_key = None
         self.context = context
         self.config = self.context.config
+        cache_size_mb = self.config.get("simulationSettings", {}).get("resultCacheSizeMB")
+        self.result_cache = ResultCache(os.path.join("results", "cache"),
+                                        cache_size_mb * 2 ** 20 if cache_size_mb else DEFAULT_CACHE_SIZE)
+        # Worker processes are never forked from this process, whose Qt threads may hold locks
+        self.process_context = gui_process_context()
+        # Shards of every run are evaluated by one pool, started by the first run that needs it
+        self.simulation_executor = None
+        # Figures are saved to results/ by a pool of worker processes, in every configured format
+        self.export_formats = self.config.get("simulationSettings", {}).get("figureExportFormats", ["png"])
+        self.export_reporter = FigureExportReporter()
+        self.export_reporter.progress.connect(self.on_export_progress)
+        self.export_reporter.failed.connect(self.on_export_failed)
+        self.figure_exporter = FigureExporter(os.path.join("results", "figure_cache"),
+                                              progress=self.export_reporter.progress.emit,
+                                              failed=self.export_reporter.failed.emit,
+                                              mp_context=self.process_context)
+        self.export_errors = []
+        self.export_status_label = None
+        # Per-iteration OOIP/ROIP are loaded into RESULTS only for runs of at most this many iterations, 0 for
+        # none; the samples are kept in the run store and the result cache either way
+        self.result_rows_limit = self.config.get("simulationSettings", {}).get("resultRowsLimit", 0)
+        # Runs whose samples would take more than this many MiB are streamed, keeping only their statistics and
+        # histograms in memory; 0 keeps every run in memory
+        memory_budget_mb = self.config.get("simulationSettings", {}).get("memoryBudgetMB", 0)
+        self.memory_budget = memory_budget_mb * 2 ** 20 if memory_budget_mb else None
         self.lang = self.context.lang
         self.populate_enabled_parameter()
         # Populate the simulations tab
         self.populate_simulations_tab(tab)
-        self.bins = 50
+        # Streaming runs keep histograms with the engine's bin count only, so the PDFs use the same
+        self.bins = DEFAULT_HISTOGRAM_BINS
         # Iterations
         self.iterations = 0
 
@@ -60,6 +111,18 @@ class SimulationsTab:
         self.populate_enabled_parameter()
         if self.enabled_parameter:
             self.parameter_var.addItem(self.enabled_parameter[1])  # Assuming [1] is the name
+        self.sampling_mode_var.setCurrentText(self.enabled_sampling_mode())
+
+    def enabled_sampling_mode(self):
+        if self.enabled_parameter and self.enabled_parameter[3]:
+            return self.enabled_parameter[3]  # Assuming [3] is the sampling mode column
+        return DEFAULT_SAMPLING_MODE
+
+    def save_sampling_mode(self, sampling_mode):
+        # The sampling mode is stored per configuration, so it follows the enabled parameter
+        if self.enabled_parameter:
+            set_sampling_mode(self.enabled_parameter[0], sampling_mode)
+            self.populate_enabled_parameter()
 
     def populate_simulations_tab(self, tab):
         tab_layout = QVBoxLayout(tab)
@@ -72,11 +135,27 @@ class SimulationsTab:
         tab_layout.addWidget(parameter_group_box)
         tab_layout.addSpacing(10)  # Add some space between groups
 
-        # Run Simulation Button with its own layout for proper alignment
-        run_simulation_button = QPushButton(self.lang.get("run_simulation", "Run Simulation"))
-        run_simulation_button.clicked.connect(self.run_simulation)  # Connect run_simulation method here
-        tab_layout.addWidget(run_simulation_button)
-        run_simulation_button.setStyleSheet("width: 100%")
+        # Run and Cancel Simulation Buttons side by side
+        button_layout = QHBoxLayout()
+        self.run_simulation_button = QPushButton(self.lang.get("run_simulation", "Run Simulation"))
+        self.run_simulation_button.clicked.connect(self.run_simulation)  # Connect run_simulation method here
+        button_layout.addWidget(self.run_simulation_button, 1)
+        self.cancel_simulation_button = QPushButton(self.lang.get("cancel_simulation", "Cancel"))
+        self.cancel_simulation_button.clicked.connect(self.cancel_simulation)
+        self.cancel_simulation_button.setEnabled(False)  # Only enabled while a simulation is running
+        button_layout.addWidget(self.cancel_simulation_button)
+        tab_layout.addLayout(button_layout)
+
+        # Progress of the running simulation, updated after every chunk
+        self.progress_bar = QProgressBar()
+        self.progress_bar.setRange(0, 100)
+        self.progress_bar.setValue(0)
+        tab_layout.addWidget(self.progress_bar)
+
+        # Progress and failures of the figure exports, which finish after the plots are shown
+        self.export_status_label = QLabel()
+        self.export_status_label.setWordWrap(True)
+        tab_layout.addWidget(self.export_status_label)
 
     def setup_parameter_selection(self, layout):
         parameter_label = QLabel(self.lang.get("select_parameter", "Selected Parameter:"))
@@ -91,57 +170,187 @@ class SimulationsTab:
 
         layout.addWidget(self.parameter_var)
 
+        # Sampling mode of the enabled configuration
+        sampling_mode_label = QLabel(self.lang.get("sampling_mode", "Sampling Mode:"))
+        layout.addWidget(sampling_mode_label)
+        self.sampling_mode_var = QComboBox()
+        self.sampling_mode_var.addItems(SAMPLING_MODES)
+        self.sampling_mode_var.setCurrentText(self.enabled_sampling_mode())
+        self.sampling_mode_var.textActivated.connect(self.save_sampling_mode)
+        layout.addWidget(self.sampling_mode_var)
+
+        # Relative tolerance of an adaptive run; the configured iterations become the cap
+        tolerance_label = QLabel(self.lang.get("simulation_tolerance", "Relative Tolerance (optional):"))
+        layout.addWidget(tolerance_label)
+        self.tolerance_var = QLineEdit()
+        self.tolerance_var.setPlaceholderText(self.lang.get("simulation_tolerance_placeholder",
+                                                            "e.g. 0.01 to stop at 1%, empty to run all iterations"))
+        layout.addWidget(self.tolerance_var)
+
+        # Run-level seed; the same seed and configuration always reproduce the same run
+        seed_label = QLabel(self.lang.get("simulation_seed", "Seed:"))
+        layout.addWidget(seed_label)
+        seed_layout = QHBoxLayout()
+        self.seed_var = QLineEdit(str(new_seed()))
+        seed_layout.addWidget(self.seed_var, 1)
+        new_seed_button = QPushButton(self.lang.get("new_seed", "New Seed"))
+        new_seed_button.clicked.connect(lambda: self.seed_var.setText(str(new_seed())))
+        seed_layout.addWidget(new_seed_button)
+        layout.addLayout(seed_layout)
+
     def fetch_and_map_distributions(self):
         # Get the enabled parameter and its distributions
         enabled_parameter, distributions = get_enabled_parameter_and_distributions()
 
         # Check if an enabled parameter was found and has distributions
         if enabled_parameter and distributions:
+            self.distributions = distributions
             self.params = self.map_distributions_to_params(distributions)
             print(self.params)
         else:
+            self.distributions = []
             self.params = {}  # Fallback if no enabled parameter or distributions
 
     def map_distributions_to_params(self, distributions):
         print("Distributions: ", distributions)
-        params = {}
-        for dist in distributions:
-            param_name = dist[0]  # Assuming the third column in the database is the parameter_name
-            dist_type = dist[1].lower()  # Assuming the fourth column in the database is the distribution_type
-            mean = dist[2]
-            std_dev = dist[3]
-            min_val = dist[4]
-            max_val = dist[5]
-            mode_val = dist[6]  # This may not be used for all distributions
-
-            if dist_type == 'normal':
-                params[param_name] = ('normal', (mean, std_dev))
-            elif dist_type == 'log-normal':
-                # If your log-normal is parameterized differently, adjust the following line accordingly
-                params[param_name] = ('log-normal', (np.log(mean), std_dev))
-            elif dist_type == 'uniform':
-                # Uniform distribution in scipy.stats takes loc and scale parameters
-                # loc is the lower bound, and scale is the width of the distribution
-                params[param_name] = ('uniform', (min_val, max_val - min_val))
-            elif dist_type == 'triangular':
-                # For triangular distribution, c is the mode expressed as a fraction of the total range
-                c = (mode_val - min_val) / (max_val - min_val)
-                params[param_name] = ('triangular', (c, min_val, max_val - min_val))
-            elif dist_type == 'beta':
-                # Ensure your mean and std_dev are for data scaled to [0, 1]
-                alpha = mean * ((mean * (1 - mean) / std_dev ** 2) - 1)
-                beta = (1 - mean) * ((mean * (1 - mean) / std_dev ** 2) - 1)
-                params[param_name] = ('beta', (alpha, beta, 0, 1))
-
-            # ... handle other distribution types if any ...
-        return params
+        return map_distributions_to_params(distributions)
 
     def run_simulation(self):
+        if self.simulation_thread is not None:
+            return  # A simulation is already running
+
+        seed = self.seed_var.text().strip()
+        if not seed.isdigit():
+            QMessageBox.warning(None, "Invalid Seed", "The seed must be a non-negative integer.")
+            return
+
+        tolerance = self.tolerance_var.text().strip()
+        try:
+            tolerance = float(tolerance) if tolerance else None
+        except ValueError:
+            tolerance = -1.0
+        if tolerance is not None and tolerance <= 0:
+            QMessageBox.warning(None, "Invalid Tolerance", "The tolerance must be a positive number.")
+            return
+
         self.fetch_and_map_distributions()
         distribution_plotter = DistributionPlotter(self.params)
-        simulation_results = distribution_plotter.run_monte_carlo_simulation(iterations=self.iterations)
-
-        self.tab_widget.clear()  # Clear existing content
+        self.monte_carlo_simulator = MonteCarloSimulator(distribution_plotter)
+
+        # An unchanged configuration run again with the same seed is shown straight from the result cache
+        sampling_mode = self.sampling_mode_var.currentText()
+        self.pending_cache_key = cache_key(self.distributions, sampling_mode, int(seed), self.iterations, tolerance)
+        cached_result = self.result_cache.get(self.pending_cache_key)
+        if cached_result is not None:
+            self.progress_bar.setValue(100)
+            self.display_simulation_result(cached_result)
+            return
+
+        # Sample on a worker thread so the window keeps repainting; plots are built when the result arrives
+        self.simulation_worker = SimulationWorker(self.monte_carlo_simulator, self.iterations,
+                                                  prepare=self.prepare_simulation_result,
+                                                  persist=self.persist_simulation_result, seed=int(seed),
+                                                  sampling_mode=sampling_mode, tolerance=tolerance,
+                                                  store_directory=self.run_store_directory(seed),
+                                                  executor=self.simulation_pool(), memory_budget=self.memory_budget)
+        self.simulation_worker.progress.connect(self.progress_bar.setValue)
+        self.simulation_worker.finished.connect(self.on_simulation_finished)
+        self.simulation_worker.failed.connect(self.on_simulation_failed)
+        self.simulation_worker.cancelled.connect(self.on_simulation_cancelled)
+        self.simulation_worker.persist_failed.connect(self.on_persist_failed)
+
+        self.progress_bar.setValue(0)
+        self.run_simulation_button.setEnabled(False)
+        self.cancel_simulation_button.setEnabled(True)
+        self.simulation_thread = start_simulation_worker(self.simulation_worker)
+        self.simulation_thread.finished.connect(self.on_simulation_thread_finished)
+
+    def simulation_pool(self):
+        if self.simulation_executor is None:
+            self.simulation_executor = ProcessPoolExecutor(max_workers=os.cpu_count() or 1,
+                                                           mp_context=self.process_context)
+        return self.simulation_executor
+
+    def shutdown(self):
+        # Called when the window closes: stop the running simulation and drop queued shards and figure exports,
+        # which would otherwise keep the process alive after the window is gone
+        self.cancel_simulation()
+        if self.simulation_executor is not None:
+            self.simulation_executor.shutdown(wait=False, cancel_futures=True)
+            self.simulation_executor = None
+        self.figure_exporter.shutdown(wait=False)
+
+    def cancel_simulation(self):
+        if self.simulation_worker is not None:
+            self.simulation_worker.cancel()
+            self.cancel_simulation_button.setEnabled(False)
+
+    def on_simulation_thread_finished(self):
+        # Drop the references only once the thread has stopped, otherwise Qt destroys a running QThread
+        self.simulation_thread = None
+        self.simulation_worker = None
+        self.run_simulation_button.setEnabled(True)
+
+    def reset_simulation_controls(self):
+        self.cancel_simulation_button.setEnabled(False)
+
+    def on_simulation_failed(self, message):
+        self.reset_simulation_controls()
+        QMessageBox.critical(None, "Error", f"Simulation failed: {message}")
+
+    def on_persist_failed(self, message):
+        QMessageBox.warning(None, "Warning", f"The run is shown but could not be stored: {message}")
+
+    def on_simulation_cancelled(self):
+        self.reset_simulation_controls()
+        self.progress_bar.setValue(0)
+
+    @staticmethod
+    def run_store_directory(seed):
+        # Each run's columnar sample store sits in results/ next to the exported figures. The seed stays fixed
+        # between runs, so two runs can start within the same second; the unique suffix keeps the second one
+        # from truncating the columns the first one's SIMULATIONS row and cache entry point at.
+        os.makedirs("results", exist_ok=True)
+        return tempfile.mkdtemp(prefix=f"run_{datetime.now():%Y%m%d_%H%M%S}_{seed}_", dir="results")
+
+    def prepare_simulation_result(self, simulation_result):
+        # Runs on the worker thread before the result is shown: every plot of the result is drawn from this data,
+        # so the UI thread never computes any of it
+        simulation_result.summaries()
+        simulation_result.density(OOIP_COLUMN)
+        simulation_result.density(ROIP_COLUMN)
+        for parameter_name in simulation_result.parameter_names:
+            simulation_result.histogram(parameter_name, self.bins)
+            simulation_result.density(parameter_name, self.bins)
+            simulation_result.ecdf(parameter_name, *parameter_cdf_pixels())
+
+    def persist_simulation_result(self, simulation_result):
+        # Runs on the worker thread after the result is shown, with the thread's own pooled connection
+        if self.enabled_parameter:
+            # The seed is stored with the run so it can be re-materialized without keeping its samples
+            simulation_result.simulation_id = create_simulation(
+                self.enabled_parameter[0], simulation_result.seed, simulation_result.iterations,
+                simulation_result.bit_generator, simulation_result.sampling_mode,
+                chunk_size=simulation_result.chunk_size, tolerance=simulation_result.tolerance,
+                achieved_tolerance=simulation_result.achieved_tolerance, store_path=simulation_result.store_path)
+            if simulation_result.iterations <= self.result_rows_limit:
+                insert_results(simulation_result.simulation_id, *simulation_result.output_columns())
+            # Summaries are stored so past runs can be listed and compared without reloading them
+            insert_simulation_statistics(simulation_result.simulation_id, simulation_result.statistics())
+        # Cache the run with its plot data for repeated presses
+        self.result_cache.put(self.pending_cache_key, simulation_result)
+
+    def on_simulation_finished(self, simulation_result):
+        self.reset_simulation_controls()
+        self.display_simulation_result(simulation_result)
+
+    def display_simulation_result(self, simulation_result):
+        monte_carlo_simulator = self.monte_carlo_simulator
+        # Clear existing content; the pages are deleted too, so the canvases of the previous result are freed
+        while self.tab_widget.count():
+            page = self.tab_widget.widget(0)
+            self.tab_widget.removeTab(0)
+            page.deleteLater()
 
         # Setup containers and layouts for PDF and CDF plots within scroll areas
         pdf_scroll_area = QScrollArea()
@@ -161,16 +370,21 @@ class SimulationsTab:
         row, col = 0, 0
         max_plots_per_row = 2
 
-        for parameter_name, data in simulation_results.items():
-            # Generate and plot PDF for the current parameter
-            fig_pdf = self.plot_parameter_pdf(data, parameter_name)
-            canvas_pdf = FigureCanvas(fig_pdf)
-            pdf_grid_layout.addWidget(canvas_pdf, row, col)
-
-            # Generate and plot CDF for the current parameter
-            fig_cdf = self.plot_parameter_cdf(data, parameter_name)
-            canvas_cdf = FigureCanvas(fig_cdf)
-            cdf_grid_layout.addWidget(canvas_cdf, row, col)
+        # Every figure is only built once its placeholder is first shown, so the first page is ready after
+        # building its own figures rather than all of them
+        for parameter_name in simulation_result.parameter_names:
+            # Placeholder for the PDF of the current parameter
+            pdf_grid_layout.addWidget(LazyFigureCanvas(
+                lambda name=parameter_name: self.plot_parameter_pdf(
+                    simulation_result.histogram(name, self.bins), name, simulation_result.iterations,
+                    simulation_result.density(name, self.bins))),
+                row, col)
+
+            # Placeholder for the CDF of the current parameter
+            cdf_grid_layout.addWidget(LazyFigureCanvas(
+                lambda name=parameter_name: self.plot_parameter_cdf(
+                    simulation_result.ecdf(name, *parameter_cdf_pixels()), name, simulation_result.iterations)),
+                row, col)
 
             # Update grid position
             col += 1
@@ -182,83 +396,76 @@ class SimulationsTab:
         self.tab_widget.addTab(pdf_scroll_area, "PDF Plots")
         self.tab_widget.addTab(cdf_scroll_area, "CDF Plots")
 
-        # Generate OOIP values from simulation results and plot OOIP PDF and CDF
-        monte_carlo_simulator = MonteCarloSimulator(distribution_plotter)
-        ooip_pdf_fig, ooip_cdf_fig, roip_pdf_fig, roip_cdf_fig = monte_carlo_simulator.run_simulation(iterations=self.iterations)
-
-        canvas_pdf = FigureCanvas(ooip_pdf_fig)
-        tab_pdf = QWidget()
-        layout_pdf = QVBoxLayout(tab_pdf)
-        layout_pdf.addWidget(canvas_pdf)
-        self.tab_widget.addTab(tab_pdf, "OOIP PDF")
-
-        # Create and add a canvas for the CDF figure
-        canvas_cdf = FigureCanvas(ooip_cdf_fig)
-        tab_cdf = QWidget()
-        layout_cdf = QVBoxLayout(tab_cdf)
-        layout_cdf.addWidget(canvas_cdf)
-        self.tab_widget.addTab(tab_cdf, "OOIP CDF")
-
-        canvas_pdf = FigureCanvas(roip_pdf_fig)
-        tab_pdf = QWidget()
-        layout_pdf = QVBoxLayout(tab_pdf)
-        layout_pdf.addWidget(canvas_pdf)
-        self.tab_widget.addTab(tab_pdf, "ROIP PDF")
-
-        # Create and add a canvas for the CDF figure
-        canvas_cdf = FigureCanvas(roip_cdf_fig)
-        tab_cdf = QWidget()
-        layout_cdf = QVBoxLayout(tab_cdf)
-        layout_cdf.addWidget(canvas_cdf)
-        self.tab_widget.addTab(tab_cdf, "ROIP CDF")
-
-        # Inside your run_simulation method, adjust the savefig calls like so:
-        ooip_pdf_fig.savefig(f"results/ooip_pdf_{self.iterations}.png", dpi=300, format='png')  # High resolution
-        ooip_cdf_fig.savefig(f"results/ooip_{self.iterations}.png", dpi=300, format='png')  # High resolution
-        roip_pdf_fig.savefig(f"results/roip_{self.iterations}.png", dpi=300, format='png')  # High resolution
-        roip_cdf_fig.savefig(f"results/roip_cdf_{self.iterations}.png", dpi=300, format='png')  # High resolution
-
-        # Alternatively, for vector graphics which are resolution-independent, you can use SVG
-        #ooip_pdf_fig.savefig(f"results/ooip_pdf_{self.iterations}.svg", format='svg')  # Vector graphic
-        #ooip_cdf_fig.savefig(f"results/ooip_cdf_{self.iterations}.svg", format='svg')  # Vector graphic
-        #roip_pdf_fig.savefig(f"results/roip_pdf_{self.iterations}.svg", format='svg')  # Vector graphic
-        #roip_cdf_fig.savefig(f"results/roip_cdf_{self.iterations}.svg", format='svg')  # Vector graphic
-
-    def plot_parameter_pdf(self, data, parameter_name):
-        fig = Figure(figsize=(6, 5), dpi=100)
-        ax = fig.add_subplot(111)
-        # Adjust subplot parameters for better layout
-        fig.subplots_adjust(left=.2, right=0.95, top=0.85, bottom=0.25)
-
-        # Generate histogram data
-        counts, bins, patches = ax.hist(data, bins=self.bins, density=True, alpha=0.6, label='Histogram', color='g', edgecolor='black')
-
-        # Alternatively, you can add a KDE line plot
-        kde = gaussian_kde(data)
-        kde_x = np.linspace(bins[0], bins[-1], self.bins)
-        kde_y = kde(kde_x)
-        ax.plot(kde_x, kde_y, c='darkorange', label='KDE')
-
-        ax.set_title(f"{parameter_name.capitalize()} PDF ({self.iterations} iterations)", fontsize=8, fontweight='bold')
-        ax.set_xlabel('Value', fontsize=8)
-        ax.set_ylabel('Probability Density', fontsize=8)
-        ax.tick_params(axis='both', which='major', labelsize=8)
-        ax.legend(fontsize=8)
-        fig.savefig(f"results/{parameter_name}_pdf_{self.iterations}.png", dpi=300, format='png', bbox_inches='tight')
-        return fig
-
-    def plot_parameter_cdf(self, data, parameter_name):
-        # Calculate and plot CDF
-        data_sorted = np.sort(data)
-        cdf = np.arange(len(data)) / (len(data) - 1)
-        fig_cdf = Figure(figsize=(6, 5), dpi=100)
-        ax_cdf = fig_cdf.add_subplot(111)
-        fig_cdf.subplots_adjust(left=.2, right=0.95, top=0.85, bottom=0.25)
-        ax_cdf.plot(data_sorted, cdf, marker='.', linestyle='', label='CDF')
-        ax_cdf.set_title(f"{parameter_name.capitalize()} CDF ({self.iterations} iterations)", fontsize=8, fontweight='bold')
-        ax_cdf.set_xlabel(parameter_name.capitalize(), fontsize=8)
-        ax_cdf.set_ylabel('Cumulative Probability', fontsize=8)
-        ax_cdf.tick_params(axis='both', which='major', labelsize=8)
-        ax_cdf.legend()
-        fig_cdf.savefig(f"results/{parameter_name}_cdf_{self.iterations}.png", dpi=300, format='png', bbox_inches='tight')
-        return fig_cdf
+        # Plot OOIP and ROIP PDF and CDF from the same simulation result, one figure per tab
+        output_figures = [
+            ("OOIP PDF", monte_carlo_simulator.plot_output_pdf, OOIP_COLUMN, 'blue'),
+            ("OOIP CDF", monte_carlo_simulator.plot_output_cdf, OOIP_COLUMN, 'red'),
+            ("ROIP PDF", monte_carlo_simulator.plot_output_pdf, ROIP_COLUMN, 'green'),
+            ("ROIP CDF", monte_carlo_simulator.plot_output_cdf, ROIP_COLUMN, 'orange'),
+        ]
+        for title, plot_output, column, color in output_figures:
+            tab = QWidget()
+            layout = QVBoxLayout(tab)
+            layout.addWidget(LazyFigureCanvas(
+                lambda plot_output=plot_output, column=column, color=color:
+                plot_output(simulation_result, column, color), size=(500, 400)))
+            self.tab_widget.addTab(tab, title)
+
+        self.export_simulation_result(simulation_result)
+
+    def export_simulation_result(self, simulation_result):
+        """
+        Queue every figure of a result for export to results/. The workers draw their own copies from the plot
+        data, so nothing here waits for a figure to be drawn or encoded.
+        """
+        # Figures of the previous result that have not been drawn yet would only be overwritten
+        self.figure_exporter.cancel_pending()
+        self.export_errors = []
+        export_formats = [file_format for file_format in self.export_formats if file_format in EXPORT_FORMATS]
+        for file_format in self.export_formats:
+            if file_format not in EXPORT_FORMATS:
+                self.on_export_failed(file_format, f"unsupported format; expected one of {', '.join(EXPORT_FORMATS)}")
+        # An adaptive run may stop before the configured cap, so titles and names use the iterations it ran
+        iterations = simulation_result.iterations
+        cdf_pixels = parameter_cdf_pixels()
+        exports = []
+        for parameter_name in simulation_result.parameter_names:
+            # The histogram and the reduced CDF rather than the samples are shipped to the export workers
+            exports.append((parameter_pdf_figure,
+                            (simulation_result.histogram(parameter_name, self.bins), parameter_name, iterations,
+                             simulation_result.density(parameter_name, self.bins)),
+                            f"{parameter_name}_pdf_{iterations}", {"bbox_inches": "tight"}))
+            exports.append((parameter_cdf_figure,
+                            (simulation_result.ecdf(parameter_name, *cdf_pixels), parameter_name, iterations),
+                            f"{parameter_name}_cdf_{iterations}", {"bbox_inches": "tight"}))
+        summaries = simulation_result.summaries()
+        for column, pdf_color, cdf_color, pdf_name, cdf_name in (
+                (OOIP_COLUMN, 'blue', 'red', f"ooip_pdf_{iterations}", f"ooip_{iterations}"),
+                (ROIP_COLUMN, 'green', 'orange', f"roip_{iterations}", f"roip_cdf_{iterations}")):
+            vals_mm, pdf = simulation_result.density(column)
+            exports.append((output_pdf_figure, (column, iterations, vals_mm, pdf, pdf_color), pdf_name, {}))
+            exports.append((output_cdf_figure, (column, iterations, summaries[column],
+                                                 max(vals_mm), cdf_color), cdf_name, {}))
+
+        for builder, args, name, savefig_kwargs in exports:
+            for file_format in export_formats:
+                self.figure_exporter.submit(builder, args, os.path.join("results", f"{name}.{file_format}"),
+                                            **savefig_kwargs)
+
+    def on_export_progress(self, done, total):
+        if self.export_errors:
+            return  # Keep the failures on screen until the next result is exported
+        self.export_status_label.setText(
+            self.lang.get("figures_exported", "Figures exported: {done} of {total}").format(done=done, total=total))
+
+    def on_export_failed(self, path, message):
+        self.export_errors.append(f"{path}: {message}")
+        self.export_status_label.setText(
+            self.lang.get("figure_export_failed", "Figure export failed ({count}); last error: {error}")
+            .format(count=len(self.export_errors), error=self.export_errors[-1]))
+
+    def plot_parameter_pdf(self, histogram, parameter_name, iterations, density=None):
+        return parameter_pdf_figure(histogram, parameter_name, iterations, density)
+
+    def plot_parameter_cdf(self, curve, parameter_name, iterations):
+        return parameter_cdf_figure(curve, parameter_name, iterations)
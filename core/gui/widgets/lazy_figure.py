@@ -0,0 +1,51 @@
+from PyQt6.QtCore import Qt, QSize, QTimer
+from PyQt6.QtWidgets import QLabel, QVBoxLayout, QWidget
+from matplotlib.backends.backend_qtagg import FigureCanvasQTAgg as FigureCanvas
+
+
+class LazyFigureCanvas(QWidget):
+    """
+    Placeholder for a matplotlib figure that is only built once the placeholder is on screen.
+
+    Qt only paints widgets that are visible: pages of a QTabWidget other than the current one and cells
+    scrolled out of a QScrollArea are never painted, so their figures and canvases are never built. The first
+    paint schedules the build, which replaces the placeholder label with the figure's canvas.
+
+    Parameters:
+    - build_figure: callable. Returns the Figure to show; called at most once.
+    - size: tuple. Size hint in pixels, matching the figure so the layout does not change when it is built.
+    - placeholder: str. Text shown until the figure is built.
+    """
+
+    def __init__(self, build_figure, size=(600, 500), placeholder="Rendering...", parent=None):
+        super().__init__(parent)
+        self.build_figure = build_figure
+        self.canvas = None
+        self.size_hint = QSize(*size)
+        self.figure_layout = QVBoxLayout(self)
+        self.figure_layout.setContentsMargins(0, 0, 0, 0)
+        self.placeholder = QLabel(placeholder)
+        self.placeholder.setAlignment(Qt.AlignmentFlag.AlignCenter)
+        self.figure_layout.addWidget(self.placeholder)
+        # A child timer dies with the widget, so a build scheduled for a discarded result never runs
+        self.build_timer = QTimer(self)
+        self.build_timer.setSingleShot(True)
+        self.build_timer.timeout.connect(self.build)
+
+    def sizeHint(self):
+        return self.size_hint
+
+    def paintEvent(self, event):
+        # The widget tree must not change during a paint event, so the build runs right after it
+        if self.canvas is None and not self.build_timer.isActive():
+            self.build_timer.start(0)
+        super().paintEvent(event)
+
+    def build(self):
+        if self.canvas is not None:
+            return
+        self.canvas = FigureCanvas(self.build_figure())
+        self.build_figure = None
+        self.figure_layout.replaceWidget(self.placeholder, self.canvas)
+        self.placeholder.deleteLater()
+        self.placeholder = None
@@ -0,0 +1,16 @@
+from PyQt6.QtCore import QObject, pyqtSignal
+
+
+class FigureExportReporter(QObject):
+    """
+    Relays the progress and failures of a FigureExporter to the Qt main thread.
+
+    The exporter calls back from its pool's management thread; a signal emitted there is queued onto the
+    thread of the connected widgets, so they can be connected directly.
+
+    Signals:
+    - progress(int, int): Figures exported and figures queued since the queue was last empty.
+    - failed(str, str): Path and error message of an export that failed.
+    """
+    progress = pyqtSignal(int, int)
+    failed = pyqtSignal(str, str)
@@ -0,0 +1,23 @@
+import multiprocessing
+
+# Modules the pool workers need, imported once by the fork server rather than by every worker it forks.
+# '__main__' is the fork server's default and stays first, so workers do not import the main script again.
+FORKSERVER_PRELOAD = ["__main__", "core.sim.monte_carlo.engine", "core.utils.export", "core.utils.plotting"]
+
+
+def gui_process_context():
+    """
+    Multiprocessing context for the process pools of the GUI.
+
+    Forking, the default start method on Linux, copies the calling process with only the calling thread; a
+    lock held by one of Qt's threads at that moment stays locked forever in the child, which can deadlock it.
+    Workers are therefore forked from a fork server, a clean single-threaded process started on first use, or
+    spawned as fresh interpreters where no fork server is available.
+
+    :return: A multiprocessing context to pass as ``mp_context`` to ProcessPoolExecutor.
+    """
+    if "forkserver" in multiprocessing.get_all_start_methods():
+        context = multiprocessing.get_context("forkserver")
+        context.set_forkserver_preload(FORKSERVER_PRELOAD)
+        return context
+    return multiprocessing.get_context("spawn")
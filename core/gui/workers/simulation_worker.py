@@ -0,0 +1,86 @@
+import threading
+
+from PyQt6.QtCore import QObject, QThread, pyqtSignal
+
+from core.db.database import close_db_connection
+from core.sim.monte_carlo.engine import SimulationCancelled
+
+
+class SimulationWorker(QObject):
+    """
+    Runs a MonteCarloSimulator off the Qt main thread.
+
+    The engine reports progress after every chunk and polls the cancel flag between chunks, so a
+    cancelled run stops as soon as the chunk in flight is done. Two optional callables are run on the
+    worker thread with the finished result: ``prepare`` before it is emitted, e.g. to compute its plot
+    data, and ``persist`` after it is emitted, so the window shows the run while it is being stored.
+    ``persist`` must only read what ``prepare`` computed, since the window uses the result meanwhile.
+
+    Signals:
+    - progress(int): Percentage of iterations completed.
+    - finished(object): Emitted with the SimulationResult once the run completes.
+    - failed(str): Emitted with the error message if the run raises.
+    - cancelled(): Emitted when the run was stopped through cancel().
+    - persist_failed(str): Emitted with the error message if storing the emitted result raises.
+    """
+    progress = pyqtSignal(int)
+    finished = pyqtSignal(object)
+    failed = pyqtSignal(str)
+    cancelled = pyqtSignal()
+    persist_failed = pyqtSignal(str)
+
+    def __init__(self, simulator, iterations, prepare=None, persist=None, **simulate_kwargs):
+        super().__init__()
+        self.simulator = simulator
+        self.iterations = iterations
+        self.prepare = prepare
+        self.persist = persist
+        self.simulate_kwargs = simulate_kwargs
+        self._stop_event = threading.Event()
+
+    def run(self):
+        try:
+            result = self.simulator.simulate(self.iterations, progress=self.report_progress,
+                                             should_stop=self._stop_event.is_set, **self.simulate_kwargs)
+            if self.prepare is not None:
+                self.prepare(result)
+        except SimulationCancelled:
+            self.cancelled.emit()
+        except Exception as e:
+            self.failed.emit(str(e))
+        else:
+            self.finished.emit(result)
+            if self.persist is not None:
+                try:
+                    self.persist(result)
+                except Exception as e:
+                    self.persist_failed.emit(str(e))
+        finally:
+            # The thread's pooled database connection would otherwise outlive it
+            close_db_connection()
+
+    def report_progress(self, done, total):
+        self.progress.emit(int(100 * done / total) if total else 100)
+
+    def cancel(self):
+        self._stop_event.set()
+
+
+def start_simulation_worker(worker):
+    """
+    Move a worker onto a new QThread and start it. Once the worker emits any of its terminal signals, the
+    thread quits as soon as run() returns, e.g. after persisting the result, and both objects are scheduled
+    for deletion.
+
+    :param worker: The SimulationWorker to run.
+    :return: The started QThread; the caller must keep a reference to it while it runs.
+    """
+    thread = QThread()
+    worker.moveToThread(thread)
+    thread.started.connect(worker.run)
+    for signal in (worker.finished, worker.failed, worker.cancelled):
+        signal.connect(thread.quit)
+    thread.finished.connect(worker.deleteLater)
+    thread.finished.connect(thread.deleteLater)
+    thread.start()
+    return thread
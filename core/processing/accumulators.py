@@ -0,0 +1,228 @@
+import numpy as np
+
+# Number of bins of the histograms kept for every column, as drawn in the PDF plots
+DEFAULT_HISTOGRAM_BINS = 50
+
+
+class OnlineStatistics:
+    """
+    Running count, mean, variance, minimum and maximum of a stream of values.
+
+    Chunks are folded in with the parallel form of Welford's algorithm (Chan et al.), so two
+    accumulators built on different parts of a stream can be merged exactly.
+    """
+
+    def __init__(self):
+        self.count = 0
+        self.mean = 0.0
+        self.m2 = 0.0
+        self.min = np.inf
+        self.max = -np.inf
+
+    def update(self, values):
+        values = np.asarray(values, dtype=np.float64)
+        if values.size == 0:
+            return
+        chunk = OnlineStatistics()
+        chunk.count = values.size
+        chunk.mean = float(values.mean())
+        chunk.m2 = float(np.square(values - chunk.mean).sum())
+        chunk.min = float(values.min())
+        chunk.max = float(values.max())
+        self.merge(chunk)
+
+    def merge(self, other):
+        if other.count == 0:
+            return
+        count = self.count + other.count
+        delta = other.mean - self.mean
+        self.mean += delta * other.count / count
+        self.m2 += other.m2 + delta * delta * self.count * other.count / count
+        self.count = count
+        self.min = min(self.min, other.min)
+        self.max = max(self.max, other.max)
+
+    @property
+    def variance(self):
+        """Sample variance (ddof=1), or NaN with fewer than two values."""
+        return self.m2 / (self.count - 1) if self.count > 1 else np.nan
+
+    @property
+    def std(self):
+        return np.sqrt(self.variance)
+
+
+class FixedBinHistogram:
+    """
+    Histogram with bin edges that stay fixed once set.
+
+    When no edges are given, the first chunk acts as a pilot: its range, padded on both sides, fixes the
+    edges for the rest of the stream. Values outside the edges are counted as underflow/overflow. Histograms
+    are only mergeable when their edges are equal, so parallel workers must be given the same edges up front,
+    e.g. from a distribution's support or from from_pilot() on a sample drawn before the work is split.
+    """
+
+    def __init__(self, bins=DEFAULT_HISTOGRAM_BINS, edges=None, padding=0.1):
+        self.bins = bins
+        self.padding = padding
+        self.edges = None
+        self.counts = np.zeros(bins, dtype=np.int64)
+        self.underflow = 0
+        self.overflow = 0
+        if edges is not None:
+            self.set_edges(edges)
+
+    @classmethod
+    def from_pilot(cls, values, bins=DEFAULT_HISTOGRAM_BINS, padding=0.1):
+        """Return an empty histogram whose edges are fixed from the padded range of a pilot sample."""
+        histogram = cls(bins, padding=padding)
+        histogram.set_edges(histogram._edges_from_pilot(np.asarray(values, dtype=np.float64)))
+        return histogram
+
+    def set_edges(self, edges):
+        self.edges = np.asarray(edges, dtype=np.float64)
+        self.bins = len(self.edges) - 1
+        self.counts = np.zeros(self.bins, dtype=np.int64)
+
+    def _edges_from_pilot(self, values):
+        low, high = float(values.min()), float(values.max())
+        margin = (high - low) * self.padding or abs(low) * self.padding or 1.0
+        return np.linspace(low - margin, high + margin, self.bins + 1)
+
+    def update(self, values):
+        values = np.asarray(values, dtype=np.float64)
+        if values.size == 0:
+            return
+        if self.edges is None:
+            self.set_edges(self._edges_from_pilot(values))
+
+        low, high = self.edges[0], self.edges[-1]
+        self.underflow += int(np.count_nonzero(values < low))
+        self.overflow += int(np.count_nonzero(values > high))
+        inside = values[(values >= low) & (values <= high)]
+        # Uniform edges allow direct index computation instead of a binary search per value
+        index = ((inside - low) * (self.bins / (high - low))).astype(np.int64)
+        np.clip(index, 0, self.bins - 1, out=index)
+        self.counts += np.bincount(index, minlength=self.bins)
+
+    def merge(self, other):
+        if other.edges is None:
+            return
+        if self.edges is None:
+            self.set_edges(other.edges)
+        elif not np.array_equal(self.edges, other.edges):
+            raise ValueError("Cannot merge histograms with different bin edges.")
+        self.counts += other.counts
+        self.underflow += other.underflow
+        self.overflow += other.overflow
+
+    def density(self):
+        """Counts normalised to a probability density, as ``ax.hist(..., density=True)`` would draw them."""
+        total = self.counts.sum()
+        if total == 0:
+            return np.zeros(self.bins)
+        return self.counts / (total * np.diff(self.edges))
+
+
+class QuantileSketch:
+    """
+    Mergeable quantile sketch with bounded memory.
+
+    The sketch keeps a stack of compactors. Level ``h`` holds items that each stand for ``2**h`` values
+    of the stream; whenever a level exceeds ``capacity`` items it is sorted and every other item (with a
+    random offset, which keeps the estimate unbiased) is promoted to the level above. Memory is
+    O(capacity * log(n / capacity)) regardless of the stream length.
+    """
+
+    def __init__(self, capacity=8192, seed=0):
+        self.capacity = capacity
+        self.levels = [np.empty(0, dtype=np.float64)]
+        self.count = 0
+        self._rng = np.random.default_rng(seed)
+
+    def update(self, values):
+        values = np.asarray(values, dtype=np.float64).ravel()
+        if values.size == 0:
+            return
+        self.count += values.size
+        self.levels[0] = np.concatenate([self.levels[0], values])
+        self._compress()
+
+    def merge(self, other):
+        for level, items in enumerate(other.levels):
+            if level == len(self.levels):
+                self.levels.append(np.empty(0, dtype=np.float64))
+            self.levels[level] = np.concatenate([self.levels[level], items])
+        self.count += other.count
+        self._compress()
+
+    def _compress(self):
+        level = 0
+        while level < len(self.levels):
+            items = self.levels[level]
+            if len(items) > self.capacity:
+                items = np.sort(items)
+                # An odd item out stays behind so the represented weight is preserved exactly
+                keep = items[-1:] if len(items) % 2 else items[:0]
+                pairs = items[:len(items) - len(keep)]
+                promoted = pairs[self._rng.integers(2)::2]
+                self.levels[level] = keep
+                if level + 1 == len(self.levels):
+                    self.levels.append(np.empty(0, dtype=np.float64))
+                self.levels[level + 1] = np.concatenate([self.levels[level + 1], promoted])
+            level += 1
+
+    def quantiles(self, probabilities):
+        """
+        Estimate the values at the given cumulative probabilities (0..1).
+        """
+        probabilities = np.asarray(probabilities, dtype=np.float64)
+        if self.count == 0:
+            return np.full(probabilities.shape, np.nan)
+        items = np.concatenate(self.levels)
+        weights = np.concatenate([np.full(len(level_items), 2.0 ** level)
+                                  for level, level_items in enumerate(self.levels)])
+        order = np.argsort(items, kind='stable')
+        items = items[order]
+        cumulative = np.cumsum(weights[order])
+        # Midpoint ranks mirror the interpolation np.percentile applies to an exact sample
+        midpoints = (cumulative - weights[order] / 2) / cumulative[-1]
+        return np.interp(probabilities, midpoints, items)
+
+
+class OutputAccumulator:
+    """
+    Bundles the online statistics, histogram and quantile sketch kept for one simulation output.
+    """
+
+    def __init__(self, bins=DEFAULT_HISTOGRAM_BINS, sketch_capacity=8192, edges=None):
+        self.statistics = OnlineStatistics()
+        self.histogram = FixedBinHistogram(bins, edges=edges)
+        self.sketch = QuantileSketch(sketch_capacity)
+
+    def update(self, values):
+        self.statistics.update(values)
+        self.histogram.update(values)
+        self.sketch.update(values)
+
+    def merge(self, other):
+        self.statistics.merge(other.statistics)
+        self.histogram.merge(other.histogram)
+        self.sketch.merge(other.sketch)
+
+    def summary(self):
+        """
+        Summary statistics of the output. P10/P50/P90 follow the oil industry convention, where P10 is the
+        high estimate (90th percentile) and P90 the low estimate (10th percentile).
+        """
+        p10, p50, p90 = self.sketch.quantiles([0.9, 0.5, 0.1])
+        return {
+            "count": self.statistics.count,
+            "mean": self.statistics.mean,
+            "std": self.statistics.std,
+            "min": self.statistics.min,
+            "max": self.statistics.max,
+            "P10": p10,
+            "P50": p50,
+            "P90": p90,
+        }
@@ -3,7 +3,7 @@
 import numpy as np
 
 
-def generate_normal_distribution(mu, sigma, size):
+def generate_normal_distribution(mu, sigma, size, rng=None):
     """
     Generate a normal (Gaussian) distribution.
 
@@ -11,9 +11,12 @@ def generate_normal_distribution(mu, sigma, size):
     - mu: float. The mean of the distribution.
     - sigma: float. The standard deviation of the distribution.
     - size: int. The number of samples to generate.
+    - rng: numpy.random.Generator. The generator to draw from; a fresh, OS-seeded one is used when None.
 
     Returns:
     - samples: ndarray. An array of samples from the normal distribution.
     """
-    samples = np.random.normal(mu, sigma, size)
+    if rng is None:
+        rng = np.random.default_rng()
+    samples = rng.normal(mu, sigma, size)
     return samples
@@ -2,7 +2,7 @@
 import numpy as np
 
 
-def generate_lognormal_distribution(mu, sigma, size):
+def generate_lognormal_distribution(mu, sigma, size, rng=None):
     """
     Generate a log-normal distribution.
 
@@ -10,9 +10,12 @@ def generate_lognormal_distribution(mu, sigma, size):
     - mu: float. The mean of the underlying normal distribution.
     - sigma: float. The standard deviation of the underlying normal distribution.
     - size: int. The number of samples to generate.
+    - rng: numpy.random.Generator. The generator to draw from; a fresh, OS-seeded one is used when None.
 
     Returns:
     - samples: ndarray. An array of samples from the log-normal distribution.
     """
-    samples = np.random.lognormal(mu, sigma, size)
+    if rng is None:
+        rng = np.random.default_rng()
+    samples = rng.lognormal(mu, sigma, size)
     return samples
@@ -3,7 +3,7 @@
 import numpy as np
 
 
-def generate_triangular_distribution(left, mode, right, size):
+def generate_triangular_distribution(left, mode, right, size, rng=None):
     """
     Generate a triangular distribution.
 
@@ -12,9 +12,12 @@ def generate_triangular_distribution(left, mode, right, size):
     - mode: float. The peak value of the distribution.
     - right: float. The maximum value of the distribution.
     - size: int. The number of samples to generate.
+    - rng: numpy.random.Generator. The generator to draw from; a fresh, OS-seeded one is used when None.
 
     Returns:
     - samples: ndarray. An array of samples from the triangular distribution.
     """
-    samples = np.random.triangular(left, mode, right, size)
+    if rng is None:
+        rng = np.random.default_rng()
+    samples = rng.triangular(left, mode, right, size)
     return samples
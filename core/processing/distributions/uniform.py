@@ -2,7 +2,7 @@
 import numpy as np
 
 
-def generate_uniform_distribution(low, high, size):
+def generate_uniform_distribution(low, high, size, rng=None):
     """
     Generate a uniform distribution.
 
@@ -10,9 +10,12 @@ def generate_uniform_distribution(low, high, size):
     - low: float. The lower boundary of the output interval. All values generated will be greater than or equal to low.
     - high: float. The upper boundary of the output interval. All values generated will be less than high.
     - size: int. The number of samples to generate.
+    - rng: numpy.random.Generator. The generator to draw from; a fresh, OS-seeded one is used when None.
 
     Returns:
     - samples: ndarray. An array of samples from the uniform distribution.
     """
-    samples = np.random.uniform(low, high, size)
+    if rng is None:
+        rng = np.random.default_rng()
+    samples = rng.uniform(low, high, size)
     return samples
@@ -1,7 +1,9 @@
 import numpy as np
-import matplotlib.pyplot as plt
 from scipy.stats import norm, lognorm, uniform, triang, beta
 
+from core.processing.sampling import sample_parameters
+from core.processing.statistics import reduced_ecdf
+
 
 class DistributionPlotter:
     def __init__(self, parameters):
@@ -14,6 +16,9 @@ class DistributionPlotter:
         """
         Plot the probability density function (PDF) for simulation results of a given parameter.
         """
+        # pyplot is only needed by these standalone plots, not by the application's embedded figures
+        import matplotlib.pyplot as plt
+
         data = np.array(simulation_results[parameter_name])
         plt.figure(figsize=(10, 6))
         plt.hist(data, bins=50, density=True, alpha=0.6, color='g', edgecolor='black')
@@ -46,43 +51,25 @@ class DistributionPlotter:
         """
         Plot the cumulative distribution function (CDF) for simulation results of a given parameter.
         """
-        data = np.array(simulation_results[parameter_name])
-        data_sorted = np.sort(data)
+        import matplotlib.pyplot as plt
+        from core.utils.plotting import axes_pixels
 
-        # Calculate CDF values
-        cdf = np.arange(len(data_sorted)) / float(len(data_sorted) - 1)
+        data = np.array(simulation_results[parameter_name])
 
-        plt.figure(figsize=(10, 6))
+        figure = plt.figure(figsize=(10, 6))
+        # Calculate CDF values, keeping only the points that can be told apart on screen
+        data_sorted, cdf = reduced_ecdf(data, *axes_pixels(plt.gca(), figure.dpi))
         plt.plot(data_sorted, cdf, marker='.', linestyle='none')
         plt.title(f'Cumulative Distribution Function (CDF) of {parameter_name.capitalize()}')
         plt.xlabel(parameter_name.capitalize())
         plt.ylabel('CDF')
         plt.show()
 
-    def run_monte_carlo_simulation(self, iterations=1000):
+    def run_monte_carlo_simulation(self, iterations=1000, random_state=None):
         """
         Run the Monte Carlo simulation using the specified distributions for a defined number of iterations.
-        """
-        results = {param: [] for param in self.parameters}
-
-        for _ in range(iterations):
-            for param, (distribution, distribution_params) in self.parameters.items():
-                if distribution == 'uniform':
-                    value = uniform.rvs(*distribution_params)
-                elif distribution == 'triangular':
-                    c, loc, scale = distribution_params
-                    value = triang.rvs(c, loc=loc, scale=scale)
-                elif distribution == 'normal':
-                    value = norm.rvs(*distribution_params)
-                elif distribution == 'log-normal':
-                    scale = np.exp(distribution_params[0])
-                    value = lognorm.rvs(distribution_params[1], scale=scale)
-                elif distribution == 'beta':
-                    a, b, loc, scale = distribution_params
-                    value = beta.rvs(a, b, loc, scale)
-                else:
-                    continue  # Skip unsupported distributions
 
-                results[param].append(value)
-
-        return results
+        Each parameter is drawn as a whole column in a single vectorized call, so the result maps every
+        parameter name to a contiguous NumPy array of length ``iterations``.
+        """
+        return sample_parameters(self.parameters, iterations, random_state=random_state)
@@ -0,0 +1,73 @@
+import hashlib
+import secrets
+
+import numpy as np
+
+# Bit generators a run can be seeded with, keyed by the name stored alongside the run
+BIT_GENERATORS = {
+    "pcg64": np.random.PCG64,
+    "philox": np.random.Philox,
+}
+DEFAULT_BIT_GENERATOR = "pcg64"
+
+
+def new_seed():
+    """
+    Draw a fresh run-level seed from OS entropy.
+
+    Seeds are kept to 63 bits so they fit a signed 64-bit integer and can be typed back in by users.
+    """
+    return secrets.randbits(63)
+
+
+def parameter_spawn_key(parameter_name):
+    """
+    Derive a stable spawn key from a parameter name.
+
+    The key depends only on the name, so adding, removing or reordering parameters never changes the
+    stream of the others.
+    """
+    digest = hashlib.sha256(parameter_name.encode("utf-8")).digest()
+    return tuple(int.from_bytes(digest[i:i + 4], "little") for i in range(0, 16, 4))
+
+
+class RandomStreams:
+    """
+    Run-level random number subsystem built on numpy.random.Generator.
+
+    A run is identified by a single seed. Every chunk of the run and every parameter within a chunk gets
+    its own child stream of the run's SeedSequence, so parameters (Area, Volume, Porosity, Water
+    Saturation, FVF, Recovery Factor, ...) are independent of each other and chunks can be generated in
+    any order or process. Streams that must be the same for every chunk, such as the scrambling of a
+    quasi-Monte Carlo sequence, come from shared_generator(). Instances are picklable and can be shipped
+    to worker processes.
+
+    Attributes:
+    - seed (int): The run-level seed.
+    - bit_generator (str): Name of the bit generator, a key of BIT_GENERATORS.
+    """
+
+    def __init__(self, seed=None, bit_generator=DEFAULT_BIT_GENERATOR, spawn_key=(), run_key=None):
+        if bit_generator not in BIT_GENERATORS:
+            raise ValueError(f"Unknown bit generator: {bit_generator}")
+        self.seed = new_seed() if seed is None else int(seed)
+        self.bit_generator = bit_generator
+        self.spawn_key = tuple(spawn_key)
+        # Spawn key of the run these streams belong to; chunks keep the key of their run
+        self.run_key = self.spawn_key if run_key is None else tuple(run_key)
+
+    def _generator(self, spawn_key):
+        seed_sequence = np.random.SeedSequence(self.seed, spawn_key=spawn_key)
+        return np.random.Generator(BIT_GENERATORS[self.bit_generator](seed_sequence))
+
+    def chunk(self, index):
+        """Return the streams of chunk ``index`` of the run."""
+        return RandomStreams(self.seed, self.bit_generator, self.spawn_key + (index,), self.run_key)
+
+    def generator(self, parameter_name):
+        """Return a new Generator over the independent stream of ``parameter_name``."""
+        return self._generator(self.spawn_key + parameter_spawn_key(parameter_name))
+
+    def shared_generator(self, name):
+        """Return a new Generator over a run-wide stream that is identical for every chunk of the run."""
+        return self._generator(self.run_key + parameter_spawn_key(name))
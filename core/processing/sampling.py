@@ -0,0 +1,268 @@
+import warnings
+
+import numpy as np
+from scipy import stats
+from scipy.stats import norm, lognorm, uniform, triang, beta, qmc
+
+# How the unit-interval probabilities behind each column are generated:
+# - random: independent draws from each distribution's own sampler
+# - lhs: Latin Hypercube, one draw per equal-probability stratum, mapped through the inverse CDF
+# - sobol/halton: scrambled low-discrepancy points shared by all columns, mapped through the inverse CDF
+SAMPLING_MODES = ('random', 'lhs', 'sobol', 'halton')
+QMC_SAMPLING_MODES = ('sobol', 'halton')
+DEFAULT_SAMPLING_MODE = 'random'
+
+# Bounded distributions are binned over their support only if the central 1 - 2 * SUPPORT_TAIL of their mass
+# covers at least SUPPORT_COVERAGE of it
+SUPPORT_TAIL = 1e-6
+SUPPORT_COVERAGE = 0.5
+
+
+def frozen_distribution(distribution, distribution_params):
+    """
+    Build a frozen scipy.stats distribution from an entry of the ``params`` mapping.
+
+    Parameters:
+    - distribution: str. Name of the distribution ('uniform', 'triangular', 'normal', 'log-normal', 'beta').
+    - distribution_params: tuple. Parameters in the layout produced by SimulationsTab.map_distributions_to_params.
+
+    Returns:
+    - frozen: rv_frozen or None. The frozen distribution, or None if the name is not supported.
+    """
+    if distribution == 'uniform':
+        return uniform(*distribution_params)
+    elif distribution == 'triangular':
+        c, loc, scale = distribution_params
+        return triang(c, loc=loc, scale=scale)
+    elif distribution == 'normal':
+        return norm(*distribution_params)
+    elif distribution == 'log-normal':
+        scale = np.exp(distribution_params[0])
+        return lognorm(distribution_params[1], scale=scale)
+    elif distribution == 'beta':
+        a, b, loc, scale = distribution_params
+        return beta(a, b, loc, scale)
+    return None
+
+
+def support_edges(distribution, distribution_params, bins):
+    """
+    Evenly spaced histogram bin edges over the support of a bounded distribution.
+
+    The support is only used when the distribution's mass spreads over most of it: the range between its
+    SUPPORT_TAIL and 1 - SUPPORT_TAIL quantiles must cover at least SUPPORT_COVERAGE of the support. A Beta
+    distribution concentrated in a corner of [0, 1] would otherwise leave most bins empty.
+
+    Parameters:
+    - distribution: str. Name of the distribution, as accepted by frozen_distribution.
+    - distribution_params: tuple. Parameters of the distribution.
+    - bins: int. Number of bins.
+
+    Returns:
+    - edges: ndarray or None. The ``bins + 1`` edges, or None for unbounded, concentrated or unsupported
+      distributions, whose edges have to come from a pilot sample instead.
+    """
+    frozen = frozen_distribution(distribution, distribution_params)
+    if frozen is None:
+        return None
+    low, high = frozen.support()
+    if not (np.isfinite(low) and np.isfinite(high)) or high <= low:
+        return None
+    mass_low, mass_high = np.clip(frozen.ppf([SUPPORT_TAIL, 1 - SUPPORT_TAIL]), low, high)
+    if not mass_high - mass_low >= SUPPORT_COVERAGE * (high - low):
+        return None
+    return np.linspace(low, high, bins + 1)
+
+
+def _sample_scalar_fallback(distribution, distribution_params, size, random_state):
+    """
+    Draw samples for a distribution that has no vectorized sampler.
+
+    Any continuous distribution in scipy.stats is accepted by name. A single sized ``rvs`` call is
+    tried first; distributions that reject the ``size`` argument are drawn one value at a time into a
+    preallocated array.
+    """
+    dist = getattr(stats, distribution, None)
+    if not isinstance(dist, stats.rv_continuous):
+        return None
+
+    try:
+        return dist.rvs(*distribution_params, size=size, random_state=random_state)
+    except (TypeError, ValueError):
+        values = np.empty(size, dtype=np.float64)
+        for i in range(size):
+            values[i] = dist.rvs(*distribution_params, random_state=random_state)
+        return values
+
+
+def inverse_cdf(distribution, distribution_params, probabilities):
+    """
+    Map probabilities in (0, 1) through the inverse CDF (``ppf``) of a distribution in one vectorized call.
+
+    Parameters:
+    - distribution: str. Name of the distribution; names unknown to frozen_distribution are looked up in
+      scipy.stats.
+    - distribution_params: tuple. Distribution parameters (see frozen_distribution).
+    - probabilities: ndarray. Cumulative probabilities to map.
+
+    Returns:
+    - values: ndarray or None. Contiguous float64 array of quantiles, or None if the distribution is unknown.
+    """
+    frozen = frozen_distribution(distribution, distribution_params)
+    if frozen is None:
+        dist = getattr(stats, distribution, None)
+        if not isinstance(dist, stats.rv_continuous):
+            return None
+        frozen = dist(*distribution_params)
+    return np.ascontiguousarray(frozen.ppf(probabilities), dtype=np.float64)
+
+
+def latin_hypercube_probabilities(size, random_state=None):
+    """
+    Draw ``size`` Latin Hypercube probabilities for one column.
+
+    The unit interval is cut into ``size`` equal strata; every stratum receives exactly one uniformly
+    placed point, and the strata are visited in random order so columns stay uncorrelated.
+    """
+    rng = np.random.default_rng(random_state)
+    return (rng.permutation(size) + rng.random(size)) / size
+
+
+def qmc_probabilities(mode, dimensions, size, random_state=None, offset=0):
+    """
+    Draw ``size`` scrambled Sobol or Halton points in ``dimensions`` dimensions, starting at point ``offset``.
+
+    The scrambling is fixed by ``random_state``, so calls with the same state and consecutive offsets
+    return consecutive blocks of a single sequence. Sobol blocks keep their balance properties when
+    ``size`` and ``offset`` are multiples of the same power of two.
+
+    Returns:
+    - points: ndarray. Array of shape (size, dimensions) with values strictly inside (0, 1).
+    """
+    if mode == 'sobol':
+        engine = qmc.Sobol(dimensions, scramble=True, seed=random_state)
+    elif mode == 'halton':
+        engine = qmc.Halton(dimensions, scramble=True, seed=random_state)
+    else:
+        raise ValueError(f"Unknown quasi-Monte Carlo mode: {mode}")
+
+    if offset:
+        engine.fast_forward(offset)
+    with warnings.catch_warnings():
+        # Only a trailing partial block is not a power of two; losing balance there is expected
+        warnings.filterwarnings("ignore", message=".*balance properties.*")
+        points = engine.random(size)
+    # Keep the points away from 0 and 1, where unbounded distributions have infinite quantiles
+    return np.clip(points, np.finfo(np.float64).tiny, 1 - np.finfo(np.float64).epsneg)
+
+
+def sample_parameter(distribution, distribution_params, size, random_state=None):
+    """
+    Draw a whole column of samples for a single parameter in one call.
+
+    Parameters:
+    - distribution: str. Name of the distribution.
+    - distribution_params: tuple. Distribution parameters (see frozen_distribution).
+    - size: int. The number of samples to generate.
+    - random_state: None, int or numpy.random.Generator. Source of randomness passed to scipy.
+
+    Returns:
+    - samples: ndarray or None. Contiguous float64 array of samples, or None if the distribution is unknown.
+    """
+    frozen = frozen_distribution(distribution, distribution_params)
+    if frozen is not None:
+        values = frozen.rvs(size=size, random_state=random_state)
+    else:
+        values = _sample_scalar_fallback(distribution, distribution_params, size, random_state)
+        if values is None:
+            return None
+    return np.ascontiguousarray(values, dtype=np.float64)
+
+
+def sample_parameters(parameters, iterations, random_state=None, streams=None, mode=DEFAULT_SAMPLING_MODE,
+                      offset=0):
+    """
+    Sample every parameter of a ``params`` mapping column by column.
+
+    Parameters:
+    - parameters: dict. Maps parameter names to (distribution, distribution_params) tuples.
+    - iterations: int. The number of samples to draw for each parameter.
+    - random_state: None, int or numpy.random.Generator. Source of randomness passed to scipy.
+    - streams: None or RandomStreams. When given, every parameter draws from its own child stream and
+      ``random_state`` is ignored.
+    - mode: str. One of SAMPLING_MODES.
+    - offset: int. Index of the first point when drawing a later chunk of a quasi-Monte Carlo sequence.
+
+    Returns:
+    - results: dict. Maps parameter names to contiguous float64 arrays of length ``iterations``.
+      Unsupported distributions map to an empty array.
+    """
+    if mode not in SAMPLING_MODES:
+        raise ValueError(f"Unknown sampling mode: {mode}")
+    if mode != 'random':
+        # A shared Generator keeps the columns independent when a plain integer seed is given
+        random_state = np.random.default_rng(random_state)
+
+    points = None
+    if mode in QMC_SAMPLING_MODES:
+        # One low-discrepancy point set covers all parameters jointly, one dimension per parameter
+        scramble_state = streams.shared_generator(mode) if streams is not None else random_state
+        points = qmc_probabilities(mode, len(parameters), iterations, scramble_state, offset)
+
+    results = {}
+    for column, (param, (distribution, distribution_params)) in enumerate(parameters.items()):
+        if streams is not None:
+            random_state = streams.generator(param)
+        if points is not None:
+            values = inverse_cdf(distribution, distribution_params, points[:, column])
+        elif mode == 'lhs':
+            probabilities = latin_hypercube_probabilities(iterations, random_state)
+            values = inverse_cdf(distribution, distribution_params, probabilities)
+        else:
+            values = sample_parameter(distribution, distribution_params, iterations, random_state)
+        results[param] = values if values is not None else np.empty(0, dtype=np.float64)
+    return results
+
+
+def map_distributions_to_params(distributions):
+    """
+    Map DISTRIBUTIONS rows to the ``params`` mapping used by the samplers.
+
+    Parameters:
+    - distributions: list. Rows of (parameter_name, distribution_type, mean, std_dev, min_value, max_value,
+      mode_value), as returned by get_enabled_parameter_and_distributions.
+
+    Returns:
+    - params: dict. Maps parameter names to (distribution, distribution_params) tuples.
+    """
+    params = {}
+    for dist in distributions:
+        param_name = dist[0]  # Assuming the third column in the database is the parameter_name
+        dist_type = dist[1].lower()  # Assuming the fourth column in the database is the distribution_type
+        mean = dist[2]
+        std_dev = dist[3]
+        min_val = dist[4]
+        max_val = dist[5]
+        mode_val = dist[6]  # This may not be used for all distributions
+
+        if dist_type == 'normal':
+            params[param_name] = ('normal', (mean, std_dev))
+        elif dist_type == 'log-normal':
+            # If your log-normal is parameterized differently, adjust the following line accordingly
+            params[param_name] = ('log-normal', (np.log(mean), std_dev))
+        elif dist_type == 'uniform':
+            # Uniform distribution in scipy.stats takes loc and scale parameters
+            # loc is the lower bound, and scale is the width of the distribution
+            params[param_name] = ('uniform', (min_val, max_val - min_val))
+        elif dist_type == 'triangular':
+            # For triangular distribution, c is the mode expressed as a fraction of the total range
+            c = (mode_val - min_val) / (max_val - min_val)
+            params[param_name] = ('triangular', (c, min_val, max_val - min_val))
+        elif dist_type == 'beta':
+            # Ensure your mean and std_dev are for data scaled to [0, 1]
+            alpha = mean * ((mean * (1 - mean) / std_dev ** 2) - 1)
+            beta_ = (1 - mean) * ((mean * (1 - mean) / std_dev ** 2) - 1)
+            params[param_name] = ('beta', (alpha, beta_, 0, 1))
+
+        # ... handle other distribution types if any ...
+    return params
@@ -0,0 +1,167 @@
+import numpy as np
+
+# Exceedance levels reported by default, P1 through P99. Oil industry convention: level Pxx is the value
+# exceeded with xx% probability, i.e. the (100 - xx)th percentile, so P10 is the high and P90 the low estimate.
+STANDARD_LEVELS = tuple(range(1, 100))
+HEADLINE_LEVELS = (10, 50, 90)
+# Number of points the empirical CDF is downsampled to
+DEFAULT_ECDF_POINTS = 500
+
+
+def _interpolation_ranks(count, percentiles):
+    """
+    Return the lower and upper order statistic ranks and interpolation weights np.percentile's default
+    ('linear') method uses for every percentile.
+    """
+    position = (count - 1) * np.asarray(percentiles, dtype=np.float64) / 100
+    lower = np.floor(position).astype(np.int64)
+    upper = np.minimum(lower + 1, count - 1)
+    return lower, upper, position - lower
+
+
+def _ecdf_ranks(count, points):
+    """Ranks of the order statistics the downsampled empirical CDF is drawn through, including min and max."""
+    return np.unique(np.round(np.linspace(0, count - 1, min(points, count))).astype(np.int64))
+
+
+def reduced_ecdf(values, x_pixels, y_pixels):
+    """
+    Empirical CDF of ``values`` reduced to what can be seen on an ``x_pixels`` by ``y_pixels`` plot.
+
+    The sorted values and their CDF, arange(n) / (n - 1) as plotted so far, walk monotonically through the
+    pixel grid spanning the data. Of every run of consecutive points falling in the same pixel only the first
+    and last are kept, so markers or a line through the kept points cover exactly the pixels the full curve
+    covers, with at most 2 * (x_pixels + y_pixels) points instead of one per value.
+
+    Parameters:
+    - values: array_like. The sampled values.
+    - x_pixels: int. Width of the plotting area in pixels at the resolution it is drawn at.
+    - y_pixels: int. Height of the plotting area in pixels.
+
+    Returns:
+    - x: ndarray. Retained values, ascending.
+    - y: ndarray. Empirical CDF at x.
+    """
+    data = np.sort(np.asarray(values, dtype=np.float64).ravel())
+    count = data.size
+    if count <= 2:
+        return data, np.arange(count) / max(count - 1, 1)
+    span = data[-1] - data[0]
+    column = np.zeros(count, dtype=np.int64) if span == 0 else \
+        np.minimum(((data - data[0]) * (x_pixels / span)).astype(np.int64), x_pixels - 1)
+    row = np.arange(count, dtype=np.int64) * y_pixels // count
+    # Both coordinates are non-decreasing, so equal cells form runs
+    cell = column * y_pixels + row
+    boundaries = np.flatnonzero(np.diff(cell))
+    keep = np.unique(np.concatenate(([0], boundaries, boundaries + 1, [count - 1])))
+    return data[keep], keep / (count - 1)
+
+
+def select(values, ranks):
+    """
+    Return the order statistics of ``values`` at ``ranks`` from a single selection pass.
+
+    One np.partition call (introselect) places every requested rank, leaving the values between two ranks
+    unsorted, so the cost grows with the number of ranks rather than with a full O(n log n) sort.
+
+    :return: Dict mapping each rank to its order statistic.
+    """
+    ranks = np.unique(ranks)
+    values = np.asarray(values, dtype=np.float64)
+    ordered = np.partition(values, ranks)
+    return dict(zip(ranks.tolist(), ordered[ranks].tolist()))
+
+
+def percentiles(values, q):
+    """
+    Compute several percentiles of ``values`` in one selection pass; equal to np.percentile(values, q).
+    """
+    values = np.asarray(values, dtype=np.float64).ravel()
+    lower, upper, weight = _interpolation_ranks(values.size, q)
+    order = select(values, np.concatenate([lower, upper]))
+    low = np.array([order[rank] for rank in lower.tolist()])
+    high = np.array([order[rank] for rank in upper.tolist()])
+    return low + weight * (high - low)
+
+
+class DistributionSummary:
+    """
+    Exact summary of one simulated output: moments, exceedance levels and a downsampled empirical CDF.
+
+    Attributes:
+    - count (int): Number of values summarized.
+    - mean (float): Sample mean.
+    - std (float): Sample standard deviation.
+    - min (float): Smallest value.
+    - max (float): Largest value.
+    - levels (dict): Maps exceedance levels (e.g. 10 for P10) to their values.
+    - ecdf_x (ndarray): Order statistics the empirical CDF is evaluated at, ascending from min to max.
+    - ecdf_y (ndarray): Empirical CDF at ecdf_x, the fraction of values less than or equal to each point.
+    """
+
+    def __init__(self, count, mean, std, minimum, maximum, levels, ecdf_x, ecdf_y):
+        self.count = count
+        self.mean = mean
+        self.std = std
+        self.min = minimum
+        self.max = maximum
+        self.levels = levels
+        self.ecdf_x = ecdf_x
+        self.ecdf_y = ecdf_y
+
+    def p(self, level):
+        """Return the value of exceedance level ``level``, e.g. p(10) for P10."""
+        return self.levels[level]
+
+    def cdf(self, value):
+        """Empirical CDF at ``value``, interpolated between the retained order statistics."""
+        return np.interp(value, self.ecdf_x, self.ecdf_y, left=0.0, right=1.0)
+
+    def as_dict(self):
+        """Flat mapping for reports: count, mean, std, min, max and one 'Pxx' entry per level."""
+        summary = {"count": self.count, "mean": self.mean, "std": self.std, "min": self.min, "max": self.max}
+        summary.update({f"P{level}": value for level, value in self.levels.items()})
+        return summary
+
+
+def summarize(values, levels=STANDARD_LEVELS, ecdf_points=DEFAULT_ECDF_POINTS):
+    """
+    Summarize an output array with exact quantiles and an exact, downsampled empirical CDF.
+
+    All exceedance levels and all CDF points are order statistics of the same array, so they are selected
+    together in a single selection pass rather than one sort per percentile.
+
+    Parameters:
+    - values: array_like. The simulated values, e.g. OOIP in MMbbl.
+    - levels: iterable of float. Exceedance levels to report, P1...P99 by default.
+    - ecdf_points: int. Maximum number of points kept on the empirical CDF.
+
+    Returns:
+    - summary: DistributionSummary.
+    """
+    values = np.asarray(values, dtype=np.float64).ravel()
+    if values.size == 0:
+        raise ValueError("Cannot summarize an empty array")
+    levels = tuple(levels)
+    count = values.size
+
+    lower, upper, weight = _interpolation_ranks(count, [100 - level for level in levels])
+    ecdf_ranks = _ecdf_ranks(count, ecdf_points)
+    order = select(values, np.concatenate([lower, upper, ecdf_ranks]))
+
+    low = np.array([order[rank] for rank in lower.tolist()])
+    high = np.array([order[rank] for rank in upper.tolist()])
+    level_values = low + weight * (high - low)
+    ecdf_x = np.array([order[rank] for rank in ecdf_ranks.tolist()])
+    ecdf_y = (ecdf_ranks + 1) / count
+
+    return DistributionSummary(
+        count=count,
+        mean=float(values.mean()),
+        std=float(values.std(ddof=1)) if count > 1 else 0.0,
+        minimum=float(ecdf_x[0]),
+        maximum=float(ecdf_x[-1]),
+        levels=dict(zip(levels, level_values.tolist())),
+        ecdf_x=ecdf_x,
+        ecdf_y=ecdf_y,
+    )
@@ -0,0 +1,203 @@
+import hashlib
+import json
+import os
+import shutil
+
+import numpy as np
+
+from core.db.run_store import RunStoreWriter
+from core.processing.accumulators import FixedBinHistogram
+from core.processing.rng import DEFAULT_BIT_GENERATOR
+from core.processing.statistics import DistributionSummary
+from core.sim.monte_carlo.result import OOIP_COLUMN, ROIP_COLUMN, SimulationResult, StreamingResult
+
+# Bump when the layout of cache entries or the meaning of a key changes, so stale entries are never hit
+CACHE_VERSION = 1
+DEFAULT_CACHE_SIZE = 1 << 30
+ENTRY_FILE = "entry.json"
+PLOT_DATA_FILE = "plot_data.npz"
+
+
+def cache_key(distributions, sampling_mode, seed, iterations, tolerance=None, bit_generator=DEFAULT_BIT_GENERATOR):
+    """
+    Derive the content address of a run from everything that determines its outcome.
+
+    Parameters:
+    - distributions: list. Distribution rows as returned by get_enabled_parameter_and_distributions. Row
+      order is kept, since it fixes the dimension of each parameter in quasi-Monte Carlo modes.
+    - sampling_mode: str. One of SAMPLING_MODES.
+    - seed: int. The run-level seed.
+    - iterations: int. The requested number of iterations (the cap of an adaptive run).
+    - tolerance: float or None. Relative tolerance of an adaptive run.
+    - bit_generator: str. Name of the bit generator.
+
+    Returns:
+    - key: str. Hex SHA-256 digest of the canonical JSON encoding of the inputs.
+    """
+    payload = {
+        "version": CACHE_VERSION,
+        "distributions": [list(row) for row in distributions],
+        "sampling_mode": sampling_mode,
+        "seed": int(seed),
+        "iterations": int(iterations),
+        "tolerance": tolerance,
+        "bit_generator": bit_generator,
+    }
+    canonical = json.dumps(payload, sort_keys=True, separators=(",", ":"), allow_nan=False)
+    return hashlib.sha256(canonical.encode("utf-8")).hexdigest()
+
+
+def _link_or_copy(source, destination):
+    """Hard-link a file where the file system allows it, copy it otherwise."""
+    try:
+        os.link(source, destination)
+    except OSError:
+        shutil.copy2(source, destination)
+
+
+def _directory_size(directory):
+    return sum(entry.stat().st_size for entry in os.scandir(directory) if entry.is_file())
+
+
+class ResultCache:
+    """
+    On-disk cache of finished runs, addressed by cache_key().
+
+    Every entry holds the run's columnar sample store together with the statistics, histograms, summaries, density
+    curves and reduced CDFs computed for it, so a hit is displayed without sampling, sorting or evaluating a KDE.
+    Entries are evicted least recently used first once the cache grows beyond ``max_bytes``.
+
+    Attributes:
+    - directory (str): Directory holding one subdirectory per entry.
+    - max_bytes (int): Size cap of the cache.
+    """
+
+    def __init__(self, directory, max_bytes=DEFAULT_CACHE_SIZE):
+        self.directory = directory
+        self.max_bytes = max_bytes
+
+    def _entry_directory(self, key):
+        return os.path.join(self.directory, key)
+
+    def get(self, key):
+        """Return the cached SimulationResult for ``key``, with memory-mapped columns, or None on a miss."""
+        entry_directory = self._entry_directory(key)
+        entry_path = os.path.join(entry_directory, ENTRY_FILE)
+        try:
+            with open(entry_path) as file:
+                entry = json.load(file)
+            plot_data = dict(np.load(os.path.join(entry_directory, PLOT_DATA_FILE)))
+            result = SimulationResult.from_store(entry_directory, **entry["metadata"])
+        except (OSError, ValueError, KeyError):
+            return None
+        # The entry file's modification time is the recency used for eviction
+        os.utime(entry_path)
+
+        result.simulation_id = entry["simulation_id"]
+        result.statistics_cache = entry["statistics"]
+        # Entries written before histograms were cached have none; they are binned from the columns on demand
+        for index, stored in enumerate(entry.get("histograms", [])):
+            histogram = FixedBinHistogram(edges=plot_data[f"histogram_{index}_edges"])
+            histogram.counts = plot_data[f"histogram_{index}_counts"]
+            histogram.underflow, histogram.overflow = stored["underflow"], stored["overflow"]
+            result.histograms[stored["column"]] = histogram
+        for index, (column, grid_size) in enumerate(entry["densities"]):
+            result.densities[(column, grid_size)] = (plot_data[f"density_{index}_x"], plot_data[f"density_{index}_y"])
+        for index, (column, x_pixels, y_pixels) in enumerate(entry.get("ecdfs", [])):
+            result.ecdfs[(column, x_pixels, y_pixels)] = (plot_data[f"ecdf_{index}_x"], plot_data[f"ecdf_{index}_y"])
+        for index, summaries in enumerate(entry["summaries"]):
+            result.summary_cache[(tuple(summaries["levels"]), summaries["ecdf_points"])] = {
+                output: DistributionSummary(
+                    count=summary["count"], mean=summary["mean"], std=summary["std"], minimum=summary["min"],
+                    maximum=summary["max"], levels=dict(zip(summaries["levels"], summary["values"])),
+                    ecdf_x=plot_data[f"summary_{index}_{output}_x"], ecdf_y=plot_data[f"summary_{index}_{output}_y"])
+                for output, summary in summaries["outputs"].items()
+            }
+        return result
+
+    def put(self, key, result):
+        """
+        Store a finished result under ``key``, then evict old entries beyond the size cap. Densities, CDFs
+        and summaries should be computed before the result is stored, so they are cached along with it.
+        Streamed runs are not cached: their summaries are sketch estimates, which a hit would serve as exact.
+        """
+        entry_directory = self._entry_directory(key)
+        if isinstance(result, StreamingResult) or os.path.isdir(entry_directory):
+            return
+        columns = {**result.samples, OOIP_COLUMN: result.ooip, ROIP_COLUMN: result.roip}
+        if sum(np.asarray(values).nbytes for values in columns.values()) > self.max_bytes:
+            return
+
+        # Entries are written under a temporary name and renamed, so readers never see a partial entry
+        staging_directory = f"{entry_directory}.{os.getpid()}.tmp"
+        if result.store_path and os.path.isdir(result.store_path):
+            # The run already has a columnar store; share its files instead of writing the columns again
+            shutil.copytree(result.store_path, staging_directory, copy_function=_link_or_copy)
+        else:
+            with RunStoreWriter(staging_directory) as store:
+                store.append(columns)
+
+        plot_data = {}
+        histograms = []
+        for index, (column, histogram) in enumerate(result.histograms.items()):
+            histograms.append({"column": column, "underflow": histogram.underflow, "overflow": histogram.overflow})
+            plot_data[f"histogram_{index}_edges"] = histogram.edges
+            plot_data[f"histogram_{index}_counts"] = histogram.counts
+        densities = []
+        for index, ((column, grid_size), (x, density)) in enumerate(result.densities.items()):
+            densities.append([column, grid_size])
+            plot_data[f"density_{index}_x"], plot_data[f"density_{index}_y"] = x, density
+        ecdfs = []
+        for index, ((column, x_pixels, y_pixels), (x, y)) in enumerate(result.ecdfs.items()):
+            ecdfs.append([column, x_pixels, y_pixels])
+            plot_data[f"ecdf_{index}_x"], plot_data[f"ecdf_{index}_y"] = x, y
+        summaries = []
+        for index, ((levels, ecdf_points), by_output) in enumerate(result.summary_cache.items()):
+            outputs = {}
+            for output, summary in by_output.items():
+                outputs[output] = {"count": summary.count, "mean": summary.mean, "std": summary.std,
+                                   "min": summary.min, "max": summary.max, "values": list(summary.levels.values())}
+                plot_data[f"summary_{index}_{output}_x"] = summary.ecdf_x
+                plot_data[f"summary_{index}_{output}_y"] = summary.ecdf_y
+            summaries.append({"levels": list(levels), "ecdf_points": ecdf_points, "outputs": outputs})
+        np.savez(os.path.join(staging_directory, PLOT_DATA_FILE), **plot_data)
+
+        entry = {
+            "metadata": {"seed": result.seed, "bit_generator": result.bit_generator,
+                         "sampling_mode": result.sampling_mode, "chunk_size": result.chunk_size,
+                         "tolerance": result.tolerance, "achieved_tolerance": result.achieved_tolerance},
+            "simulation_id": result.simulation_id,
+            "statistics": result.statistics(),
+            "histograms": histograms,
+            "densities": densities,
+            "ecdfs": ecdfs,
+            "summaries": summaries,
+        }
+        with open(os.path.join(staging_directory, ENTRY_FILE), "w") as file:
+            json.dump(entry, file)
+
+        try:
+            os.replace(staging_directory, entry_directory)
+        except OSError:
+            # Another process stored the same entry first
+            shutil.rmtree(staging_directory, ignore_errors=True)
+        self.evict()
+
+    def evict(self):
+        """Delete least recently used entries until the cache fits within ``max_bytes``."""
+        entries = []
+        for entry in os.scandir(self.directory):
+            entry_path = os.path.join(entry.path, ENTRY_FILE)
+            if entry.is_dir() and os.path.exists(entry_path):
+                entries.append((os.path.getmtime(entry_path), _directory_size(entry.path), entry.path))
+
+        total = sum(size for _, size, _ in entries)
+        for _, size, path in sorted(entries):
+            if total <= self.max_bytes:
+                break
+            shutil.rmtree(path, ignore_errors=True)
+            total -= size
+
+    def clear(self):
+        """Delete every entry."""
+        shutil.rmtree(self.directory, ignore_errors=True)
@@ -0,0 +1,62 @@
+import numpy as np
+from scipy.stats import t as student_t
+
+from core.processing.statistics import percentiles
+
+# Statistics tracked for every output. Oil industry convention: P10 is the 90th percentile, P90 the 10th.
+TRACKED_PERCENTILES = {"P10": 90, "P50": 50, "P90": 10}
+
+
+class ConvergenceMonitor:
+    """
+    Tracks confidence intervals on the mean, P10, P50 and P90 of OOIP and ROIP while a run progresses.
+
+    Intervals use the method of batch means: every chunk yields its own estimate of each statistic, and
+    the spread of those chunk estimates gives a Student-t interval on their average. This needs no
+    distributional assumption, costs O(1) per chunk once the chunk estimates are taken, and is
+    conservative for stratified or quasi-Monte Carlo chunks.
+
+    Attributes:
+    - confidence (float): Confidence level of the intervals.
+    - chunks (int): Number of chunks seen so far.
+    """
+
+    def __init__(self, confidence=0.95):
+        self.confidence = confidence
+        self.chunks = 0
+        self._estimates = {"OOIP": [], "ROIP": []}
+
+    def update(self, ooip, roip):
+        """Record the per-chunk estimates of a new chunk of outputs."""
+        for name, values in (("OOIP", ooip), ("ROIP", roip)):
+            self._estimates[name].append([values.mean(), *percentiles(values, list(TRACKED_PERCENTILES.values()))])
+        self.chunks += 1
+
+    def relative_half_widths(self):
+        """
+        Return the half-width of every confidence interval relative to its estimate, as a dict mapping
+        'OOIP'/'ROIP' to {'mean', 'P10', 'P50', 'P90'}. All widths are infinite until two chunks are seen.
+        """
+        names = ("mean", *TRACKED_PERCENTILES)
+        if self.chunks < 2:
+            return {output: dict.fromkeys(names, np.inf) for output in self._estimates}
+
+        quantile = student_t.ppf((1 + self.confidence) / 2, self.chunks - 1)
+        widths = {}
+        for output, rows in self._estimates.items():
+            rows = np.asarray(rows)
+            estimate = rows.mean(axis=0)
+            half_width = quantile * rows.std(axis=0, ddof=1) / np.sqrt(self.chunks)
+            with np.errstate(divide="ignore", invalid="ignore"):
+                relative = np.where(estimate != 0, half_width / np.abs(estimate), np.inf)
+            widths[output] = dict(zip(names, relative))
+        return widths
+
+    @property
+    def achieved_tolerance(self):
+        """The largest relative half-width over all tracked statistics."""
+        return max(max(widths.values()) for widths in self.relative_half_widths().values())
+
+    def converged(self, tolerance, min_chunks=4):
+        """Whether every tracked interval is within ``tolerance`` after at least ``min_chunks`` chunks."""
+        return self.chunks >= min_chunks and self.achieved_tolerance <= tolerance
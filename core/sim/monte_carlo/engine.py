@@ -0,0 +1,492 @@
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+from core.db.database import get_parameter_distributions, get_simulation
+from core.db.run_store import RunStoreWriter
+from core.processing.accumulators import DEFAULT_HISTOGRAM_BINS, FixedBinHistogram, OutputAccumulator
+from core.processing.rng import DEFAULT_BIT_GENERATOR, RandomStreams, new_seed
+from core.processing.sampling import DEFAULT_SAMPLING_MODE, QMC_SAMPLING_MODES, map_distributions_to_params, \
+    sample_parameters, support_edges
+from core.processing.statistics import percentiles
+from core.sim.monte_carlo.convergence import ConvergenceMonitor
+from core.sim.monte_carlo.result import OOIP_COLUMN, ROIP_COLUMN, SimulationResult, StreamingResult, \
+    compute_ooip_roip
+
+# Number of iterations evaluated by a single shard. Shard boundaries depend only on this value and the
+# iteration count, never on the number of workers, which is what keeps seeded runs reproducible.
+DEFAULT_SHARD_SIZE = 100_000
+
+# Memory a streaming run may spend on the chunk in flight, and the smallest chunk it will generate
+DEFAULT_MEMORY_BUDGET = 256 * 1024 ** 2
+MIN_CHUNK_SIZE = 1024
+
+# Sampling and evaluating a chunk creates a few float64 temporaries per column on top of the columns
+CHUNK_OVERHEAD_FACTOR = 3
+
+# Adaptive runs check convergence after every chunk, so their chunks are smaller than regular shards
+DEFAULT_ADAPTIVE_CHUNK_SIZE = 10_000
+
+# Size of the pilot sample that fixes the histogram edges of unbounded inputs and of OOIP/ROIP
+HISTOGRAM_PILOT_SIZE = 10_000
+
+
+class SimulationCancelled(Exception):
+    """Raised when a run is stopped between chunks."""
+
+
+def _check_cancelled(should_stop):
+    if should_stop is not None and should_stop():
+        raise SimulationCancelled()
+
+
+def shard_sizes(iterations, shard_size=DEFAULT_SHARD_SIZE):
+    """
+    Split an iteration count into consecutive shards of at most ``shard_size`` iterations.
+    """
+    full, remainder = divmod(iterations, shard_size)
+    sizes = [shard_size] * full
+    if remainder:
+        sizes.append(remainder)
+    return sizes
+
+
+def aligned_shard_size(shard_size, sampling_mode):
+    """
+    Round a shard size down to a power of two for quasi-Monte Carlo modes, so every shard is a balanced
+    block of the run's low-discrepancy sequence. Other modes use the size unchanged.
+    """
+    if sampling_mode in QMC_SAMPLING_MODES:
+        return 1 << (max(1, shard_size).bit_length() - 1)
+    return shard_size
+
+
+def _store_shard(store, samples, ooip, roip):
+    """Append a shard to a RunStoreWriter, if the run is being stored."""
+    if store is not None:
+        store.append({**samples, OOIP_COLUMN: ooip, ROIP_COLUMN: roip})
+
+
+def histogram_edges(parameters, streams, bins=DEFAULT_HISTOGRAM_BINS):
+    """
+    Fix the histogram bin edges of every input column and of OOIP/ROIP before a run is split up.
+
+    Bounded distributions whose mass spreads over their support are binned over it, see support_edges().
+    The other columns, including the outputs, whose range is not known up front, are binned over the padded
+    range of a pilot sample. The pilot comes from a stream of its own, so it leaves the run's draws
+    untouched, and every shard of the run gets the same edges whichever process it runs in.
+
+    :param parameters: Dict mapping parameter names to (distribution, distribution_params) tuples.
+    :param streams: The run's RandomStreams.
+    :param bins: Number of bins per column.
+    :return: Dict mapping column names to their ``bins + 1`` edges; columns that cannot be binned are left out.
+    """
+    edges = {param: support_edges(distribution, distribution_params, bins)
+             for param, (distribution, distribution_params) in parameters.items()}
+    pilot = sample_parameters(parameters, HISTOGRAM_PILOT_SIZE,
+                              random_state=streams.shared_generator("histogram pilot"))
+    pilot[OOIP_COLUMN], pilot[ROIP_COLUMN] = compute_ooip_roip(pilot)
+    for column, values in pilot.items():
+        values = np.asarray(values, dtype=np.float64)
+        if edges.get(column) is None and values.size and np.all(np.isfinite(values)):
+            edges[column] = FixedBinHistogram.from_pilot(values, bins).edges
+    return {column: column_edges for column, column_edges in edges.items() if column_edges is not None}
+
+
+def histogram_columns(columns, edges):
+    """
+    Bin the columns of a shard over the run's fixed edges.
+
+    :param columns: Dict mapping column names to the shard's values.
+    :param edges: Dict mapping column names to edges, as returned by histogram_edges().
+    :return: Dict mapping column names to FixedBinHistogram instances, mergeable with those of other shards.
+    """
+    histograms = {}
+    for column, values in columns.items():
+        if column in edges:
+            histograms[column] = FixedBinHistogram(edges=edges[column])
+            histograms[column].update(values)
+    return histograms
+
+
+def _merge_histograms(histograms, shard_histograms):
+    """Fold the histograms of a shard into the run's, in place."""
+    for column, histogram in shard_histograms.items():
+        if column in histograms:
+            histograms[column].merge(histogram)
+        else:
+            histograms[column] = histogram
+
+
+def run_shard(parameters, size, streams, sampling_mode=DEFAULT_SAMPLING_MODE, offset=0):
+    """
+    Sample one shard and evaluate the volumetric equation on it.
+
+    :param parameters: Dict mapping parameter names to (distribution, distribution_params) tuples.
+    :param size: Number of iterations in the shard.
+    :param streams: The RandomStreams of this shard, one per parameter.
+    :param sampling_mode: One of SAMPLING_MODES.
+    :param offset: Index of the shard's first iteration within the run, used by quasi-Monte Carlo modes.
+    :return: Tuple (samples, ooip, roip): the sampled input columns, and OOIP and ROIP for each iteration (bbl).
+    """
+    samples = sample_parameters(parameters, size, streams=streams, mode=sampling_mode, offset=offset)
+    ooip, roip = compute_ooip_roip(samples)
+    return samples, ooip, roip
+
+
+def run_histogram_shard(parameters, size, streams, sampling_mode, offset, edges):
+    """
+    run_shard() followed by histogram_columns(), so a shard is binned by the worker that produced it.
+
+    :return: Tuple (samples, ooip, roip, histograms).
+    """
+    samples, ooip, roip = run_shard(parameters, size, streams, sampling_mode, offset)
+    return samples, ooip, roip, histogram_columns({**samples, OOIP_COLUMN: ooip, ROIP_COLUMN: roip}, edges)
+
+
+def run_sharded(parameters, iterations, seed=None, workers=None, shard_size=DEFAULT_SHARD_SIZE, progress=None,
+                should_stop=None, bit_generator=DEFAULT_BIT_GENERATOR, sampling_mode=DEFAULT_SAMPLING_MODE,
+                store=None, bins=DEFAULT_HISTOGRAM_BINS, executor=None):
+    """
+    Run a simulation split into shards, optionally across a process pool.
+
+    Every shard draws from its own child streams of the run's RandomStreams and the shard outputs are
+    merged in shard order, so for a given seed the result is bit-identical regardless of the number of
+    workers. Each shard is also binned into fixed-edge histograms of every column, which are merged along
+    with it.
+
+    :param parameters: Dict mapping parameter names to (distribution, distribution_params) tuples.
+    :param iterations: Total number of iterations.
+    :param seed: Run-level seed; a fresh seed is drawn when None.
+    :param workers: Number of worker processes; defaults to one per CPU, capped at the shard count.
+    :param shard_size: Maximum number of iterations per shard.
+    :param progress: Optional callable, called as ``progress(done, total)`` after every shard.
+    :param should_stop: Optional callable polled between shards; the run raises SimulationCancelled once it
+        returns True.
+    :param bit_generator: Name of the bit generator, a key of BIT_GENERATORS.
+    :param sampling_mode: One of SAMPLING_MODES; Latin Hypercube shards are stratified independently and
+        quasi-Monte Carlo shards are consecutive power-of-two blocks of one sequence.
+    :param store: Optional RunStoreWriter every shard is appended to, in shard order.
+    :param bins: Number of histogram bins kept for each column.
+    :param executor: Optional process pool owned by the caller, used instead of a pool started for this run
+        whenever the run has more than one shard; ``workers`` is then ignored. Shards still queued when the run
+        is cancelled or fails are cancelled, and the pool is left running for the next run.
+    :return: The merged SimulationResult, with ``seed`` set to the seed actually used.
+    """
+    streams = RandomStreams(seed, bit_generator)
+    edges = histogram_edges(parameters, streams, bins)
+    shard_size = aligned_shard_size(shard_size, sampling_mode)
+    sizes = shard_sizes(iterations, shard_size)
+    seeds = [streams.chunk(index) for index in range(len(sizes))]
+    offsets = np.cumsum([0] + sizes[:-1]).tolist()
+
+    if workers is None:
+        workers = os.cpu_count() or 1
+    workers = max(1, min(workers, len(sizes)))
+
+    shards = []
+    histograms = {}
+    done = 0
+    if len(sizes) <= 1 or (executor is None and workers == 1):
+        for size, shard_streams, offset in zip(sizes, seeds, offsets):
+            _check_cancelled(should_stop)
+            shards.append(run_histogram_shard(parameters, size, shard_streams, sampling_mode, offset, edges))
+            _store_shard(store, *shards[-1][:3])
+            _merge_histograms(histograms, shards[-1][3])
+            done += size
+            if progress is not None:
+                progress(done, iterations)
+    else:
+        pool = executor or ProcessPoolExecutor(max_workers=workers)
+        futures = []
+        try:
+            futures = [pool.submit(run_histogram_shard, parameters, size, shard_streams, sampling_mode, offset, edges)
+                       for size, shard_streams, offset in zip(sizes, seeds, offsets)]
+            # Collecting in submission order keeps the merge independent of scheduling
+            for size, future in zip(sizes, futures):
+                _check_cancelled(should_stop)
+                shards.append(future.result())
+                _store_shard(store, *shards[-1][:3])
+                _merge_histograms(histograms, shards[-1][3])
+                done += size
+                if progress is not None:
+                    progress(done, iterations)
+        finally:
+            if executor is None:
+                pool.shutdown(wait=True, cancel_futures=True)
+            else:
+                for future in futures:
+                    future.cancel()
+
+    samples = {param: np.concatenate([shard[0][param] for shard in shards]) if shards else np.empty(0)
+               for param in parameters}
+    ooip = np.concatenate([shard[1] for shard in shards]) if shards else np.empty(0)
+    roip = np.concatenate([shard[2] for shard in shards]) if shards else np.empty(0)
+    return SimulationResult(samples, ooip, roip, seed=streams.seed, bit_generator=streams.bit_generator,
+                            sampling_mode=sampling_mode, chunk_size=shard_size, histograms=histograms)
+
+
+def in_memory_bytes(parameters, iterations):
+    """Bytes the input columns and OOIP/ROIP outputs of an in-memory run of ``iterations`` take once merged."""
+    return np.dtype(np.float64).itemsize * (len(parameters) + 2) * iterations
+
+
+def chunk_size_for_budget(parameters, memory_budget=DEFAULT_MEMORY_BUDGET):
+    """
+    Derive the number of iterations per chunk that keeps a streaming run within ``memory_budget`` bytes.
+
+    Every iteration holds one float64 per input column plus the OOIP and ROIP outputs, multiplied by
+    CHUNK_OVERHEAD_FACTOR for the temporaries created while sampling and evaluating.
+    """
+    bytes_per_iteration = np.dtype(np.float64).itemsize * (len(parameters) + 2) * CHUNK_OVERHEAD_FACTOR
+    return max(MIN_CHUNK_SIZE, int(memory_budget // bytes_per_iteration))
+
+
+def run_streaming(parameters, iterations, seed=None, memory_budget=DEFAULT_MEMORY_BUDGET, chunk_size=None,
+                  bins=DEFAULT_HISTOGRAM_BINS, progress=None, should_stop=None, bit_generator=DEFAULT_BIT_GENERATOR,
+                  sampling_mode=DEFAULT_SAMPLING_MODE, store=None):
+    """
+    Run a simulation in fixed-size chunks, folding each chunk into online accumulators.
+
+    Chunks are discarded once folded in, so peak memory depends on the chunk size and not on the
+    iteration count. Every input column is binned too, over the edges run_sharded() would use, so its PDF
+    can be plotted although its samples are never kept. Chunk ``i`` is seeded exactly like shard ``i`` of
+    run_sharded(), so a streaming run with ``chunk_size`` equal to the shard size draws the same values as
+    the in-memory engine.
+
+    :param parameters: Dict mapping parameter names to (distribution, distribution_params) tuples.
+    :param iterations: Total number of iterations.
+    :param seed: Run-level seed; a fresh seed is drawn when None.
+    :param memory_budget: Bytes available for the chunk in flight; ignored when ``chunk_size`` is given.
+    :param chunk_size: Explicit number of iterations per chunk.
+    :param bins: Number of histogram bins kept for each input column and output.
+    :param progress: Optional callable, called as ``progress(done, total)`` after every chunk.
+    :param should_stop: Optional callable polled between chunks; the run raises SimulationCancelled once it
+        returns True.
+    :param bit_generator: Name of the bit generator, a key of BIT_GENERATORS.
+    :param sampling_mode: One of SAMPLING_MODES; Latin Hypercube chunks are stratified independently and
+        quasi-Monte Carlo chunks are consecutive power-of-two blocks of one sequence.
+    :param store: Optional RunStoreWriter every chunk is written to before it is discarded, keeping the raw
+        samples on disk while memory stays bounded.
+    :return: StreamingResult with the accumulated OOIP/ROIP statistics, histograms and quantile sketches, and
+        the histograms of the input columns.
+    """
+    if chunk_size is None:
+        chunk_size = chunk_size_for_budget(parameters, memory_budget)
+    chunk_size = aligned_shard_size(chunk_size, sampling_mode)
+    streams = RandomStreams(seed, bit_generator)
+    edges = histogram_edges(parameters, streams, bins)
+    ooip_accumulator = OutputAccumulator(bins, edges=edges.get(OOIP_COLUMN))
+    roip_accumulator = OutputAccumulator(bins, edges=edges.get(ROIP_COLUMN))
+    histograms = {}
+
+    done = 0
+    for index, size in enumerate(shard_sizes(iterations, chunk_size)):
+        _check_cancelled(should_stop)
+        samples, ooip, roip = run_shard(parameters, size, streams.chunk(index), sampling_mode, done)
+        _store_shard(store, samples, ooip, roip)
+        _merge_histograms(histograms, histogram_columns(samples, edges))
+        ooip_accumulator.update(ooip)
+        roip_accumulator.update(roip)
+        done += size
+        if progress is not None:
+            progress(done, iterations)
+    histograms[OOIP_COLUMN], histograms[ROIP_COLUMN] = ooip_accumulator.histogram, roip_accumulator.histogram
+
+    return StreamingResult(ooip_accumulator, roip_accumulator, iterations, chunk_size, seed=streams.seed,
+                           bit_generator=streams.bit_generator, sampling_mode=sampling_mode, histograms=histograms)
+
+
+def run_adaptive(parameters, max_iterations, tolerance, seed=None, chunk_size=DEFAULT_ADAPTIVE_CHUNK_SIZE,
+                 min_chunks=4, confidence=0.95, progress=None, should_stop=None, bit_generator=DEFAULT_BIT_GENERATOR,
+                 sampling_mode=DEFAULT_SAMPLING_MODE, store=None, bins=DEFAULT_HISTOGRAM_BINS):
+    """
+    Run a simulation chunk by chunk until the OOIP/ROIP statistics have converged.
+
+    After every chunk a ConvergenceMonitor updates the confidence intervals of the mean, P10, P50 and P90
+    of OOIP and ROIP. The run stops as soon as every interval's half-width is within ``tolerance`` of its
+    estimate, or when ``max_iterations`` is reached. Chunks are seeded like the shards of run_sharded(),
+    so re-running the same number of iterations with ``shard_size=chunk_size`` reproduces the run.
+
+    :param parameters: Dict mapping parameter names to (distribution, distribution_params) tuples.
+    :param max_iterations: Cap on the number of iterations.
+    :param tolerance: Target relative half-width of the confidence intervals, e.g. 0.01 for 1%.
+    :param seed: Run-level seed; a fresh seed is drawn when None.
+    :param chunk_size: Number of iterations per chunk, i.e. between two convergence checks.
+    :param min_chunks: Minimum number of chunks before the run may stop.
+    :param confidence: Confidence level of the intervals.
+    :param progress: Optional callable, called as ``progress(done, max_iterations)`` after every chunk.
+    :param should_stop: Optional callable polled between chunks; the run raises SimulationCancelled once it
+        returns True.
+    :param bit_generator: Name of the bit generator, a key of BIT_GENERATORS.
+    :param sampling_mode: One of SAMPLING_MODES.
+    :param store: Optional RunStoreWriter every chunk is appended to.
+    :param bins: Number of histogram bins kept for each column.
+    :return: SimulationResult of the samples drawn until convergence, with ``achieved_tolerance`` set.
+    """
+    streams = RandomStreams(seed, bit_generator)
+    chunk_size = aligned_shard_size(chunk_size, sampling_mode)
+    edges = histogram_edges(parameters, streams, bins)
+    monitor = ConvergenceMonitor(confidence)
+    shards = []
+    histograms = {}
+    done = 0
+
+    for index, size in enumerate(shard_sizes(max_iterations, chunk_size)):
+        _check_cancelled(should_stop)
+        shard = run_histogram_shard(parameters, size, streams.chunk(index), sampling_mode, done, edges)
+        shards.append(shard)
+        _store_shard(store, *shard[:3])
+        _merge_histograms(histograms, shard[3])
+        monitor.update(shard[1], shard[2])
+        done += size
+        if progress is not None:
+            progress(done, max_iterations)
+        if monitor.converged(tolerance, min_chunks):
+            break
+
+    samples = {param: np.concatenate([shard[0][param] for shard in shards]) if shards else np.empty(0)
+               for param in parameters}
+    ooip = np.concatenate([shard[1] for shard in shards]) if shards else np.empty(0)
+    roip = np.concatenate([shard[2] for shard in shards]) if shards else np.empty(0)
+    return SimulationResult(samples, ooip, roip, seed=streams.seed, bit_generator=streams.bit_generator,
+                            sampling_mode=sampling_mode, chunk_size=chunk_size, tolerance=tolerance,
+                            achieved_tolerance=monitor.achieved_tolerance, histograms=histograms)
+
+
+def simulate(parameters, iterations, seed=None, workers=None, progress=None, should_stop=None,
+             sampling_mode=DEFAULT_SAMPLING_MODE, tolerance=None, store_directory=None, executor=None,
+             memory_budget=None):
+    """
+    Run a simulation the way the application does: sharded across a process pool, adaptive when a
+    tolerance is given, or streamed when its samples would not fit in ``memory_budget``, optionally writing
+    a columnar sample store as the run is produced.
+
+    :param parameters: Dict mapping parameter names to (distribution, distribution_params) tuples.
+    :param iterations: Number of iterations, the cap of an adaptive run.
+    :param seed: Run-level seed; None draws fresh entropy.
+    :param workers: Number of worker processes of a sharded run, see run_sharded().
+    :param progress: Optional callable, called as progress(done, total) after every shard or chunk.
+    :param should_stop: Optional callable polled between shards or chunks to cancel the run.
+    :param sampling_mode: One of SAMPLING_MODES.
+    :param tolerance: Relative tolerance of an adaptive run, see run_adaptive(); None runs every iteration.
+    :param store_directory: Directory of the run's columnar sample store; the store is deleted again if the
+        run fails or is cancelled.
+    :param executor: Optional process pool owned by the caller for a sharded run, see run_sharded().
+    :param memory_budget: Bytes the samples of a run may take; a run without a tolerance whose input columns
+        and outputs would take more is streamed in chunks that fit in the budget, see run_streaming(). None
+        keeps every run in memory.
+    :return: SimulationResult with the input samples together with the derived OOIP/ROIP arrays, or a
+        StreamingResult when the run was streamed.
+    """
+    def run(store=None):
+        if tolerance is not None:
+            return run_adaptive(parameters, iterations, tolerance, seed=seed, progress=progress,
+                                should_stop=should_stop, sampling_mode=sampling_mode, store=store)
+        if memory_budget is not None and in_memory_bytes(parameters, iterations) > memory_budget:
+            return run_streaming(parameters, iterations, seed=seed, memory_budget=memory_budget,
+                                 progress=progress, should_stop=should_stop, sampling_mode=sampling_mode,
+                                 store=store)
+        return run_sharded(parameters, iterations, seed=seed, workers=workers, progress=progress,
+                           should_stop=should_stop, sampling_mode=sampling_mode, store=store, executor=executor)
+
+    if store_directory is None:
+        return run()
+    with RunStoreWriter(store_directory) as store:
+        result = run(store)
+    result.store_path = store_directory
+    return result
+
+
+def replicate_seeds(seed, replicates):
+    """Derive ``replicates`` independent run-level seeds from one seed."""
+    state = np.random.SeedSequence(seed).generate_state(replicates, np.uint64)
+    return [int(value >> np.uint64(1)) for value in state]
+
+
+def run_replicates(parameters, iterations, replicates=8, seed=None, sampling_mode='sobol', workers=None):
+    """
+    Estimate the error of a simulation from independently randomized replicates.
+
+    Each replicate is a full run with its own scrambling (or random draws), so the spread of the replicate
+    estimates measures the error of their average. This is the standard way to put error bars on
+    randomized quasi-Monte Carlo, where a single run gives no variance estimate.
+
+    :param parameters: Dict mapping parameter names to (distribution, distribution_params) tuples.
+    :param iterations: Number of iterations per replicate.
+    :param replicates: Number of independent replicates (at least 2).
+    :param seed: Seed the replicate seeds are derived from; fresh entropy when None.
+    :param sampling_mode: One of SAMPLING_MODES.
+    :param workers: Number of worker processes per replicate, see run_sharded().
+    :return: Tuple (estimates, standard_errors). ``estimates`` maps 'OOIP' and 'ROIP' to dicts of 'mean',
+        'P10', 'P50' and 'P90' averaged over the replicates; ``standard_errors`` holds the standard errors of
+        those averages in the same layout.
+    """
+    if replicates < 2:
+        raise ValueError("At least two replicates are needed to estimate an error.")
+    if seed is None:
+        seed = new_seed()
+
+    values = {"OOIP": [], "ROIP": []}
+    for replicate_seed in replicate_seeds(seed, replicates):
+        result = run_sharded(parameters, iterations, seed=replicate_seed, workers=workers,
+                             sampling_mode=sampling_mode)
+        for name, output in (("OOIP", result.ooip), ("ROIP", result.roip)):
+            # Oil industry convention: P10 is the 90th percentile and P90 the 10th
+            values[name].append([output.mean(), *percentiles(output, [90, 50, 10])])
+
+    estimates, standard_errors = {}, {}
+    for name, rows in values.items():
+        rows = np.asarray(rows)
+        means = rows.mean(axis=0)
+        errors = rows.std(axis=0, ddof=1) / np.sqrt(replicates)
+        estimates[name] = dict(zip(("mean", "P10", "P50", "P90"), means))
+        standard_errors[name] = dict(zip(("mean", "P10", "P50", "P90"), errors))
+    return estimates, standard_errors
+
+
+def rematerialize_simulation(simulation_id, workers=None):
+    """
+    Re-create the exact samples and outputs of a recorded run from its stored seed.
+
+    The run is re-sampled from the current distributions of its configuration, so the result matches the
+    original run as long as the configuration has not been edited since.
+
+    :param simulation_id: ID of the SIMULATIONS row to re-materialize.
+    :param workers: Number of worker processes, see run_sharded().
+    :return: The SimulationResult of the run.
+    """
+    simulation = get_simulation(simulation_id)
+    if simulation is None:
+        raise ValueError(f"Simulation {simulation_id} does not exist.")
+    _, parameter_id, seed, bit_generator, iterations, sampling_mode, chunk_size = simulation[:7]
+    parameters = map_distributions_to_params(get_parameter_distributions(parameter_id))
+    return run_sharded(parameters, iterations, seed=seed, workers=workers,
+                       shard_size=chunk_size or DEFAULT_SHARD_SIZE,
+                       bit_generator=bit_generator or DEFAULT_BIT_GENERATOR,
+                       sampling_mode=sampling_mode or DEFAULT_SAMPLING_MODE)
+
+
+def load_simulation(simulation_id, workers=None):
+    """
+    Load a recorded run, memory-mapping its columnar sample store when one was written and still exists,
+    and re-materializing it from its seed otherwise.
+
+    :param simulation_id: ID of the SIMULATIONS row to load.
+    :param workers: Number of worker processes used if the run has to be re-materialized.
+    :return: The SimulationResult of the run.
+    """
+    simulation = get_simulation(simulation_id)
+    if simulation is None:
+        raise ValueError(f"Simulation {simulation_id} does not exist.")
+    _, _, seed, bit_generator, _, sampling_mode, chunk_size, tolerance, achieved_tolerance, _, store_path = simulation
+    if store_path and os.path.isdir(store_path):
+        result = SimulationResult.from_store(store_path, seed=seed, bit_generator=bit_generator,
+                                             sampling_mode=sampling_mode or DEFAULT_SAMPLING_MODE,
+                                             chunk_size=chunk_size, tolerance=tolerance,
+                                             achieved_tolerance=achieved_tolerance)
+    else:
+        result = rematerialize_simulation(simulation_id, workers)
+    result.simulation_id = simulation_id
+    return result
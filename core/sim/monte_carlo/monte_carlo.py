@@ -1,8 +1,8 @@
 # Import necessary libraries
-import numpy as np
-import matplotlib.pyplot as plt
-from matplotlib.figure import Figure
-from scipy.stats import norm, lognorm, uniform, triang, gaussian_kde
+from core.processing.sampling import DEFAULT_SAMPLING_MODE
+from core.sim.monte_carlo.engine import simulate
+from core.sim.monte_carlo.result import OOIP_COLUMN, ROIP_COLUMN
+from core.utils.plotting import output_cdf_figure, output_pdf_figure
 
 
 class MonteCarloSimulator:
@@ -19,14 +19,51 @@ class MonteCarloSimulator:
         Parameters:
             distribution_plotter (DistributionPlotter): The DistributionPlotter instance used for running the simulation.
 
-    - run_simulation(self, iterations=1000):
-        Run the Monte Carlo simulation using the DistributionPlotter instance.
+    - simulate(self, iterations=1000, seed=None, workers=None, progress=None, should_stop=None,
+               sampling_mode='random', tolerance=None, store_directory=None, executor=None, memory_budget=None):
+        Sample every parameter once and evaluate OOIP/ROIP. Large runs are split into shards that are
+        evaluated across a process pool; for a given seed the result does not depend on the worker count.
 
         Parameters:
             iterations (int): Number of iterations to run the simulation (default = 1000).
+            seed (int): Run-level seed (default = None, fresh entropy).
+            workers (int): Number of worker processes (default = None, one per CPU).
+            progress (callable): Called as progress(done, total) after every shard (default = None).
+            should_stop (callable): Polled between shards to cancel the run (default = None).
+            sampling_mode (str): 'random', 'lhs' (Latin Hypercube), 'sobol' or 'halton' (default = 'random').
+            tolerance (float): Relative tolerance for an adaptive run that stops once mean, P10, P50 and P90
+                have converged, with iterations as the cap (default = None, run all iterations).
+            store_directory (str): Directory to write the run's columnar sample store to as it is produced
+                (default = None, keep the run in memory only).
+            executor (ProcessPoolExecutor): Pool to evaluate the shards in, kept running across runs
+                (default = None, start a pool for this run only).
+            memory_budget (int): Bytes the samples of a run may take; larger runs without a tolerance are
+                streamed (default = None, keep every run in memory).
 
         Returns:
-            List[str]: A list of paths to the generated plot images.
+            SimulationResult: The input samples together with the derived OOIP/ROIP arrays, or a
+            StreamingResult of their accumulated statistics when the run was streamed.
+
+    - run_simulation(self, iterations=1000, result=None):
+        Build the OOIP/ROIP figures, sampling a new result only if none is given.
+
+        Parameters:
+            iterations (int): Number of iterations to run the simulation (default = 1000).
+            result (SimulationResult): A result produced by simulate() to plot instead of sampling again.
+
+        Returns:
+            Tuple[Figure, Figure, Figure, Figure]: The OOIP PDF, OOIP CDF, ROIP PDF and ROIP CDF figures.
+
+    - plot_output_pdf(result, column, color) / plot_output_cdf(result, column, color):
+        Build the PDF or CDF figure of one output, so each figure can be built on its own when it is shown.
+
+        Parameters:
+            result (SimulationResult): The result to plot.
+            column (str): 'OOIP' or 'ROIP'.
+            color (str): Line color.
+
+        Returns:
+            Figure: The figure of the output.
     """
 
     def __init__(self, distribution_plotter):
@@ -35,98 +72,32 @@ class MonteCarloSimulator:
         """
         self.distribution_plotter = distribution_plotter
 
-    def run_simulation(self, iterations=1000):
-        results = self.distribution_plotter.run_monte_carlo_simulation(iterations)
-
-        # Original Oil in Place (OOIP) and Recovery Oil in Place (ROIP) Calculations
-        #ooip_results = 7758 * np.array(results['Area']) * np.array(results['Thickness']) * np.array(
-        #    results['Porosity']) * (1 - np.array(results['Water Saturation'])) / np.array(results['FVF'])
-        ooip_results = 7758 * np.array(results['Volume']) * np.array(results['Net to Gross Ratio']) * np.array(
-            results['Porosity']) * (1 - np.array(results['Water Saturation'])) / np.array(results['FVF'])
-        roip_results = ooip_results * np.array(results['Recovery Factor'])  # Applying 20% recovery factor
-
-        # Convert results to MMbbl for plotting and analysis
-        ooip_results_mm = ooip_results / 1e6
-        roip_results_mm = roip_results / 1e6
-
-        # KDE and CDF for OOIP
-        ooip_density = gaussian_kde(ooip_results_mm)
-        ooip_vals_mm = np.linspace(min(ooip_results_mm), max(ooip_results_mm), 500)
-        ooip_pdf = ooip_density(ooip_vals_mm)
-        ooip_cdf = np.cumsum(ooip_pdf) / np.sum(ooip_pdf)
-
-        # KDE and CDF for ROIP
-        roip_density = gaussian_kde(roip_results_mm)
-        roip_vals_mm = np.linspace(min(roip_results_mm), max(roip_results_mm), 500)
-        roip_pdf = roip_density(roip_vals_mm)
-        roip_cdf = np.cumsum(roip_pdf) / np.sum(roip_pdf)
-
-        # Create separate figures for each plot
-        # OOIP PDF
-        fig_ooip_pdf = Figure(figsize=(5, 4), dpi=100)
-        ax_ooip_pdf = fig_ooip_pdf.add_subplot(111)
-        ax_ooip_pdf.plot(ooip_vals_mm, ooip_pdf, color='blue')
-        ax_ooip_pdf.set_title(f"OOIP Distribution (PDF) ({iterations} iterations)", fontsize=12, fontweight='bold')
-        ax_ooip_pdf.set_xlabel("OOIP (MMbbl)")
-        ax_ooip_pdf.set_ylabel("Density")
-
-        # OOIP CDF
-        # Calculate P10, P50, P90 in MMbbl
-        fig_ooip_cdf = Figure(figsize=(5, 4), dpi=100)
-        ax_ooip_cdf = fig_ooip_cdf.add_subplot(111, xlim=(0, max(ooip_vals_mm)), ylim=(0, 1.01))
-        ax_ooip_cdf.plot(ooip_vals_mm, ooip_cdf, color='red')
-        p10_value_mm = np.percentile(ooip_results_mm,
-                                     90)  # Note: For consistency with oil industry conventions, using 90 for P10
-        p50_value_mm = np.percentile(ooip_results_mm, 50)
-        p90_value_mm = np.percentile(ooip_results_mm, 10)  # Note: And using 10 for P90
-
-        # Mark P10, P50, P90 points on the plot and draw lines to the intersection with the CDF curve
-        percentile_values_mm = [p10_value_mm, p50_value_mm, p90_value_mm]
-        percentile_labels = ['P10', 'P50', 'P90']
-        for value_mm, label in zip(percentile_values_mm, percentile_labels):
-            y_value = np.interp(value_mm, ooip_vals_mm, ooip_cdf)
-            ax_ooip_cdf.plot([value_mm, value_mm], [0, y_value], color='black', linestyle='--',
-                             label=f'{label}: {value_mm:.2f} MMbbl')
-            ax_ooip_cdf.scatter(value_mm, y_value, color='black', zorder=5)  # Add scatter point at the intersection
-            ax_ooip_cdf.plot([0, value_mm], [y_value, y_value], color='black', linestyle='--')
-
-        ax_ooip_cdf.set_title(f"OOIP Distribution (CDF) ({iterations} iterations)", fontsize=12, fontweight='bold')
-        ax_ooip_cdf.set_xlabel("OOIP (MMbbl)")
-        ax_ooip_cdf.set_ylabel("Cumulative Probability")
-        ax_ooip_cdf.legend()
-
-        # ROIP PDF
-        fig_roip_pdf = Figure(figsize=(5, 4), dpi=100)
-        ax_roip_pdf = fig_roip_pdf.add_subplot(111)
-        ax_roip_pdf.plot(roip_vals_mm, roip_pdf, color='green')
-        ax_roip_pdf.set_title(f"ROIP Distribution (PDF) ({iterations} iterations)", fontsize=12, fontweight='bold')
-        ax_roip_pdf.set_xlabel("ROIP (MMbbl)")
-        ax_roip_pdf.set_ylabel("Density")
-
-        # ROIP CDF
-        fig_roip_cdf = Figure(figsize=(5, 4), dpi=100)
-        ax_roip_cdf = fig_roip_cdf.add_subplot(111, xlim=(0, max(roip_vals_mm)), ylim=(0, 1.01))
-        ax_roip_cdf.plot(roip_vals_mm, roip_cdf, color='orange')
-        p10_value_mm = np.percentile(roip_results_mm,
-                                     90)  # Note: For consistency with oil industry conventions, using 90 for P10
-        p50_value_mm = np.percentile(roip_results_mm, 50)
-        p90_value_mm = np.percentile(roip_results_mm, 10)  # Note: And using 10 for P90
-
-        # Mark P10, P50, P90 points on the plot and draw lines to the intersection with the CDF curve
-        percentile_values_mm = [p10_value_mm, p50_value_mm, p90_value_mm]
-        percentile_labels = ['P10', 'P50', 'P90']
-        for value_mm, label in zip(percentile_values_mm, percentile_labels):
-            y_value = np.interp(value_mm, roip_vals_mm, roip_cdf)
-            x_value = np.interp(value_mm, roip_vals_mm, roip_pdf)
-            ax_roip_cdf.plot([value_mm, value_mm], [0, y_value], color='black', linestyle='--',
-                             label=f'{label}: {value_mm:.2f} MMbbl')
-            ax_roip_cdf.scatter(value_mm, y_value, color='black', zorder=5)  # Add scatter point at the intersection
-            ax_roip_cdf.plot([0, value_mm], [y_value, y_value], color='black', linestyle='--')
-        ax_roip_cdf.set_title(f"ROIP Distribution (CDF) ({iterations} iterations)", fontsize=12, fontweight='bold')
-        ax_roip_cdf.set_xlabel("ROIP (MMbbl)")
-        ax_roip_cdf.set_ylabel("Cumulative Probability")
-        ax_roip_cdf.legend()
+    def simulate(self, iterations=1000, seed=None, workers=None, progress=None, should_stop=None,
+                 sampling_mode=DEFAULT_SAMPLING_MODE, tolerance=None, store_directory=None, executor=None,
+                 memory_budget=None):
+        return simulate(self.distribution_plotter.parameters, iterations, seed=seed, workers=workers,
+                        progress=progress, should_stop=should_stop, sampling_mode=sampling_mode, tolerance=tolerance,
+                        store_directory=store_directory, executor=executor, memory_budget=memory_budget)
 
+    def run_simulation(self, iterations=1000, result=None):
+        if result is None:
+            result = self.simulate(iterations)
         # Return the figures separately
-        return fig_ooip_pdf, fig_ooip_cdf, fig_roip_pdf, fig_roip_cdf
-
+        return (self.plot_output_pdf(result, OOIP_COLUMN, 'blue'),
+                self.plot_output_cdf(result, OOIP_COLUMN, 'red'),
+                self.plot_output_pdf(result, ROIP_COLUMN, 'green'),
+                self.plot_output_cdf(result, ROIP_COLUMN, 'orange'))
+
+    @staticmethod
+    def plot_output_pdf(result, column, color):
+        # Original Oil in Place (OOIP) and Recovery Oil in Place (ROIP) are plotted in MMbbl
+        # KDE of the output, computed once per result
+        vals_mm, pdf = result.density(column)
+        return output_pdf_figure(column, result.iterations, vals_mm, pdf, color)
+
+    @staticmethod
+    def plot_output_cdf(result, column, color):
+        # Exact P10/P50/P90 and empirical CDF of the output, from one selection pass per output
+        summary = result.summaries()[column]
+        vals_mm, _ = result.density(column)
+        return output_cdf_figure(column, result.iterations, summary, max(vals_mm), color)
@@ -0,0 +1,381 @@
+import numpy as np
+
+from core.db.run_store import open_run_store
+from core.processing.accumulators import DEFAULT_HISTOGRAM_BINS, FixedBinHistogram
+from core.processing.kde import evaluate_kde
+from core.processing.sampling import DEFAULT_SAMPLING_MODE
+from core.processing.statistics import DEFAULT_ECDF_POINTS, HEADLINE_LEVELS, STANDARD_LEVELS, DistributionSummary, \
+    reduced_ecdf, summarize
+
+# Barrels per acre-foot, used to convert the bulk rock volume into stock tank barrels
+BARRELS_PER_ACRE_FOOT = 7758
+# Names of the output columns in a run store, next to one column per input parameter
+OOIP_COLUMN = "OOIP"
+ROIP_COLUMN = "ROIP"
+# Number of points the OOIP/ROIP density curves are evaluated at
+OUTPUT_DENSITY_POINTS = 500
+# Parameters the volumetric equation reads; a configuration may sample more
+VOLUMETRIC_PARAMETERS = ('Volume', 'Net to Gross Ratio', 'Porosity', 'Water Saturation', 'FVF', 'Recovery Factor')
+
+
+def compute_ooip_roip(samples):
+    """
+    Evaluate the volumetric equation for every iteration of a sample set. Raises ValueError naming the missing
+    parameters if any of VOLUMETRIC_PARAMETERS was not sampled.
+
+    Parameters:
+    - samples: dict. Maps parameter names to equally sized arrays of input samples.
+
+    Returns:
+    - ooip: ndarray. Original Oil in Place for each iteration (bbl).
+    - roip: ndarray. Recoverable Oil in Place for each iteration (bbl).
+    """
+    missing = [name for name in VOLUMETRIC_PARAMETERS if name not in samples]
+    if missing:
+        raise ValueError(f"The volumetric equation needs the parameters {', '.join(missing)}.")
+    ooip = BARRELS_PER_ACRE_FOOT * samples['Volume'] * samples['Net to Gross Ratio'] * samples['Porosity'] * (
+            1 - samples['Water Saturation']) / samples['FVF']
+    roip = ooip * samples['Recovery Factor']
+    return ooip, roip
+
+
+def _statistics_from_summaries(summaries):
+    """
+    Mean, standard deviation and P10/P50/P90 of OOIP and ROIP (bbl), in the layout stored in
+    SIMULATION_STATISTICS, read off summaries in MMbbl as returned by summaries().
+    """
+    statistics = {}
+    for output, summary in summaries.items():
+        output_statistics = {"count": summary.count}
+        output_statistics.update({key: getattr(summary, key) * 1e6 for key in ("mean", "std", "min", "max")})
+        output_statistics.update({f"P{level}": summary.p(level) * 1e6 for level in HEADLINE_LEVELS})
+        statistics[output] = output_statistics
+    return statistics
+
+
+class SimulationResult:
+    """
+    The outcome of a single Monte Carlo run.
+
+    A result is produced once per run and shared by every consumer, so the per-parameter plots and the
+    OOIP/ROIP figures always describe the same random draws.
+
+    Attributes:
+    - samples (dict): Maps parameter names to the sampled input columns.
+    - ooip (ndarray): Original Oil in Place for each iteration (bbl).
+    - roip (ndarray): Recoverable Oil in Place for each iteration (bbl).
+    - iterations (int): Number of iterations in the run.
+    - seed (int or None): The run-level seed, if the run was seeded.
+    - bit_generator (str or None): Name of the bit generator the run was seeded with.
+    - sampling_mode (str): How the input columns were sampled, one of SAMPLING_MODES.
+    - chunk_size (int or None): Number of iterations per shard or chunk; part of what reproduces the run.
+    - tolerance (float or None): Relative tolerance requested for an adaptive run.
+    - achieved_tolerance (float or None): Relative tolerance an adaptive run actually reached.
+    - simulation_id (int or None): ID of the SIMULATIONS row once the run has been stored.
+    - store_path (str or None): Directory of the run's columnar sample store, if it was written to one.
+    - histograms (dict): Maps column names to FixedBinHistogram instances, accumulated shard by shard while
+      the run was sampled (OOIP and ROIP in bbl).
+    - densities (dict): Density curves computed so far, mapping (column, grid size) to (x, density).
+    - ecdfs (dict): Reduced empirical CDFs computed so far, mapping (column, x pixels, y pixels) to (x, y).
+    - summary_cache (dict): Summaries computed so far, mapping (levels, ecdf points) to the summaries() result.
+    - statistics_cache (dict or None): The statistics() result, once computed.
+
+    The histograms and the four caches make repeated plotting of a result cheap and are restored with
+    cached results.
+    """
+
+    def __init__(self, samples, ooip, roip, seed=None, bit_generator=None, sampling_mode=DEFAULT_SAMPLING_MODE,
+                 chunk_size=None, tolerance=None, achieved_tolerance=None, histograms=None):
+        self.samples = samples
+        self.ooip = ooip
+        self.roip = roip
+        self.iterations = len(ooip)
+        self.seed = seed
+        self.bit_generator = bit_generator
+        self.sampling_mode = sampling_mode
+        self.chunk_size = chunk_size
+        self.tolerance = tolerance
+        self.achieved_tolerance = achieved_tolerance
+        self.simulation_id = None
+        self.store_path = None
+        self.histograms = histograms or {}
+        self.densities = {}
+        self.ecdfs = {}
+        self.summary_cache = {}
+        self.statistics_cache = None
+
+    @classmethod
+    def from_samples(cls, samples, seed=None):
+        """
+        Build a result from input samples by evaluating the volumetric equation.
+        """
+        ooip, roip = compute_ooip_roip(samples)
+        return cls(samples, ooip, roip, seed=seed)
+
+    @classmethod
+    def from_store(cls, directory, **metadata):
+        """
+        Open a stored run without loading it into memory; every column is a read-only memory map.
+
+        :param directory: Directory of the run store.
+        :param metadata: Further attributes of the run, e.g. ``seed`` or ``sampling_mode``.
+        """
+        columns = open_run_store(directory)
+        ooip = columns.pop(OOIP_COLUMN)
+        roip = columns.pop(ROIP_COLUMN)
+        result = cls(columns, ooip, roip, **metadata)
+        result.store_path = directory
+        return result
+
+    @property
+    def parameter_names(self):
+        """Names of the input columns, in the order they were sampled."""
+        return list(self.samples)
+
+    def output_columns(self):
+        """Per-iteration OOIP and ROIP (bbl), e.g. for insert_results()."""
+        return self.ooip, self.roip
+
+    @property
+    def ooip_mm(self):
+        """OOIP converted to MMbbl for plotting and analysis."""
+        return self.ooip / 1e6
+
+    @property
+    def roip_mm(self):
+        """ROIP converted to MMbbl for plotting and analysis."""
+        return self.roip / 1e6
+
+    def plot_values(self, column):
+        """Values of a column as plotted: input samples as drawn, OOIP and ROIP in MMbbl."""
+        if column == OOIP_COLUMN:
+            return self.ooip_mm
+        elif column == ROIP_COLUMN:
+            return self.roip_mm
+        return self.samples[column]
+
+    def histogram(self, column, bins=DEFAULT_HISTOGRAM_BINS):
+        """
+        Histogram of a column (OOIP and ROIP in bbl): the one accumulated while the run was sampled if it has
+        ``bins`` bins, otherwise one binned from the column over its range. Results without accumulated
+        histograms, e.g. ones read from a run store, keep the binned one for the next call.
+
+        :return: FixedBinHistogram.
+        """
+        histogram = self.histograms.get(column)
+        if histogram is not None and histogram.bins == bins:
+            return histogram
+        values = {OOIP_COLUMN: self.ooip, ROIP_COLUMN: self.roip}.get(column)
+        values = np.asarray(self.samples[column] if values is None else values, dtype=np.float64)
+        low, high = float(values.min()), float(values.max())
+        binned = FixedBinHistogram(bins, edges=np.linspace(low, high, bins + 1)) if high > low else \
+            FixedBinHistogram.from_pilot(values, bins)
+        binned.update(values)
+        if histogram is None:
+            self.histograms[column] = binned
+        return binned
+
+    def density(self, column, grid_size=OUTPUT_DENSITY_POINTS):
+        """
+        Kernel density estimate of a column on ``grid_size`` evenly spaced points between its minimum and
+        maximum, computed once per column and grid size.
+
+        :return: Tuple (x, density) of arrays.
+        """
+        key = (column, grid_size)
+        if key not in self.densities:
+            values = self.plot_values(column)
+            x = np.linspace(values.min(), values.max(), grid_size)
+            self.densities[key] = (x, evaluate_kde(values, x))
+        return self.densities[key]
+
+    def ecdf(self, column, x_pixels, y_pixels):
+        """
+        Empirical CDF of a column reduced to what can be seen on an ``x_pixels`` by ``y_pixels`` plot, see
+        reduced_ecdf(), computed once per column and plot size.
+
+        :return: Tuple (x, y) of arrays.
+        """
+        key = (column, x_pixels, y_pixels)
+        if key not in self.ecdfs:
+            self.ecdfs[key] = reduced_ecdf(self.plot_values(column), x_pixels, y_pixels)
+        return self.ecdfs[key]
+
+    def summaries(self, levels=STANDARD_LEVELS, ecdf_points=DEFAULT_ECDF_POINTS):
+        """
+        Exact summaries of OOIP and ROIP in MMbbl for plots and reports, computed once per set of arguments.
+
+        :return: Dict mapping 'OOIP' and 'ROIP' to DistributionSummary instances.
+        """
+        key = (tuple(levels), ecdf_points)
+        if key not in self.summary_cache:
+            self.summary_cache[key] = {
+                "OOIP": summarize(self.ooip_mm, levels, ecdf_points),
+                "ROIP": summarize(self.roip_mm, levels, ecdf_points),
+            }
+        return self.summary_cache[key]
+
+    def statistics(self):
+        """
+        Mean, standard deviation and P10/P50/P90 of OOIP and ROIP (bbl), in the layout stored in
+        SIMULATION_STATISTICS. They are read off the cached summaries() in MMbbl, so the outputs are not
+        selected a second time.
+        """
+        if self.statistics_cache is None:
+            self.statistics_cache = _statistics_from_summaries(self.summaries())
+        return self.statistics_cache
+
+
+class StreamingResult:
+    """
+    The outcome of a streaming run, where samples are folded into accumulators and then discarded.
+
+    It answers the same questions as a SimulationResult, so the GUI, the CLI and the database store it alike,
+    but every answer is read off the accumulators: histograms are the ones kept while sampling, densities and
+    CDFs are interpolated from them, and percentiles are quantile sketch estimates. The per-iteration values
+    exist only in the run's columnar sample store, if one was written.
+
+    Attributes:
+    - ooip (OutputAccumulator): Online statistics, histogram and quantile sketch of OOIP (bbl).
+    - roip (OutputAccumulator): Online statistics, histogram and quantile sketch of ROIP (bbl).
+    - iterations (int): Number of iterations folded into the accumulators.
+    - chunk_size (int): Number of iterations generated per chunk; part of what reproduces the run.
+    - seed (int or None): The run-level seed.
+    - bit_generator (str or None): Name of the bit generator the run was seeded with.
+    - sampling_mode (str): How the input columns were sampled, one of SAMPLING_MODES.
+    - tolerance, achieved_tolerance (None): Streaming runs are never adaptive.
+    - simulation_id (int or None): ID of the SIMULATIONS row once the run has been stored.
+    - store_path (str or None): Directory of the run's columnar sample store, if it was written to one.
+    - histograms (dict): Maps every input column, 'OOIP' and 'ROIP' to its FixedBinHistogram; the output
+      entries are the accumulators' own histograms.
+    - densities, ecdfs, summary_cache, statistics_cache: Caches as in SimulationResult.
+    """
+
+    def __init__(self, ooip, roip, iterations, chunk_size, seed=None, bit_generator=None,
+                 sampling_mode=DEFAULT_SAMPLING_MODE, histograms=None):
+        self.ooip = ooip
+        self.roip = roip
+        self.iterations = iterations
+        self.chunk_size = chunk_size
+        self.seed = seed
+        self.bit_generator = bit_generator
+        self.sampling_mode = sampling_mode
+        self.tolerance = None
+        self.achieved_tolerance = None
+        self.simulation_id = None
+        self.store_path = None
+        self.histograms = histograms or {}
+        self.densities = {}
+        self.ecdfs = {}
+        self.summary_cache = {}
+        self.statistics_cache = None
+
+    @property
+    def parameter_names(self):
+        """Names of the input columns, in the order they were sampled."""
+        return [column for column in self.histograms if column not in (OOIP_COLUMN, ROIP_COLUMN)]
+
+    def output_columns(self):
+        """
+        Per-iteration OOIP and ROIP (bbl) as read-only memory maps of the run store, e.g. for insert_results().
+        """
+        if not self.store_path:
+            raise ValueError("A streaming run keeps its per-iteration outputs only in a run store.")
+        columns = open_run_store(self.store_path)
+        return columns[OOIP_COLUMN], columns[ROIP_COLUMN]
+
+    @staticmethod
+    def _scale(column):
+        """Factor from a column's accumulated units to its plotted ones: MMbbl for OOIP and ROIP."""
+        return 1e-6 if column in (OOIP_COLUMN, ROIP_COLUMN) else 1.0
+
+    def histogram(self, column, bins=DEFAULT_HISTOGRAM_BINS):
+        """
+        Histogram of a column (OOIP and ROIP in bbl) accumulated while the run was sampled. Without the
+        samples it cannot be binned again, so ``bins`` must match the run's.
+
+        :return: FixedBinHistogram.
+        """
+        histogram = self.histograms[column]
+        if histogram.bins != bins:
+            raise ValueError(f"The streaming run kept {histogram.bins} bins for '{column}', not {bins}.")
+        return histogram
+
+    def density(self, column, grid_size=OUTPUT_DENSITY_POINTS):
+        """
+        Density of a column on ``grid_size`` evenly spaced points, interpolated between the bin centres of
+        its histogram, computed once per column and grid size.
+
+        :return: Tuple (x, density) of arrays.
+        """
+        key = (column, grid_size)
+        if key not in self.densities:
+            histogram = self.histograms[column]
+            scale = self._scale(column)
+            edges = histogram.edges * scale
+            centres = (edges[:-1] + edges[1:]) / 2
+            accumulator = {OOIP_COLUMN: self.ooip, ROIP_COLUMN: self.roip}.get(column)
+            low, high = (accumulator.statistics.min * scale, accumulator.statistics.max * scale) \
+                if accumulator is not None else (edges[0], edges[-1])
+            x = np.linspace(low, high, grid_size)
+            self.densities[key] = (x, np.interp(x, centres, histogram.density() / scale))
+        return self.densities[key]
+
+    def ecdf(self, column, x_pixels, y_pixels):
+        """
+        CDF of a column from its cumulative histogram, linear within every bin, at one point per pixel column
+        of an ``x_pixels`` by ``y_pixels`` plot; computed once per column and plot size.
+
+        :return: Tuple (x, y) of arrays.
+        """
+        key = (column, x_pixels, y_pixels)
+        if key not in self.ecdfs:
+            histogram = self.histograms[column]
+            edges = histogram.edges * self._scale(column)
+            total = histogram.counts.sum() + histogram.underflow + histogram.overflow
+            cumulative = (histogram.underflow + np.concatenate(([0], np.cumsum(histogram.counts)))) / max(total, 1)
+            x = np.linspace(edges[0], edges[-1], x_pixels)
+            self.ecdfs[key] = (x, np.interp(x, edges, cumulative))
+        return self.ecdfs[key]
+
+    def summaries(self, levels=STANDARD_LEVELS, ecdf_points=DEFAULT_ECDF_POINTS):
+        """
+        Summaries of OOIP and ROIP in MMbbl in the layout of SimulationResult.summaries(). Moments, minimum
+        and maximum are exact; levels and the CDF are read off the quantile sketches.
+
+        :return: Dict mapping 'OOIP' and 'ROIP' to DistributionSummary instances.
+        """
+        key = (tuple(levels), ecdf_points)
+        if key not in self.summary_cache:
+            self.summary_cache[key] = {"OOIP": self._summarize(self.ooip, key[0], ecdf_points),
+                                       "ROIP": self._summarize(self.roip, key[0], ecdf_points)}
+        return self.summary_cache[key]
+
+    @staticmethod
+    def _summarize(accumulator, levels, ecdf_points):
+        statistics = accumulator.statistics
+        probabilities = np.linspace(0, 1, min(ecdf_points, statistics.count))
+        # Level Pxx is the (100 - xx)th percentile; sketch estimates are kept within the exact range
+        values = np.clip(accumulator.sketch.quantiles(np.concatenate([1 - np.asarray(levels) / 100, probabilities])),
+                         statistics.min, statistics.max) / 1e6
+        ecdf_x = values[len(levels):]
+        ecdf_x[0], ecdf_x[-1] = statistics.min / 1e6, statistics.max / 1e6
+        return DistributionSummary(
+            count=statistics.count,
+            mean=statistics.mean / 1e6,
+            std=float(statistics.std) / 1e6 if statistics.count > 1 else 0.0,
+            minimum=statistics.min / 1e6,
+            maximum=statistics.max / 1e6,
+            levels=dict(zip(levels, values[:len(levels)].tolist())),
+            ecdf_x=ecdf_x,
+            ecdf_y=probabilities,
+        )
+
+    def statistics(self):
+        """
+        Mean, standard deviation and P10/P50/P90 of OOIP and ROIP (bbl) in the layout stored in
+        SIMULATION_STATISTICS, read off summaries(); percentiles are sketch estimates.
+        """
+        if self.statistics_cache is None:
+            self.statistics_cache = _statistics_from_summaries(self.summaries())
+        return self.statistics_cache
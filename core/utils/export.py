@@ -0,0 +1,218 @@
+import hashlib
+import os
+import threading
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+# Bump when a figure builder draws differently, so images cached by an older version are never reused
+FIGURE_CACHE_VERSION = 2
+EXPORT_FORMATS = ("png", "svg", "pdf")
+DEFAULT_EXPORT_DPI = 300
+DEFAULT_FIGURE_CACHE_SIZE = 256 << 20
+# A handful of workers keeps up with the figures of one result; each one is a full Python process
+DEFAULT_EXPORT_WORKERS = min(4, os.cpu_count() or 1)
+
+
+def _update_hash(digest, value):
+    """Feed a builder argument into ``digest``; arrays by their bytes, everything else by its structure."""
+    if isinstance(value, np.ndarray):
+        digest.update(f"ndarray:{value.dtype.str}:{value.shape}:".encode())
+        digest.update(np.ascontiguousarray(value).tobytes())
+    elif isinstance(value, (list, tuple)):
+        digest.update(f"{type(value).__name__}:{len(value)}:".encode())
+        for item in value:
+            _update_hash(digest, item)
+    elif isinstance(value, dict):
+        digest.update(f"dict:{len(value)}:".encode())
+        for key in sorted(value, key=repr):
+            _update_hash(digest, key)
+            _update_hash(digest, value[key])
+    elif hasattr(value, "__dict__"):
+        # Plain data objects such as DistributionSummary
+        digest.update(f"{type(value).__qualname__}:".encode())
+        _update_hash(digest, vars(value))
+    else:
+        digest.update(f"{type(value).__name__}:{value!r};".encode())
+
+
+def figure_key(builder, args, file_format, dpi, savefig_kwargs=None):
+    """
+    Content address of an exported image: the builder, the data it is drawn from and how it is saved.
+
+    Parameters:
+    - builder: callable. Module-level function returning the Figure.
+    - args: tuple. Arguments of the builder.
+    - file_format: str. One of EXPORT_FORMATS.
+    - dpi: int. Resolution of the image.
+    - savefig_kwargs: dict. Further keyword arguments of Figure.savefig.
+
+    Returns:
+    - key: str. Hex SHA-256 digest.
+    """
+    digest = hashlib.sha256()
+    _update_hash(digest, (FIGURE_CACHE_VERSION, builder.__module__, builder.__qualname__, file_format, dpi,
+                          savefig_kwargs or {}))
+    _update_hash(digest, tuple(args))
+    return digest.hexdigest()
+
+
+def _replace_with_link(source, destination):
+    """Point ``destination`` at the contents of ``source``, by hard link where the file system allows it."""
+    if os.path.exists(destination) and os.path.samefile(source, destination):
+        # Already linked; renaming a second link onto it would be a no-op that leaves the temporary link behind
+        return
+    temporary = f"{destination}.{os.getpid()}.tmp"
+    try:
+        os.link(source, temporary)
+    except OSError:
+        with open(source, "rb") as src, open(temporary, "wb") as dst:
+            dst.write(src.read())
+    os.replace(temporary, destination)
+
+
+def export_figure(builder, args, path, file_format, dpi, savefig_kwargs, cache_directory):
+    """
+    Build a figure and save it to ``path``, or copy the image cached for the same key. Runs in a worker of the
+    export pool.
+
+    :return: Tuple (path, cached) where cached tells whether the image was reused.
+    """
+    directory = os.path.dirname(path) or "."
+    if not os.path.isdir(directory):
+        raise FileNotFoundError(f"Export directory '{directory}' does not exist.")
+
+    cached_path = None
+    if cache_directory is not None:
+        os.makedirs(cache_directory, exist_ok=True)
+        cached_path = os.path.join(cache_directory,
+                                   f"{figure_key(builder, args, file_format, dpi, savefig_kwargs)}.{file_format}")
+        if os.path.exists(cached_path):
+            # Mark the image as recently used for pruning
+            os.utime(cached_path)
+            _replace_with_link(cached_path, path)
+            return path, True
+
+    from matplotlib.backends.backend_agg import FigureCanvasAgg
+
+    figure = builder(*args)
+    # Raster formats are drawn by Agg, SVG and PDF by their vector backends; no GUI backend is involved
+    FigureCanvasAgg(figure)
+    target = cached_path or path
+    # Written under a temporary name first, so an interrupted export never leaves a truncated image behind
+    temporary = f"{target}.{os.getpid()}.tmp"
+    figure.savefig(temporary, dpi=dpi, format=file_format, **savefig_kwargs)
+    os.replace(temporary, target)
+    if cached_path is not None:
+        _replace_with_link(cached_path, path)
+    return path, False
+
+
+class FigureExporter:
+    """
+    Background queue that saves figures in a pool of worker processes.
+
+    A figure is described by a module-level builder and its arguments rather than passed as a Figure, so the
+    worker draws its own copy with Agg while the one on screen stays untouched, and the arguments double as the
+    cache key: an image whose builder, data and format are unchanged is copied from the cache instead of being
+    drawn again. The pool is started on the first submit.
+
+    Progress and failures are reported through callables, which are called from the pool's management thread:
+    progress(done, total) once per finished export, counting the exports submitted since the queue was last
+    empty, and failed(path, message) for every export that raises. Cancelled exports are dropped from the count
+    without being reported.
+
+    Attributes:
+    - cache_directory (str or None): Directory of the image cache; None disables caching.
+    - max_bytes (int): Size the cache is pruned to when the exporter is created.
+    - workers (int): Number of worker processes.
+    - mp_context (multiprocessing context or None): How the workers are started; None for the platform default.
+    """
+
+    def __init__(self, cache_directory=None, max_bytes=DEFAULT_FIGURE_CACHE_SIZE, workers=DEFAULT_EXPORT_WORKERS,
+                 progress=None, failed=None, mp_context=None):
+        self.cache_directory = cache_directory
+        self.max_bytes = max_bytes
+        self.workers = workers
+        self.mp_context = mp_context
+        self.progress = progress
+        self.failed = failed
+        self.executor = None
+        self.lock = threading.Lock()
+        self.submitted = 0
+        self.done = 0
+        self.futures = set()
+        # Pruned only here, before any worker can be reading or writing cached images
+        self.prune()
+
+    def submit(self, builder, args, path, file_format=None, dpi=DEFAULT_EXPORT_DPI, **savefig_kwargs):
+        """
+        Queue the export of ``builder(*args)`` to ``path`` and return its Future.
+
+        :param file_format: One of EXPORT_FORMATS; taken from the extension of ``path`` if not given.
+        """
+        file_format = (file_format or os.path.splitext(path)[1].lstrip(".")).lower()
+        if file_format not in EXPORT_FORMATS:
+            raise ValueError(f"Unsupported export format '{file_format}'; expected one of {EXPORT_FORMATS}.")
+        if self.executor is None:
+            self.executor = ProcessPoolExecutor(max_workers=self.workers, mp_context=self.mp_context)
+        future = self.executor.submit(export_figure, builder, tuple(args), path, file_format, dpi, savefig_kwargs,
+                                      self.cache_directory)
+        with self.lock:
+            self.submitted += 1
+            self.futures.add(future)
+        future.add_done_callback(lambda finished: self._on_done(finished, path))
+        return future
+
+    def _on_done(self, future, path):
+        cancelled = future.cancelled()
+        with self.lock:
+            self.futures.discard(future)
+            if cancelled:
+                self.submitted -= 1
+            else:
+                self.done += 1
+            done, total = self.done, self.submitted
+            if done == total:
+                # The queue is empty; the next batch counts from zero again
+                self.submitted = self.done = 0
+        if cancelled:
+            return
+        error = future.exception()
+        if error is not None and self.failed is not None:
+            self.failed(path, str(error))
+        if self.progress is not None:
+            self.progress(done, total)
+
+    def cancel_pending(self):
+        """
+        Cancel the queued exports that have not started yet; the ones already running in a worker finish.
+
+        :return: Number of exports cancelled.
+        """
+        with self.lock:
+            futures = list(self.futures)
+        # Cancelling runs the done callbacks right away, which take the lock themselves
+        return sum(future.cancel() for future in futures)
+
+    def prune(self):
+        """Delete the least recently used cached images until the cache fits in max_bytes."""
+        if self.cache_directory is None or not os.path.isdir(self.cache_directory):
+            return
+        entries = [entry for entry in os.scandir(self.cache_directory) if entry.is_file()]
+        total = sum(entry.stat().st_size for entry in entries)
+        for entry in sorted(entries, key=lambda item: item.stat().st_mtime):
+            if total <= self.max_bytes:
+                break
+            total -= entry.stat().st_size
+            os.remove(entry.path)
+
+    def shutdown(self, wait=True):
+        """Stop the pool; pending exports are finished first if ``wait`` is set and dropped otherwise."""
+        if self.executor is not None:
+            # Cancelled here rather than with cancel_futures: the pool's management thread only sees that flag
+            # through a weak reference to the executor, which is gone once it is released below
+            if not wait:
+                self.cancel_pending()
+            self.executor.shutdown(wait=wait)
+            self.executor = None
@@ -2,8 +2,11 @@ import json
 import os
 import sys
 import webbrowser
+from typing import TYPE_CHECKING
 
-from matplotlib.backend_bases import MouseEvent
+if TYPE_CHECKING:
+    # Only needed for annotations; importing matplotlib here would load it at application start
+    from matplotlib.backend_bases import MouseEvent
 
 RESTART_EXIT_CODE = 42  # Must match the watchdog script
 
@@ -39,7 +42,7 @@ def load_config():
         return {}  # Use an empty dict if the config file doesn't exist or has errors
 
 
-def update_hover(event: MouseEvent, fig, ax, line, annotation):
+def update_hover(event: 'MouseEvent', fig, ax, line, annotation):
     if event.inaxes == ax:
         x, y = line.get_data()
         idx = np.searchsorted(x, event.xdata) if event.xdata else 0
@@ -1,7 +1,19 @@
 # Author: Eren Tuna Açıkbaş 2024
 
+import math
+
 # Matplotlib is a plotting library
-import matplotlib.pyplot as plt
+from matplotlib.figure import Figure
+
+from core.processing.statistics import HEADLINE_LEVELS
+from core.utils.export import DEFAULT_EXPORT_DPI
+
+# The figure builders below are module-level functions of plain data, so the export pool can pickle them and
+# rebuild a figure in a worker process instead of touching the one shown on screen
+
+# Size (inches) and subplot margins of the parameter PDF and CDF figures
+PARAMETER_FIGURE_SIZE = (6, 5)
+PARAMETER_FIGURE_MARGINS = {"left": .2, "right": 0.95, "top": 0.85, "bottom": 0.25}
 
 
 def plot_histogram(volumes):
@@ -13,8 +25,149 @@ def plot_histogram(volumes):
     :return: None
     :rtype: None
     """
+    # pyplot picks an interactive backend on import, so it is only loaded when a window is actually shown
+    import matplotlib.pyplot as plt
+
     plt.hist(volumes, bins=50, color='blue', alpha=0.7)
     plt.xlabel('Reservoir Volume (STB)')
     plt.ylabel('Frequency')
     plt.title('Monte Carlo Simulation of Reservoir Volume')
     plt.show()
+
+
+def axes_pixels(ax, dpi):
+    """
+    Size of the plotting area of ``ax`` in pixels when its figure is drawn at ``dpi``.
+
+    :return: Tuple (width, height).
+    """
+    position = ax.get_position()
+    width, height = ax.figure.get_size_inches()
+    return math.ceil(position.width * width * dpi), math.ceil(position.height * height * dpi)
+
+
+def parameter_cdf_pixels(dpi=DEFAULT_EXPORT_DPI):
+    """
+    Size of the plotting area of a parameter CDF figure in pixels at ``dpi``, by default the export resolution,
+    the finest one it is drawn at. Its curve is reduced to this size before it is plotted, see reduced_ecdf().
+
+    :return: Tuple (width, height).
+    """
+    width, height = PARAMETER_FIGURE_SIZE
+    margins = PARAMETER_FIGURE_MARGINS
+    return (math.ceil((margins["right"] - margins["left"]) * width * dpi),
+            math.ceil((margins["top"] - margins["bottom"]) * height * dpi))
+
+
+def parameter_pdf_figure(histogram, parameter_name, iterations, density=None):
+    """
+    Histogram of one sampled parameter with its KDE.
+
+    The bars are drawn from the counts accumulated while the run was sampled, so the figure needs neither the
+    samples nor a pass over them.
+
+    :param histogram: FixedBinHistogram of the parameter.
+    :param parameter_name: Name of the parameter.
+    :param iterations: Number of iterations, shown in the title.
+    :param density: Optional (x, density) KDE curve; only the histogram is drawn if not given.
+    :return: The Figure.
+    """
+    fig = Figure(figsize=PARAMETER_FIGURE_SIZE, dpi=100)
+    ax = fig.add_subplot(111)
+    # Adjust subplot parameters for better layout
+    fig.subplots_adjust(**PARAMETER_FIGURE_MARGINS)
+
+    # One weighted value per bin reproduces the bars ax.hist would draw from the samples themselves
+    ax.hist(histogram.edges[:-1], bins=histogram.edges, weights=histogram.counts, density=True, alpha=0.6,
+            label='Histogram', color='g', edgecolor='black')
+
+    # Overlay the KDE when one is given, e.g. computed from the samples of an in-memory result
+    if density is not None:
+        kde_x, kde_y = density
+        ax.plot(kde_x, kde_y, c='darkorange', label='KDE')
+
+    ax.set_title(f"{parameter_name.capitalize()} PDF ({iterations} iterations)", fontsize=8, fontweight='bold')
+    ax.set_xlabel('Value', fontsize=8)
+    ax.set_ylabel('Probability Density', fontsize=8)
+    ax.tick_params(axis='both', which='major', labelsize=8)
+    ax.legend(fontsize=8)
+    return fig
+
+
+def parameter_cdf_figure(curve, parameter_name, iterations):
+    """
+    Empirical CDF of one sampled parameter.
+
+    The curve is drawn as given. Reduced to the pixels of parameter_cdf_pixels() it holds a few thousand points
+    at most whatever the number of iterations, so the figure needs neither the samples nor a sort of them.
+
+    :param curve: Tuple (x, y) of the CDF, e.g. from SimulationResult.ecdf().
+    :param parameter_name: Name of the parameter.
+    :param iterations: Number of iterations, shown in the title.
+    :return: The Figure.
+    """
+    fig_cdf = Figure(figsize=PARAMETER_FIGURE_SIZE, dpi=100)
+    ax_cdf = fig_cdf.add_subplot(111)
+    fig_cdf.subplots_adjust(**PARAMETER_FIGURE_MARGINS)
+    data_sorted, cdf = curve
+    ax_cdf.plot(data_sorted, cdf, marker='.', linestyle='', label='CDF')
+    ax_cdf.set_title(f"{parameter_name.capitalize()} CDF ({iterations} iterations)", fontsize=8, fontweight='bold')
+    ax_cdf.set_xlabel(parameter_name.capitalize(), fontsize=8)
+    ax_cdf.set_ylabel('Cumulative Probability', fontsize=8)
+    ax_cdf.tick_params(axis='both', which='major', labelsize=8)
+    ax_cdf.legend()
+    return fig_cdf
+
+
+def output_pdf_figure(column, iterations, vals_mm, pdf, color):
+    """
+    KDE of an output in MMbbl.
+
+    :param column: 'OOIP' or 'ROIP'.
+    :param iterations: Number of iterations, shown in the title.
+    :param vals_mm: Points the density is evaluated at (MMbbl).
+    :param pdf: Density at vals_mm.
+    :param color: Line color.
+    :return: The Figure.
+    """
+    fig_pdf = Figure(figsize=(5, 4), dpi=100)
+    ax_pdf = fig_pdf.add_subplot(111)
+    ax_pdf.plot(vals_mm, pdf, color=color)
+    ax_pdf.set_title(f"{column} Distribution (PDF) ({iterations} iterations)", fontsize=12, fontweight='bold')
+    ax_pdf.set_xlabel(f"{column} (MMbbl)")
+    ax_pdf.set_ylabel("Density")
+    return fig_pdf
+
+
+def output_cdf_figure(column, iterations, summary, x_max, color):
+    """
+    Empirical CDF of an output in MMbbl with its P10, P50 and P90 marked.
+
+    :param column: 'OOIP' or 'ROIP'.
+    :param iterations: Number of iterations, shown in the title.
+    :param summary: DistributionSummary of the output in MMbbl.
+    :param x_max: Upper limit of the x axis (MMbbl).
+    :param color: Line color.
+    :return: The Figure.
+    """
+    fig_cdf = Figure(figsize=(5, 4), dpi=100)
+    ax_cdf = fig_cdf.add_subplot(111, xlim=(0, x_max), ylim=(0, 1.01))
+    ax_cdf.plot(summary.ecdf_x, summary.ecdf_y, color=color)
+    # Note: For consistency with oil industry conventions, P10 is the 90th percentile and P90 the 10th
+    p10_value_mm, p50_value_mm, p90_value_mm = (summary.p(level) for level in HEADLINE_LEVELS)
+
+    # Mark P10, P50, P90 points on the plot and draw lines to the intersection with the CDF curve
+    percentile_values_mm = [p10_value_mm, p50_value_mm, p90_value_mm]
+    percentile_labels = ['P10', 'P50', 'P90']
+    for value_mm, label in zip(percentile_values_mm, percentile_labels):
+        y_value = summary.cdf(value_mm)
+        ax_cdf.plot([value_mm, value_mm], [0, y_value], color='black', linestyle='--',
+                    label=f'{label}: {value_mm:.2f} MMbbl')
+        ax_cdf.scatter(value_mm, y_value, color='black', zorder=5)  # Add scatter point at the intersection
+        ax_cdf.plot([0, value_mm], [y_value, y_value], color='black', linestyle='--')
+
+    ax_cdf.set_title(f"{column} Distribution (CDF) ({iterations} iterations)", fontsize=12, fontweight='bold')
+    ax_cdf.set_xlabel(f"{column} (MMbbl)")
+    ax_cdf.set_ylabel("Cumulative Probability")
+    ax_cdf.legend()
+    return fig_cdf
@@ -0,0 +1,62 @@
+import numpy as np
+import pytest
+from scipy.integrate import trapezoid
+from scipy.stats import gaussian_kde
+
+from core.processing.kde import binned_kde, evaluate_kde
+
+SAMPLE_SIZE = 5_000
+GRID_POINTS = 500
+# Largest absolute error relative to the peak density, and integrated absolute error, against gaussian_kde
+MAX_RELATIVE_ERROR = 1e-4
+INTEGRATED_ERROR = 1e-4
+
+DISTRIBUTIONS = {
+    "normal": lambda rng, n: rng.normal(10.0, 2.0, n),
+    "lognormal": lambda rng, n: rng.lognormal(0.0, 0.75, n),
+    "uniform": lambda rng, n: rng.uniform(0.0, 1.0, n),
+    "beta": lambda rng, n: rng.beta(2.0, 8.0, n),
+    "triangular": lambda rng, n: rng.triangular(0.0, 0.2, 1.0, n),
+    "bimodal": lambda rng, n: np.concatenate([rng.normal(0.0, 1.0, n // 2), rng.normal(6.0, 0.5, n - n // 2)]),
+}
+
+
+@pytest.mark.parametrize("bw_method", ["scott", "silverman", 0.1])
+@pytest.mark.parametrize("distribution", sorted(DISTRIBUTIONS))
+def test_evaluate_kde_matches_gaussian_kde(distribution, bw_method):
+    data = DISTRIBUTIONS[distribution](np.random.default_rng(0), SAMPLE_SIZE)
+    points = np.linspace(data.min(), data.max(), GRID_POINTS)
+
+    exact = gaussian_kde(data, bw_method=bw_method)(points)
+    binned = evaluate_kde(data, points, bw_method=bw_method)
+
+    error = np.abs(binned - exact)
+    assert error.max() / exact.max() < MAX_RELATIVE_ERROR
+    assert trapezoid(error, points) < INTEGRATED_ERROR
+
+
+@pytest.mark.parametrize("distribution", ["uniform", "beta"])
+def test_evaluate_kde_outside_the_samples(distribution):
+    # Points beyond a bounded sample still get the kernel tails gaussian_kde gives them
+    data = DISTRIBUTIONS[distribution](np.random.default_rng(1), SAMPLE_SIZE)
+    points = np.linspace(data.min() - 0.5, data.max() + 0.5, GRID_POINTS)
+
+    exact = gaussian_kde(data)(points)
+    binned = evaluate_kde(data, points)
+
+    assert np.abs(binned - exact).max() / exact.max() < MAX_RELATIVE_ERROR
+
+
+def test_binned_kde_integrates_to_one():
+    data = DISTRIBUTIONS["lognormal"](np.random.default_rng(2), SAMPLE_SIZE)
+    grid, density = binned_kde(data, low=data.min() - 2.0, high=data.max() + 2.0)
+
+    assert trapezoid(density, grid) == pytest.approx(1.0, abs=1e-4)
+    assert (density >= 0).all()
+
+
+def test_equal_samples():
+    grid, density = binned_kde(np.full(10, 3.0))
+
+    assert grid[0] < 3.0 < grid[-1]
+    assert np.isfinite(density).all() and density.max() > 0